@@ -0,0 +1,46 @@
+"""Composite indexes for hot case queries
+
+Tables are created by ``init_db()``; this revision brings databases created before
+these indexes existed in line with the models. Each composite index starts with
+``case_id``, so the old single-column ``case_id`` indexes it replaces are dropped.
+
+* ``api_chunks (case_id, idx)`` - a case's chunks in reading order (analysis, exports).
+* ``api_documents (case_id, created_at)`` - a case's documents, newest first.
+
+On PostgreSQL the indexes are built ``CONCURRENTLY`` so writes continue meanwhile.
+
+Revision ID: 0001_hot_path_indexes
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_hot_path_indexes"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, columns, single-column index it supersedes)
+INDEXES = [
+    ("ix_api_chunks_case_id_idx", "api_chunks", ["case_id", "idx"], "ix_api_chunks_case_id"),
+    ("ix_api_documents_case_id_created_at", "api_documents", ["case_id", "created_at"], "ix_api_documents_case_id"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, superseded in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+            op.drop_index(superseded, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, superseded in INDEXES:
+            op.create_index(superseded, table, columns[:1], if_not_exists=True, postgresql_concurrently=True)
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,56 @@
+"""ON DELETE CASCADE on foreign keys to cases and documents
+
+Deleting a case row now removes its documents, chunks, risks, timeline and checklist
+items and counters in the database instead of through the ORM.
+
+PostgreSQL constraints are recreated with ``ON DELETE CASCADE`` under their existing
+names. SQLite cannot alter constraints in place; the application deletes children
+explicitly (``app.services.deletion``), so existing SQLite files need no rebuild.
+
+Revision ID: 0002_cascade_case_deletes
+Revises: 0001_hot_path_indexes
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_cascade_case_deletes"
+down_revision: Union[str, None] = "0001_hot_path_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referred table)
+FOREIGN_KEYS = [
+    ("api_documents", "case_id", "api_cases"),
+    ("api_chunks", "case_id", "api_cases"),
+    ("api_chunks", "document_id", "api_documents"),
+    ("api_risks", "case_id", "api_cases"),
+    ("api_timeline_items", "case_id", "api_cases"),
+    ("api_checklist_items", "case_id", "api_cases"),
+    ("api_case_counters", "case_id", "api_cases"),
+]
+
+
+def _recreate(ondelete: Union[str, None]) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    for table, column, referred in FOREIGN_KEYS:
+        for fk in inspector.get_foreign_keys(table):
+            if fk["constrained_columns"] == [column] and fk["referred_table"] == referred:
+                op.drop_constraint(fk["name"], table, type_="foreignkey")
+                op.create_foreign_key(fk["name"], table, referred, [column], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    _recreate("CASCADE")
+
+
+def downgrade() -> None:
+    _recreate(None)
@@ -0,0 +1,36 @@
+"""Document upload status
+
+``pending`` documents have a presigned upload URL issued but not yet completed;
+existing rows are ``ready``. Skipped when ``init_db()`` already created the column.
+
+Revision ID: 0003_document_status
+Revises: 0002_cascade_case_deletes
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_document_status"
+down_revision: Union[str, None] = "0002_cascade_case_deletes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_status() -> bool:
+    return "status" in {c["name"] for c in sa.inspect(op.get_bind()).get_columns("api_documents")}
+
+
+def upgrade() -> None:
+    if not _has_status():
+        op.add_column("api_documents", sa.Column("status", sa.String(16), nullable=False, server_default="ready"))
+
+
+def downgrade() -> None:
+    if _has_status():
+        with op.batch_alter_table("api_documents") as batch:
+            batch.drop_column("status")
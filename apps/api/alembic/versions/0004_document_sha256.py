@@ -0,0 +1,36 @@
+"""Document content hash
+
+SHA-256 of each document's bytes, recorded on upload and used as the download ETag.
+Rows uploaded before this revision keep an empty hash and get a weak ETag instead.
+
+Revision ID: 0004_document_sha256
+Revises: 0003_document_status
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_document_sha256"
+down_revision: Union[str, None] = "0003_document_status"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_sha256() -> bool:
+    return "sha256" in {c["name"] for c in sa.inspect(op.get_bind()).get_columns("api_documents")}
+
+
+def upgrade() -> None:
+    if not _has_sha256():
+        op.add_column("api_documents", sa.Column("sha256", sa.String(64), nullable=False, server_default=""))
+
+
+def downgrade() -> None:
+    if _has_sha256():
+        with op.batch_alter_table("api_documents") as batch:
+            batch.drop_column("sha256")
@@ -0,0 +1,42 @@
+"""Index documents by storage key
+
+Local storage is content-addressed, so identical uploads share a ``storage_key``.
+Deleting a document checks whether any other row still uses its key before the
+stored file is removed; this index keeps that check cheap.
+
+Revision ID: 0005_document_storage_key_index
+Revises: 0004_document_sha256
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_document_storage_key_index"
+down_revision: Union[str, None] = "0004_document_sha256"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_api_documents_storage_key",
+            "api_documents",
+            ["storage_key"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_api_documents_storage_key",
+            table_name="api_documents",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
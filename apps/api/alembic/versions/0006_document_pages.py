@@ -0,0 +1,43 @@
+"""Document page previews
+
+``api_document_pages`` records one thumbnail per document page, stored in the object
+store under ``previews/``. Skipped when ``init_db()`` already created the table.
+
+Revision ID: 0006_document_pages
+Revises: 0005_document_storage_key_index
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_document_pages"
+down_revision: Union[str, None] = "0005_document_storage_key_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("api_document_pages"):
+        return
+    op.create_table(
+        "api_document_pages",
+        sa.Column("document_id", sa.String(36), sa.ForeignKey("api_documents.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("page", sa.Integer, primary_key=True),
+        sa.Column("case_id", sa.String(36), sa.ForeignKey("api_cases.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("storage_key", sa.String(512), nullable=False),
+        sa.Column("content_type", sa.String(120), nullable=False),
+        sa.Column("width", sa.Integer, nullable=False),
+        sa.Column("height", sa.Integer, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_api_document_pages_case_id", "api_document_pages", ["case_id"])
+    op.create_index("ix_api_document_pages_storage_key", "api_document_pages", ["storage_key"])
+
+
+def downgrade() -> None:
+    op.drop_table("api_document_pages")
@@ -0,0 +1,47 @@
+"""Chunk page and character offsets
+
+Chunks record the page they came from and their offsets into the cleaned document
+text. Rows written before then get page 1 and empty offsets. Columns that
+``init_db()`` already created are skipped.
+
+Revision ID: 0007_chunk_positions
+Revises: 0006_document_pages
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_chunk_positions"
+down_revision: Union[str, None] = "0006_document_pages"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ("page", "1"),
+    ("char_start", "0"),
+    ("char_end", "0"),
+]
+
+
+def _existing() -> set:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns("api_chunks")}
+
+
+def upgrade() -> None:
+    existing = _existing()
+    for name, default in COLUMNS:
+        if name not in existing:
+            op.add_column("api_chunks", sa.Column(name, sa.Integer, nullable=False, server_default=default))
+
+
+def downgrade() -> None:
+    existing = _existing()
+    with op.batch_alter_table("api_chunks") as batch:
+        for name, _ in COLUMNS:
+            if name in existing:
+                batch.drop_column(name)
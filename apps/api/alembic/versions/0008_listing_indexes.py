@@ -0,0 +1,40 @@
+"""Keyset listing indexes
+
+``GET /cases`` and ``GET /documents`` page newest first by ``(created_at, id)``; these
+indexes make every page a range scan. Databases created before keyset pagination
+lack them.
+
+On PostgreSQL the indexes are built ``CONCURRENTLY`` so writes continue meanwhile.
+
+Revision ID: 0008_listing_indexes
+Revises: 0007_chunk_positions
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_listing_indexes"
+down_revision: Union[str, None] = "0007_chunk_positions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_api_cases_created_at_id", "api_cases", ["created_at", "id"]),
+    ("ix_api_documents_created_at_id", "api_documents", ["created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
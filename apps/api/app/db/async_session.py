@@ -0,0 +1,76 @@
+"""Optional asyncio database access for read endpoints.
+
+With ``DB_ASYNC=1`` the hot read endpoints (see :mod:`app.routers.cases_read`) run as
+coroutines on ``AsyncSession``s, so a waiting query no longer occupies a threadpool
+thread. URLs map to async drivers: PostgreSQL uses psycopg 3's async mode and SQLite
+uses ``aiosqlite``. Engines mirror the sync ones - the primary (or SQLite reader pool)
+and each replica, with the same pool settings, pragmas and read-your-writes routing.
+Writes stay on the sync path.
+"""
+from __future__ import annotations
+
+import os
+from typing import AsyncIterator, List, Optional
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from .pool import engine_options, instrument_engine
+from .routing import ReadRouter, replica_urls, routing_key
+from .session import DATABASE_URL, normalize_url
+from .sqlite import BUSY_TIMEOUT_MS, configure_connection, is_file_sqlite
+
+ASYNC_ENABLED = os.getenv("DB_ASYNC", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def async_url(url: str) -> str:
+    """``url`` with its driver swapped for the asyncio equivalent."""
+    if url.startswith(("sqlite://", "sqlite+pysqlite://")):
+        return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+    if url.startswith(("postgresql://", "postgresql+psycopg2://")):
+        return "postgresql+psycopg://" + url.split("://", 1)[1]
+    return url
+
+
+def create_read_engine(url: str, name: str) -> AsyncEngine:
+    url = async_url(normalize_url(url))
+    options = engine_options(url, name, use_async=True)
+    connect_args = options.pop("connect_args", {})
+    if is_file_sqlite(url):
+        connect_args = {**connect_args, "check_same_thread": False, "timeout": BUSY_TIMEOUT_MS / 1000}
+    engine = create_async_engine(url, connect_args=connect_args, **options)
+    if is_file_sqlite(url):
+        configure_connection(engine.sync_engine, read_only=True)
+    instrument_engine(engine.sync_engine, name)
+    return engine
+
+
+_router: Optional[ReadRouter] = None
+_engines: List[AsyncEngine] = []
+AsyncReadSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_async_router() -> ReadRouter:
+    """Build the async engines on first use (and only when an endpoint needs them)."""
+    global _router
+    if _router is None:
+        primary = create_read_engine(DATABASE_URL, "async-read")
+        replicas = [create_read_engine(url, f"async-replica{i}") for i, url in enumerate(replica_urls(), start=1)]
+        _engines.extend([primary, *replicas])
+        _router = ReadRouter(primary, replicas)
+    return _router
+
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Async counterpart of ``get_read_db``."""
+    key = routing_key(request.path_params, request.query_params)
+    async with AsyncReadSessionLocal(bind=get_async_router().engine_for(key)) as db:
+        yield db
+
+
+async def dispose() -> None:
+    global _router
+    for engine in _engines:
+        await engine.dispose()
+    _engines.clear()
+    _router = None
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from .session import engine
 from .models import Base
+from .search_index import ensure_search_index
+from . import rollups  # noqa: F401  registers the rollup DDL
 
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
-from sqlalchemy import String, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import BigInteger, Boolean, String, DateTime, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -11,6 +11,7 @@ class Base(DeclarativeBase):
 
 class Case(Base):
     __tablename__ = "api_cases"
+    __table_args__ = (Index("ix_api_cases_created_at_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
@@ -19,47 +20,94 @@ class Case(Base):
     summary: Mapped[str] = mapped_column(Text, default="")
     user_story: Mapped[str] = mapped_column(Text, default="")
 
-    documents: Mapped[list["Document"]] = relationship(back_populates="case", cascade="all, delete-orphan")
-    chunks: Mapped[list["Chunk"]] = relationship(back_populates="case", cascade="all, delete-orphan")
-    risks: Mapped[list["Risk"]] = relationship(back_populates="case", cascade="all, delete-orphan")
-    timeline_items: Mapped[list["TimelineItem"]] = relationship(back_populates="case", cascade="all, delete-orphan")
-    checklist_items: Mapped[list["ChecklistItem"]] = relationship(back_populates="case", cascade="all, delete-orphan")
+    documents: Mapped[list["Document"]] = relationship(
+        back_populates="case", cascade="all, delete-orphan", passive_deletes=True
+    )
+    chunks: Mapped[list["Chunk"]] = relationship(
+        back_populates="case", cascade="all, delete-orphan", passive_deletes=True
+    )
+    risks: Mapped[list["Risk"]] = relationship(
+        back_populates="case", cascade="all, delete-orphan", passive_deletes=True
+    )
+    timeline_items: Mapped[list["TimelineItem"]] = relationship(
+        back_populates="case", cascade="all, delete-orphan", passive_deletes=True
+    )
+    checklist_items: Mapped[list["ChecklistItem"]] = relationship(
+        back_populates="case", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
 class Document(Base):
     __tablename__ = "api_documents"
+    __table_args__ = (
+        Index("ix_api_documents_created_at_id", "created_at", "id"),
+        # A case's documents, newest first; also serves lookups by case_id alone.
+        Index("ix_api_documents_case_id_created_at", "case_id", "created_at"),
+        # Content-addressed keys are shared by identical uploads; deletes check for other users.
+        Index("ix_api_documents_storage_key", "storage_key"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id"), index=True)
+    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id", ondelete="CASCADE"))
     created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
 
     filename: Mapped[str] = mapped_column(String(255))
     content_type: Mapped[str] = mapped_column(String(120), default="")
     storage_key: Mapped[str] = mapped_column(String(512))
+    # pending: a presigned upload was issued and the client has not completed it yet.
+    status: Mapped[str] = mapped_column(String(16), default="ready", server_default="ready")  # pending | ready
+    sha256: Mapped[str] = mapped_column(String(64), default="", server_default="")  # hex digest of the content
 
     case: Mapped[Case] = relationship(back_populates="documents")
-    chunks: Mapped[list["Chunk"]] = relationship(back_populates="document", cascade="all, delete-orphan")
+    chunks: Mapped[list["Chunk"]] = relationship(
+        back_populates="document", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
 class Chunk(Base):
     __tablename__ = "api_chunks"
+    # A case's chunks in reading order; also serves lookups by case_id alone.
+    __table_args__ = (Index("ix_api_chunks_case_id_idx", "case_id", "idx"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id"), index=True)
-    document_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_documents.id"), index=True)
+    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id", ondelete="CASCADE"))
+    document_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_documents.id", ondelete="CASCADE"), index=True)
 
     idx: Mapped[int] = mapped_column(Integer)
     text: Mapped[str] = mapped_column(Text)
+    page: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    # Offsets into the cleaned document text.
+    char_start: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    char_end: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     case: Mapped[Case] = relationship(back_populates="chunks")
     document: Mapped[Document] = relationship(back_populates="chunks")
 
 
+class DocumentPage(Base):
+    """A rendered page preview (thumbnail) of a document, stored in the object store."""
+
+    __tablename__ = "api_document_pages"
+    __table_args__ = (Index("ix_api_document_pages_storage_key", "storage_key"),)
+
+    document_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("api_documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    page: Mapped[int] = mapped_column(Integer, primary_key=True)  # 1-based
+    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id", ondelete="CASCADE"), index=True)
+
+    storage_key: Mapped[str] = mapped_column(String(512))
+    content_type: Mapped[str] = mapped_column(String(120), default="image/jpeg")
+    width: Mapped[int] = mapped_column(Integer, default=0)
+    height: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
+
+
 class Risk(Base):
     __tablename__ = "api_risks"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id"), index=True)
+    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id", ondelete="CASCADE"), index=True)
 
     category: Mapped[str] = mapped_column(String(64))
     severity: Mapped[str] = mapped_column(String(16))
@@ -74,7 +122,7 @@ class TimelineItem(Base):
     __tablename__ = "api_timeline_items"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id"), index=True)
+    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id", ondelete="CASCADE"), index=True)
 
     label: Mapped[str] = mapped_column(String(200))
     status: Mapped[str] = mapped_column(String(24), default="todo")
@@ -90,7 +138,7 @@ class ChecklistItem(Base):
     __tablename__ = "api_checklist_items"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id"), index=True)
+    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id", ondelete="CASCADE"), index=True)
 
     label: Mapped[str] = mapped_column(String(200))
     status: Mapped[str] = mapped_column(String(24), default="todo")
@@ -98,3 +146,53 @@ class ChecklistItem(Base):
     evidence_chunk_ids: Mapped[str] = mapped_column(Text, default="")
 
     case: Mapped[Case] = relationship(back_populates="checklist_items")
+
+
+class CaseCounters(Base):
+    """Per-case row counts maintained on write paths so statistics reads are O(1)."""
+
+    __tablename__ = "api_case_counters"
+
+    case_id: Mapped[str] = mapped_column(String(36), ForeignKey("api_cases.id", ondelete="CASCADE"), primary_key=True)
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow, onupdate=dt.datetime.utcnow)
+
+    documents: Mapped[int] = mapped_column(Integer, default=0)
+    chunks: Mapped[int] = mapped_column(Integer, default=0)
+    checklist_items: Mapped[int] = mapped_column(Integer, default=0)
+    timeline_items: Mapped[int] = mapped_column(Integer, default=0)
+    risks: Mapped[int] = mapped_column(Integer, default=0)
+    risks_high: Mapped[int] = mapped_column(Integer, default=0)
+    risks_medium: Mapped[int] = mapped_column(Integer, default=0)
+    risks_low: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class StatsRollupState(Base):
+    """Bookkeeping for a statistics rollup: when it was last refreshed and from where."""
+
+    __tablename__ = "api_stats_rollup_state"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    refreshed_at: Mapped[dt.datetime] = mapped_column(DateTime)
+    full_refreshed_at: Mapped[dt.datetime] = mapped_column(DateTime)
+
+
+class ExportJob(Base):
+    """A bulk export of many cases into one archive, built by a background worker."""
+
+    __tablename__ = "api_export_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
+    finished_at: Mapped[dt.datetime | None] = mapped_column(DateTime, nullable=True)
+    status: Mapped[str] = mapped_column(String(16), default="queued")  # queued | running | succeeded | failed
+
+    format: Mapped[str] = mapped_column(String(16), default="zip")  # zip | jsonl
+    include_documents: Mapped[bool] = mapped_column(Boolean, default=True)
+    scenario: Mapped[str] = mapped_column(String(64), default="")  # empty = all scenarios
+    case_ids: Mapped[str] = mapped_column(Text, default="")  # comma-separated; empty = all cases
+
+    case_count: Mapped[int] = mapped_column(Integer, default=0)
+    document_count: Mapped[int] = mapped_column(Integer, default=0)
+    storage_key: Mapped[str] = mapped_column(String(512), default="")
+    size_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+    error: Mapped[str] = mapped_column(Text, default="")
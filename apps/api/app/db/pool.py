@@ -0,0 +1,182 @@
+"""Connection pool configuration and instrumentation.
+
+Pool settings come from the environment:
+
+``DB_POOL_SIZE`` (5), ``DB_MAX_OVERFLOW`` (10), ``DB_POOL_TIMEOUT`` seconds (30),
+``DB_POOL_RECYCLE`` seconds (1800, ``-1`` disables), ``DB_STATEMENT_TIMEOUT_MS``
+(PostgreSQL only, ``0`` disables) and ``DB_PRE_PING``:
+
+* ``always`` - SQLAlchemy's ``pool_pre_ping``: one extra round trip on every checkout.
+* ``idle`` (default) - ping only connections idle for more than
+  ``DB_PRE_PING_IDLE_SECONDS`` (30), which is when server-side timeouts and failovers
+  actually bite.
+* ``never``.
+
+Every pool reports checkouts, wait time, overflow use and timeouts to
+:data:`app.utils.metrics.REGISTRY` under ``pool="<name>"``.
+"""
+from __future__ import annotations
+
+import os
+import time
+import weakref
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from ..utils.metrics import REGISTRY
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+POOL_CHECKOUTS = REGISTRY.counter("db_pool_checkouts_total", "Connections checked out of the pool.")
+POOL_CONNECTS = REGISTRY.counter("db_pool_connects_total", "New DBAPI connections opened by the pool.")
+POOL_INVALIDATED = REGISTRY.counter("db_pool_invalidations_total", "Connections invalidated (failed ping, errors).")
+POOL_TIMEOUTS = REGISTRY.counter("db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT.")
+POOL_WAIT = REGISTRY.histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.")
+POOL_SIZE = REGISTRY.gauge("db_pool_size", "Configured steady-state pool size.")
+POOL_CHECKED_OUT = REGISTRY.gauge("db_pool_checked_out", "Connections currently checked out.")
+POOL_OVERFLOW = REGISTRY.gauge("db_pool_overflow", "Connections open beyond pool_size (negative: not yet opened).")
+POOL_IDLE = REGISTRY.gauge("db_pool_checked_in", "Idle connections held by the pool.")
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    return int(raw) if raw else default
+
+
+def pool_settings() -> Dict[str, Any]:
+    strategy = os.getenv("DB_PRE_PING", "idle").strip().lower() or "idle"
+    if strategy not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DB_PRE_PING must be one of {PRE_PING_STRATEGIES}, got {strategy!r}")
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 5),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pre_ping": strategy,
+        "pre_ping_idle_seconds": float(os.getenv("DB_PRE_PING_IDLE_SECONDS", "30")),
+        "statement_timeout_ms": _env_int("DB_STATEMENT_TIMEOUT_MS", 0),
+    }
+
+
+def instrumented_pool_class(name: str, base: type = QueuePool) -> type:
+    """A ``QueuePool`` (or ``base``) subclass that times checkouts under ``pool=name``.
+
+    The name lives on the class so ``engine.dispose()`` (which rebuilds the pool from
+    ``self.__class__``) keeps reporting under the same label.
+    """
+
+    class InstrumentedQueuePool(base):
+        metrics_name = name
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                POOL_TIMEOUTS.inc(pool=self.metrics_name)
+                raise
+            finally:
+                POOL_WAIT.observe(time.perf_counter() - start, pool=self.metrics_name)
+
+    return InstrumentedQueuePool
+
+
+def engine_options(url: str, name: str = "primary", *, use_async: bool = False) -> Dict[str, Any]:
+    """``create_engine`` (or, with ``use_async``, ``create_async_engine``) keyword arguments."""
+    settings = pool_settings()
+    options: Dict[str, Any] = {"pool_pre_ping": settings["pre_ping"] == "always"}
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") == "sqlite:"):
+        return options  # SingletonThreadPool/StaticPool territory; nothing to size
+    options.update(
+        poolclass=instrumented_pool_class(name, AsyncAdaptedQueuePool if use_async else QueuePool),
+        pool_size=settings["pool_size"],
+        max_overflow=settings["max_overflow"],
+        pool_timeout=settings["pool_timeout"],
+        pool_recycle=settings["pool_recycle"],
+    )
+    if url.startswith("postgresql") and settings["statement_timeout_ms"] > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings['statement_timeout_ms']}"}
+    return options
+
+
+def instrument_engine(engine: Engine, name: str = "primary") -> None:
+    """Attach pool event counters, scrape-time gauges and the ``idle`` pre-ping."""
+    settings = pool_settings()
+    labels = {"pool": name}
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record) -> None:
+        POOL_CONNECTS.inc(**labels)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record) -> None:
+        if record is not None:
+            record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exception) -> None:
+        POOL_INVALIDATED.inc(**labels)
+
+    idle_limit = settings["pre_ping_idle_seconds"]
+    ping_idle = settings["pre_ping"] == "idle"
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy) -> None:
+        POOL_CHECKOUTS.inc(**labels)
+        if not ping_idle:
+            return
+        since = record.info.get("checked_in_at")
+        if since is None or time.monotonic() - since < idle_limit:
+            return
+        try:
+            cursor = dbapi_conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as e:
+            # The pool discards this connection and retries the checkout with a new one.
+            raise exc.DisconnectionError() from e
+
+    def _pool_stat(attr: str):
+        def read() -> float:
+            pool = engine.pool
+            fn = getattr(pool, attr, None)
+            return float(fn()) if callable(fn) else 0.0
+
+        return read
+
+    POOL_SIZE.set_function(_pool_stat("size"), **labels)
+    POOL_CHECKED_OUT.set_function(_pool_stat("checkedout"), **labels)
+    POOL_OVERFLOW.set_function(_pool_stat("overflow"), **labels)
+    POOL_IDLE.set_function(_pool_stat("checkedin"), **labels)
+
+
+_primaries: "weakref.WeakKeyDictionary[Engine, Engine]" = weakref.WeakKeyDictionary()
+
+
+def register_read_engine(reader: Engine, primary: Engine) -> None:
+    """Record that ``reader`` serves reads of the database ``primary`` writes to."""
+    _primaries[reader] = primary
+
+
+def primary_engine(engine: Engine) -> Engine:
+    """The engine that writes the database ``engine`` reads (``engine`` itself by default)."""
+    return _primaries.get(engine, engine)
+
+
+def pool_status(engine: Engine, name: str = "primary") -> Dict[str, Any]:
+    """Current pool occupancy plus cumulative counters, for health/debug endpoints."""
+    labels = {"pool": name}
+    return {
+        "size": POOL_SIZE.value(**labels),
+        "checked_out": POOL_CHECKED_OUT.value(**labels),
+        "checked_in": POOL_IDLE.value(**labels),
+        "overflow": POOL_OVERFLOW.value(**labels),
+        "checkouts": POOL_CHECKOUTS.value(**labels),
+        "connects": POOL_CONNECTS.value(**labels),
+        "invalidations": POOL_INVALIDATED.value(**labels),
+        "timeouts": POOL_TIMEOUTS.value(**labels),
+        "wait_seconds_total": POOL_WAIT.sum(**labels),
+    }
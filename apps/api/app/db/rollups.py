@@ -0,0 +1,81 @@
+"""Statistics rollup DDL.
+
+``api_stats_daily`` holds case/document/chunk counts per UTC day and scenario. On
+PostgreSQL it is a materialized view (with the unique index ``REFRESH ... CONCURRENTLY``
+needs); elsewhere it is a plain summary table that ``services/rollups.py`` refreshes
+day by day. Documents and their chunks are bucketed by the document's upload day.
+"""
+from __future__ import annotations
+
+from sqlalchemy import DDL, event
+
+from .models import Base
+
+ROLLUP_TABLE = "api_stats_daily"
+
+
+def _buckets_sql(day_expr: str, since_clause: str = "") -> str:
+    """Per-(day, scenario) counts; ``since_clause`` filters on each source's timestamp."""
+    case_filter = f"WHERE k.created_at >= {since_clause}" if since_clause else ""
+    doc_filter = f"WHERE d.created_at >= {since_clause}" if since_clause else ""
+    return f"""
+SELECT day, scenario, SUM(cases) AS cases, SUM(documents) AS documents, SUM(chunks) AS chunks
+FROM (
+    SELECT {day_expr.format(col="k.created_at")} AS day, k.scenario AS scenario,
+           COUNT(*) AS cases, 0 AS documents, 0 AS chunks
+    FROM api_cases k {case_filter}
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT {day_expr.format(col="d.created_at")}, k.scenario, 0, COUNT(*), 0
+    FROM api_documents d JOIN api_cases k ON k.id = d.case_id {doc_filter}
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT {day_expr.format(col="d.created_at")}, k.scenario, 0, 0, COUNT(*)
+    FROM api_chunks c
+    JOIN api_documents d ON d.id = c.document_id
+    JOIN api_cases k ON k.id = d.case_id {doc_filter}
+    GROUP BY 1, 2
+) buckets
+GROUP BY day, scenario
+"""
+
+
+SQLITE_DAY = "date({col})"
+POSTGRES_DAY = "CAST({col} AS DATE)"
+
+SQLITE_REFRESH_FROM = [
+    f"DELETE FROM {ROLLUP_TABLE} WHERE day >= :since",
+    f"INSERT INTO {ROLLUP_TABLE} (day, scenario, cases, documents, chunks)"
+    + _buckets_sql(SQLITE_DAY, ":since"),
+]
+
+POSTGRES_REFRESH = f"REFRESH MATERIALIZED VIEW CONCURRENTLY {ROLLUP_TABLE}"
+
+_SQLITE_CREATE = [
+    f"""CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+        day VARCHAR(10) NOT NULL,
+        scenario VARCHAR(64) NOT NULL,
+        cases INTEGER NOT NULL DEFAULT 0,
+        documents INTEGER NOT NULL DEFAULT 0,
+        chunks INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, scenario)
+    )""",
+]
+
+_POSTGRES_CREATE = [
+    f"CREATE MATERIALIZED VIEW IF NOT EXISTS {ROLLUP_TABLE} AS" + _buckets_sql(POSTGRES_DAY),
+    f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{ROLLUP_TABLE}_day_scenario ON {ROLLUP_TABLE} (day, scenario)",
+]
+
+for _stmt in _SQLITE_CREATE:
+    event.listen(Base.metadata, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in _POSTGRES_CREATE:
+    event.listen(Base.metadata, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+event.listen(
+    Base.metadata, "before_drop", DDL(f"DROP TABLE IF EXISTS {ROLLUP_TABLE}").execute_if(dialect="sqlite")
+)
+event.listen(
+    Base.metadata,
+    "before_drop",
+    DDL(f"DROP MATERIALIZED VIEW IF EXISTS {ROLLUP_TABLE}").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,143 @@
+"""Route read-only sessions to replicas, with read-your-writes per case.
+
+``DATABASE_REPLICA_URLS`` (comma-separated) lists read replicas; read endpoints take
+their session from :meth:`ReadRouter.engine_for`, which round-robins across them.
+Without replicas reads go to the primary's read engine (the reader pool in SQLite
+mode, otherwise the primary itself).
+
+Replicas lag the primary, so a case written through this process is *pinned* to the
+primary for ``DATABASE_REPLICA_STICKY_SECONDS`` (5) after the commit: the upload or
+analysis a client just made is what it reads back. Pins are recorded automatically
+from every committed session (any flushed ``Case`` or row with a ``case_id``). Routes
+without a case in the URL are pinned by their own row: documents and export jobs
+written here pin their id too, and :func:`routing_key` picks the case, document or
+job id a request reads.
+
+Pins live in this process's memory. With several API workers a client's next request
+may land on a worker that did not see the write and read a lagging replica: there is
+no read-your-writes guarantee across workers.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .models import Case, Document, ExportJob
+
+STICKY_SECONDS = float(os.getenv("DATABASE_REPLICA_STICKY_SECONDS", "5"))
+
+# Rows read back by their own id (not their case's) right after being written.
+ID_PINNED_MODELS = (Document, ExportJob)
+ROUTING_PARAMS = ("case_id", "document_id", "job_id")
+
+
+def replica_urls() -> List[str]:
+    raw = os.getenv("DATABASE_REPLICA_URLS", "") or os.getenv("DATABASE_REPLICA_URL", "")
+    return [u.strip() for u in raw.split(",") if u.strip()]
+
+
+class CasePins:
+    """Cases (and id-pinned rows) recently written here, with the time their pin expires."""
+
+    def __init__(self) -> None:
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def pin(self, case_ids: Iterable[str], seconds: float) -> None:
+        until = time.monotonic() + seconds
+        with self._lock:
+            for case_id in case_ids:
+                self._until[case_id] = until
+            if len(self._until) > 10_000:
+                self._prune()
+
+    def is_pinned(self, case_id: str) -> bool:
+        until = self._until.get(case_id)
+        return until is not None and until > time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._until.clear()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for case_id in [c for c, until in self._until.items() if until <= now]:
+            del self._until[case_id]
+
+
+PINS = CasePins()
+
+
+class ReadRouter:
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: Sequence[Engine],
+        *,
+        pins: CasePins = PINS,
+        sticky_seconds: float = STICKY_SECONDS,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.pins = pins
+        self.sticky_seconds = sticky_seconds
+        self._next = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+
+    def engine_for(self, case_id: Optional[str] = None) -> Engine:
+        """The engine for a read of ``case_id`` or a pinned row id (or of nothing in particular)."""
+        if self._next is None or (case_id and self.pins.is_pinned(case_id)):
+            return self.primary
+        with self._lock:
+            return next(self._next)
+
+
+def routing_key(path_params: Mapping[str, str], query_params: Mapping[str, str]) -> Optional[str]:
+    """The id a read request is routed by: its case, else its document or export job."""
+    for name in ROUTING_PARAMS:
+        value = path_params.get(name) or query_params.get(name)
+        if value:
+            return value
+    return None
+
+
+def _written_case_ids(session: Session) -> List[str]:
+    ids = []
+    for obj in session.new | session.dirty | session.deleted:
+        case_id = obj.id if isinstance(obj, Case) else getattr(obj, "case_id", None)
+        if isinstance(case_id, str):
+            ids.append(case_id)
+        if isinstance(obj, ID_PINNED_MODELS) and isinstance(obj.id, str):
+            ids.append(obj.id)
+    return ids
+
+
+def mark_case_written(session: Session, case_id: str) -> None:
+    """Pin ``case_id`` when ``session`` commits, for writes made with bulk ``UPDATE``/``DELETE``."""
+    session.info.setdefault("written_case_ids", set()).add(case_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_cases(session: Session, flush_context) -> None:
+    written = _written_case_ids(session)
+    if written:
+        session.info.setdefault("written_case_ids", set()).update(written)
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_written_cases(session: Session) -> None:
+    written = session.info.pop("written_case_ids", None)
+    if written:
+        PINS.pin(written, STICKY_SECONDS)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_cases(session: Session) -> None:
+    session.info.pop("written_case_ids", None)
@@ -0,0 +1,104 @@
+"""Search index DDL.
+
+Full text over ``api_chunks``: PostgreSQL uses an expression GIN index over
+``to_tsvector('english', text)``; SQLite uses an external-content FTS5 table kept in
+sync by triggers. The FTS5 table is keyed by the chunk rowid, so run
+:func:`rebuild_search_index` after a ``VACUUM``.
+
+Fuzzy matching on case titles/scenarios and document filenames uses ``pg_trgm`` GIN
+indexes on PostgreSQL; SQLite falls back to the in-memory index in
+``services/fuzzy.py``.
+"""
+from __future__ import annotations
+
+from sqlalchemy import DDL, event, text
+from sqlalchemy.engine import Connection, Engine
+
+from .models import Case, Chunk, Document
+
+FTS_TABLE = "api_chunks_fts"
+TS_CONFIG = "english"
+
+_SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        text, content='api_chunks', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON api_chunks BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.rowid, new.text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON api_chunks BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.rowid, old.text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF text ON api_chunks BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.rowid, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.rowid, new.text);
+    END""",
+]
+
+_SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+_POSTGRES_CREATE = [
+    f"CREATE INDEX IF NOT EXISTS ix_api_chunks_text_fts "
+    f"ON api_chunks USING gin (to_tsvector('{TS_CONFIG}', text))",
+]
+
+_TRGM_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+
+_POSTGRES_TRGM = {
+    Case.__table__: [
+        "CREATE INDEX IF NOT EXISTS ix_api_cases_title_trgm ON api_cases USING gin (title gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_api_cases_scenario_trgm ON api_cases USING gin (scenario gin_trgm_ops)",
+    ],
+    Document.__table__: [
+        "CREATE INDEX IF NOT EXISTS ix_api_documents_filename_trgm "
+        "ON api_documents USING gin (filename gin_trgm_ops)",
+    ],
+}
+
+for _table, _stmts in _POSTGRES_TRGM.items():
+    for _stmt in [_TRGM_EXTENSION, *_stmts]:
+        event.listen(_table, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+for _stmt in _SQLITE_CREATE:
+    event.listen(Chunk.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in _POSTGRES_CREATE:
+    event.listen(Chunk.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+for _stmt in _SQLITE_DROP:
+    event.listen(Chunk.__table__, "before_drop", DDL(_stmt).execute_if(dialect="sqlite"))
+
+
+def _fts_table_exists(conn: Connection) -> bool:
+    row = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first()
+    return row is not None
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the index on databases whose chunk table predates it."""
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            existed = _fts_table_exists(conn)
+            for stmt in _SQLITE_CREATE:
+                conn.execute(text(stmt))
+            if not existed:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        elif conn.dialect.name == "postgresql":
+            for stmt in _POSTGRES_CREATE:
+                conn.execute(text(stmt))
+            conn.execute(text(_TRGM_EXTENSION))
+            for stmts in _POSTGRES_TRGM.values():
+                for stmt in stmts:
+                    conn.execute(text(stmt))
+
+
+def rebuild_search_index(engine: Engine) -> None:
+    """Rebuild the SQLite FTS5 index from ``api_chunks`` (no-op elsewhere)."""
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
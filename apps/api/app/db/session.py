@@ -4,6 +4,10 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from .pool import engine_options, instrument_engine, register_read_engine
+from .routing import ReadRouter, replica_urls
+from .sqlite import create_sqlite_engines, is_file_sqlite
+
 
 def _default_sqlite_url() -> str:
     base = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "data"))
@@ -11,15 +15,40 @@ def _default_sqlite_url() -> str:
     return f"sqlite:///{os.path.join(base, 'lifebridge.db')}"
 
 
-DATABASE_URL = os.getenv("DATABASE_URL", "").strip() or _default_sqlite_url()
+def normalize_url(url: str) -> str:
+    # Fix for Render/Supabase: Force psycopg 3 driver
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return url
+
+
+def _create_engine(url: str, name: str):
+    engine_kwargs = engine_options(url, name)
+    connect_args = engine_kwargs.pop("connect_args", {})
+    if url.startswith("sqlite"):
+        connect_args = {**connect_args, "check_same_thread": False}
+    engine = create_engine(url, connect_args=connect_args, **engine_kwargs)
+    instrument_engine(engine, name)
+    return engine
+
+
+DATABASE_URL = normalize_url(os.getenv("DATABASE_URL", "").strip() or _default_sqlite_url())
+
+if is_file_sqlite(DATABASE_URL):
+    # Single serialized writer plus concurrent WAL readers (see sqlite.py).
+    engine, read_engine = create_sqlite_engines(DATABASE_URL)
+else:
+    engine = _create_engine(DATABASE_URL, "primary")
+    read_engine = engine
 
-# Fix for Render/Supabase: Force psycopg 3 driver
-if DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
+replica_engines = []
+for i, url in enumerate(replica_urls(), start=1):
+    replica = _create_engine(normalize_url(url), f"replica{i}")
+    register_read_engine(replica, engine)
+    replica_engines.append(replica)
 
-connect_args = {}
-if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+# Reads go to replicas when configured; recently written cases stay on read_engine.
+read_router = ReadRouter(read_engine, replica_engines)
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
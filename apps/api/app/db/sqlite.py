@@ -0,0 +1,101 @@
+"""SQLite production mode for single-node deployments.
+
+A file-backed SQLite database gets two engines:
+
+* a **writer** with exactly one pooled connection. Write endpoints queue on that pool
+  (FIFO, bounded by ``DB_POOL_TIMEOUT``), so writes are serialized in-process and
+  never race each other for SQLite's lock. Transactions start with
+  ``BEGIN IMMEDIATE`` so a second process sharing the file waits on ``busy_timeout``
+  up front instead of failing a read-to-write upgrade with "database is locked".
+* a **reader** pool (``DB_POOL_SIZE``) opened with ``query_only``. In WAL mode
+  readers see the last committed snapshot and neither block nor are blocked by the
+  writer.
+
+Pragmas applied to every connection, overridable from the environment:
+``SQLITE_JOURNAL_MODE`` (WAL), ``SQLITE_SYNCHRONOUS`` (NORMAL - durable across
+application crashes; the last transactions may roll back on power loss),
+``SQLITE_MMAP_SIZE`` bytes (256 MiB), ``SQLITE_CACHE_SIZE_KB`` (65536) and
+``SQLITE_BUSY_TIMEOUT_MS`` (5000). Foreign keys are always enforced.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from .pool import engine_options, instrument_engine, register_read_engine
+
+JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL").strip().upper()
+SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").strip().upper()
+MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+def is_file_sqlite(url: str) -> bool:
+    if not url.startswith("sqlite"):
+        return False
+    path = url.split("://", 1)[-1].lstrip("/")
+    return bool(path) and ":memory:" not in path
+
+
+def connection_pragmas(read_only: bool = False) -> Dict[str, Any]:
+    pragmas: Dict[str, Any] = {
+        "journal_mode": JOURNAL_MODE,
+        "synchronous": SYNCHRONOUS,
+        "mmap_size": MMAP_SIZE,
+        # Negative values are KiB rather than pages.
+        "cache_size": -CACHE_SIZE_KB,
+        "busy_timeout": BUSY_TIMEOUT_MS,
+        "temp_store": "MEMORY",
+        # Enforce foreign keys, including their ON DELETE CASCADE actions.
+        "foreign_keys": "ON",
+    }
+    if read_only:
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+
+def configure_connection(engine: Engine, *, read_only: bool = False, immediate: bool = False) -> None:
+    """Apply the pragmas on connect; with ``immediate``, begin write transactions eagerly."""
+    pragmas = connection_pragmas(read_only)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record) -> None:
+        if immediate:
+            # Take transaction control away from pysqlite so "begin" below decides.
+            dbapi_conn.isolation_level = None
+        cursor = dbapi_conn.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    if immediate:
+
+        @event.listens_for(engine, "begin")
+        def _on_begin(conn) -> None:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_sqlite_engines(url: str) -> Tuple[Engine, Engine]:
+    """Return ``(writer, reader)`` engines for a file-backed SQLite ``url``."""
+    connect_args = {"check_same_thread": False, "timeout": BUSY_TIMEOUT_MS / 1000}
+
+    writer_options = engine_options(url, "primary")
+    writer_options.update(pool_size=1, max_overflow=0)
+    writer_options.pop("connect_args", None)
+    writer = create_engine(url, connect_args=connect_args, **writer_options)
+    configure_connection(writer, immediate=True)
+    instrument_engine(writer, "primary")
+
+    reader_options = engine_options(url, "read")
+    reader_options.pop("connect_args", None)
+    reader = create_engine(url, connect_args=connect_args, **reader_options)
+    configure_connection(reader, read_only=True)
+    instrument_engine(reader, "read")
+    register_read_engine(reader, writer)
+    return writer, reader
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import datetime as dt
+import hashlib
+import io
 import os
 import time
 import uuid
@@ -7,29 +11,50 @@ from typing import Generator, List
 
 from fastapi import Depends, FastAPI, File, HTTPException, Query, Request, Response, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, PlainTextResponse, FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from .db import async_session as async_db
 from .db.init_db import init_db
-from .db.models import Case, ChecklistItem, Chunk, Document, Risk, TimelineItem
-from .db.session import SessionLocal, engine
+from .db.models import Case, ChecklistItem, Chunk, Document, DocumentPage, ExportJob, Risk, TimelineItem
+from .db.pool import pool_status
+from .db.routing import mark_case_written, routing_key
+from .db.session import ReadSessionLocal, SessionLocal, engine, read_router, replica_engines
 from .schemas.case import (
     CaseCreate,
     CaseOut,
-    ChecklistItemOut,
     ChunkOut,
-    RiskOut,
-    TimelineItemOut,
     CaseUpdateStory,
+    DirectUploadCreate,
+    DirectUploadOut,
     DocumentOut,
+    OutputsOut,
 )
+from .schemas.export import ExportCreate, ExportJobOut
+from .schemas.search import ChunkSearchHit, ChunkSearchResponse
 from pydantic import BaseModel
-from .services.extract import extract_text
+from .services.case_views import case_dict, outputs_payload
+from .services.extract import extract_text, iter_chunks
 from .services.reason import build_reasoning
-from .services.storage import get_store
-from .services.export import export_case_json, export_case_markdown
-from .routers import knowledge, attorneys
+from .services.fuzzy import fuzzy_search_cases
+from .services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    keyset_page,
+)
+from .services.search import search_chunks
+from .services import bulk_export, deletion, http_clients, previews, rollups, stats, storage_gc
+from .services.storage import get_store, new_key
+from .services.export import stream_case_export
+from .services.knowledge import knowledge_service
+from .routers import cases_read, knowledge, attorneys
+from .utils.file_responses import file_response
 from .utils.logger import configure_logging, get_logger
+from .utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+from .utils.serialization import JSONResponse, model_response
 
 # Configure logging
 configure_logging()
@@ -42,14 +67,33 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Session for read-only endpoints: a replica, unless the case (or row) was just written here."""
+    key = routing_key(request.path_params, request.query_params)
+    db = ReadSessionLocal(bind=read_router.engine_for(key))
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _keyset_or_400(query, created_col, id_col, cursor, limit):
+    try:
+        return keyset_page(query, created_col, id_col, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
 app = FastAPI(
     title="LifeBridge API",
     version="1.0.0",
     description="AI-powered cross-border mobility assistant. Transform documents into actionable insights.",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=JSONResponse,
 )
 
+if async_db.ASYNC_ENABLED:
+    # Registered first so these async handlers take precedence over the sync routes below.
+    app.include_router(cases_read.router)
 app.include_router(knowledge.router) # Knowledge base routes
 app.include_router(attorneys.router) # Attorney search routes
 
@@ -61,6 +105,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -131,6 +176,11 @@ def _startup() -> None:
     try:
         init_db()
         logger.info("database_initialized")
+        with SessionLocal() as db:
+            backfilled = stats.backfill_counters(db)
+        if backfilled:
+            logger.info("case_counters_backfilled", cases=backfilled)
+        bulk_export.resume_interrupted_jobs(engine, read_bind=read_router.engine_for())
         
         # Test storage connection
         store = get_store()
@@ -142,10 +192,28 @@ def _startup() -> None:
         raise
 
 
+@app.on_event("startup")
+async def _start_background_tasks() -> None:
+    if rollups.REFRESH_INTERVAL_SECONDS > 0:
+        app.state.rollup_task = asyncio.create_task(rollups.run_refresher(SessionLocal))
+    if storage_gc.INTERVAL_SECONDS > 0:
+        app.state.storage_gc_task = asyncio.create_task(storage_gc.run_collector(SessionLocal))
+
+
 @app.on_event("shutdown")
-def _shutdown() -> None:
+async def _shutdown() -> None:
     """Cleanup on application shutdown."""
     logger.info("application_shutting_down")
+    for name in ("rollup_task", "storage_gc_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    bulk_export.shutdown(wait=False)
+    previews.shutdown(wait=False)
+    deletion.shutdown(wait=True)
+    await knowledge_service.cache.aclose()
+    await http_clients.shutdown()
+    await async_db.dispose()
 
 
 @app.get("/health")
@@ -181,10 +249,20 @@ def health() -> dict:
                 "database": db_status,
                 "storage": storage_status,
             },
+            "database_pool": pool_status(engine),
+            "replica_pools": {
+                f"replica{i}": pool_status(r, f"replica{i}") for i, r in enumerate(replica_engines, start=1)
+            },
         },
     )
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Prometheus metrics (connection pool saturation and wait times)."""
+    return Response(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.post("/cases", response_model=CaseOut, status_code=status.HTTP_201_CREATED)
 def create_case(payload: CaseCreate, db: Session = Depends(get_db)) -> CaseOut:
     """Create a new case for document processing."""
@@ -194,6 +272,7 @@ def create_case(payload: CaseCreate, db: Session = Depends(get_db)) -> CaseOut:
         
         case = Case(id=case_id, title=payload.title, scenario=payload.scenario, summary="")
         db.add(case)
+        stats.init_counters(db, case_id)
         db.commit()
         
         logger.info("case_created", case_id=case_id)
@@ -208,7 +287,7 @@ def create_case(payload: CaseCreate, db: Session = Depends(get_db)) -> CaseOut:
 
 
 @app.get("/cases/{case_id}", response_model=CaseOut)
-def get_case(case_id: str, db: Session = Depends(get_db)) -> CaseOut:
+def get_case(case_id: str, db: Session = Depends(get_read_db)) -> CaseOut:
     """Get details of a specific case."""
     logger.info("fetching_case", case_id=case_id)
     
@@ -221,7 +300,7 @@ def get_case(case_id: str, db: Session = Depends(get_db)) -> CaseOut:
         )
     
     logger.info("case_fetched", case_id=case_id)
-    return CaseOut(id=case.id, title=case.title, scenario=case.scenario, summary=case.summary, user_story=case.user_story)
+    return model_response(CaseOut, case_dict(case, with_story=True))
 
 
 @app.patch("/cases/{case_id}/story", response_model=CaseOut)
@@ -236,13 +315,62 @@ def update_case_story(case_id: str, payload: CaseUpdateStory, db: Session = Depe
     return CaseOut(id=case.id, title=case.title, scenario=case.scenario, summary=case.summary, user_story=case.user_story)
 
 
+ALLOWED_UPLOAD_TYPES = ["application/pdf", "image/png", "image/jpeg", "image/jpg"]
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+# A document's bytes never change under its id, so browsers may reuse them this long.
+DOCUMENT_CACHE_MAX_AGE = int(os.getenv("DOCUMENT_CACHE_MAX_AGE_SECONDS", "86400"))
+THUMBNAIL_CACHE_MAX_AGE = 365 * 24 * 3600
+
+
+def _check_upload_type(case_id: str, content_type: str | None) -> None:
+    if content_type and content_type not in ALLOWED_UPLOAD_TYPES:
+        logger.warning(
+            "invalid_file_type",
+            case_id=case_id,
+            content_type=content_type,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported file type: {content_type}. Allowed types: {', '.join(ALLOWED_UPLOAD_TYPES)}",
+        )
+
+
+def _check_upload_size(size: int) -> None:
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File size exceeds 10MB limit",
+        )
+
+
+def _add_chunks(db: Session, case_id: str, doc_id: str, extracted) -> None:
+    for idx, chunk in enumerate(extracted.chunks):
+        db.add(
+            Chunk(
+                id=str(uuid.uuid4()),
+                case_id=case_id,
+                document_id=doc_id,
+                idx=idx,
+                text=chunk.text,
+                page=chunk.page,
+                char_start=chunk.start,
+                char_end=chunk.end,
+            )
+        )
+
+
 @app.post("/cases/{case_id}/documents", response_model=dict, status_code=status.HTTP_201_CREATED)
 def upload_document(
     case_id: str,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
 ) -> dict:
-    """Upload and process a document for a case."""
+    """Upload and process a document for a case.
+
+    The case is looked up on the primary and that read transaction ends at once;
+    validation, storage and text extraction then run before the inserts, so the write
+    transaction (and SQLite's single writer) is held only for the inserts.
+    """
     logger.info(
         "document_upload_started",
         case_id=case_id,
@@ -252,6 +380,7 @@ def upload_document(
     
     # Validate case exists
     case = db.get(Case, case_id)
+    db.rollback()
     if not case:
         logger.warning("upload_case_not_found", case_id=case_id)
         raise HTTPException(
@@ -260,39 +389,29 @@ def upload_document(
         )
     
     # Validate file type
-    allowed_types = ["application/pdf", "image/png", "image/jpeg", "image/jpg"]
-    if file.content_type and file.content_type not in allowed_types:
-        logger.warning(
-            "invalid_file_type",
-            case_id=case_id,
-            content_type=file.content_type,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported file type: {file.content_type}. Allowed types: {', '.join(allowed_types)}",
-        )
+    _check_upload_type(case_id, file.content_type)
     
     try:
-        # Read file data
-        data = file.file.read()
-        file_size_mb = len(data) / (1024 * 1024)
+        # Size the spooled upload without reading it into memory
+        file.file.seek(0, io.SEEK_END)
+        size = file.file.tell()
+        file.file.seek(0)
+        file_size_mb = size / (1024 * 1024)
         logger.info("file_read", case_id=case_id, size_mb=round(file_size_mb, 2))
         
         # Validate file size (10MB limit)
-        if len(data) > 10 * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail="File size exceeds 10MB limit",
-            )
+        _check_upload_size(size)
         
-        # Store file
+        # Store file, streaming from the spooled upload (multipart on S3 for large files)
         store = get_store()
         stored = store.put(
-            fileobj=open_bytesio(data),
+            fileobj=file.file,
             filename=file.filename or "upload",
             content_type=file.content_type or "application/octet-stream",
         )
         logger.info("file_stored", case_id=case_id, storage_key=stored.key)
+        file.file.seek(0)
+        data = file.file.read()
         
         # Create document record
         doc_id = str(uuid.uuid4())
@@ -302,32 +421,29 @@ def upload_document(
             filename=file.filename or "upload",
             content_type=file.content_type or "",
             storage_key=stored.key,
+            sha256=stored.sha256 or hashlib.sha256(data).hexdigest(),
         )
         db.add(doc)
         
         # Extract text
         logger.info("extracting_text", case_id=case_id, document_id=doc_id)
-        extracted = extract_text(file.content_type or "", data)
+        page_images = previews.PageImages()
+        extracted = extract_text(file.content_type or "", data, on_page_image=page_images)
         logger.info(
             "text_extracted",
             case_id=case_id,
             document_id=doc_id,
             chunks=len(extracted.chunks),
-            text_length=len(extracted.full_text),
+            pages=extracted.page_count,
+            text_length=extracted.text_length,
         )
         
         # Store chunks
-        for idx, chunk_text in enumerate(extracted.chunks):
-            c = Chunk(
-                id=str(uuid.uuid4()),
-                case_id=case_id,
-                document_id=doc_id,
-                idx=idx,
-                text=chunk_text,
-            )
-            db.add(c)
+        _add_chunks(db, case_id, doc_id, extracted)
         
+        stats.bump_counters(db, case_id, documents=1, chunks=len(extracted.chunks))
         db.commit()
+        previews.submit(doc_id, file.content_type or "", data, page_images.thumbnails, db.get_bind(), store)
         
         logger.info(
             "document_upload_completed",
@@ -359,8 +475,123 @@ def upload_document(
         )
 
 
+@app.post(
+    "/cases/{case_id}/documents/direct",
+    response_model=DirectUploadOut,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_direct_upload(
+    case_id: str,
+    payload: DirectUploadCreate,
+    db: Session = Depends(get_db),
+) -> DirectUploadOut:
+    """Start a browser-to-storage upload: returns a presigned PUT URL for a pending document.
+
+    The client PUTs the file to ``upload_url`` with ``headers``, then calls
+    ``POST /documents/{document_id}/complete`` to have it extracted.
+    """
+    if not db.get(Case, case_id):
+        raise HTTPException(status_code=404, detail=f"Case with ID {case_id} not found")
+    _check_upload_type(case_id, payload.content_type)
+    _check_upload_size(payload.size)
+
+    key = new_key(payload.filename)
+    presigned = get_store().presign_upload(key, payload.content_type)
+    if presigned is None:
+        raise HTTPException(status_code=501, detail="Direct uploads require S3 storage")
+
+    doc = Document(
+        id=str(uuid.uuid4()),
+        case_id=case_id,
+        filename=payload.filename,
+        content_type=payload.content_type,
+        storage_key=key,
+        status="pending",
+    )
+    db.add(doc)
+    db.commit()
+    logger.info("direct_upload_issued", case_id=case_id, document_id=doc.id, storage_key=key)
+    return DirectUploadOut(
+        document_id=doc.id,
+        upload_url=presigned.url,
+        method=presigned.method,
+        headers=presigned.headers,
+        expires_in=presigned.expires_in,
+    )
+
+
+@app.post("/documents/{document_id}/complete", response_model=dict)
+def complete_direct_upload(
+    document_id: str,
+    db: Session = Depends(get_db),
+) -> dict:
+    """Extract a document uploaded through a presigned URL and mark it ready.
+
+    Extraction reads the object from storage and runs before the write; the write only
+    flips ``pending`` to ``ready``, so a repeated or concurrent call gets a 409.
+    """
+    doc = db.get(Document, document_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if doc.status != "pending":
+        raise HTTPException(status_code=409, detail="Upload already completed")
+    case_id, key, content_type, filename = doc.case_id, doc.storage_key, doc.content_type, doc.filename
+    db.rollback()
+
+    store = get_store()
+    try:
+        size = store.size(key)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=409, detail="File has not been uploaded yet") from e
+    _check_upload_size(size)
+
+    try:
+        with store.open(key) as f:
+            data = f.read()
+        page_images = previews.PageImages()
+        extracted = extract_text(content_type, data, on_page_image=page_images)
+
+        claimed = db.execute(
+            update(Document)
+            .where(Document.id == document_id, Document.status == "pending")
+            .values(status="ready", sha256=hashlib.sha256(data).hexdigest())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not claimed:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Upload already completed")
+        _add_chunks(db, case_id, document_id, extracted)
+        stats.bump_counters(db, case_id, documents=1, chunks=len(extracted.chunks))
+        mark_case_written(db, case_id)
+        db.commit()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(
+            "direct_upload_failed",
+            case_id=case_id,
+            document_id=document_id,
+            error=str(e),
+            exc_info=True,
+        )
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to process document. Please try again.",
+        ) from e
+    previews.submit(document_id, content_type, data, page_images.thumbnails, db.get_bind(), store)
+
+    logger.info("direct_upload_completed", case_id=case_id, document_id=document_id, chunks=len(extracted.chunks))
+    return {
+        "document_id": document_id,
+        "chunks": len(extracted.chunks),
+        "filename": filename,
+        "size_mb": round(size / (1024 * 1024), 2),
+    }
+
+
 @app.get("/cases/{case_id}/documents", response_model=List[DocumentOut])
-def list_case_documents(case_id: str, db: Session = Depends(get_db)) -> List[DocumentOut]:
+def list_case_documents(case_id: str, db: Session = Depends(get_read_db)) -> List[DocumentOut]:
     """List documents for a specific case."""
     logger.info("listing_case_documents", case_id=case_id)
     case = db.get(Case, case_id)
@@ -375,14 +606,23 @@ def list_case_documents(case_id: str, db: Session = Depends(get_db)) -> List[Doc
             case_id=d.case_id,
             filename=d.filename,
             content_type=d.content_type,
-            created_at=d.created_at.isoformat()
+            created_at=d.created_at.isoformat(),
+            status=d.status,
         ) for d in docs
     ]
 
 
 @app.post("/cases/{case_id}/analyze", response_model=dict)
-def analyze_case(case_id: str, db: Session = Depends(get_db)) -> dict:
-    """Analyze case documents and generate outputs."""
+def analyze_case(
+    case_id: str,
+    db: Session = Depends(get_db),
+) -> dict:
+    """Analyze case documents and generate outputs.
+
+    Inputs are read from the primary (a lagging replica could miss new chunks or cite
+    deleted ones) and that read transaction ends before reasoning runs; the prior
+    outputs are then replaced in one short write transaction.
+    """
     logger.info("analysis_started", case_id=case_id)
     
     # Validate case exists
@@ -395,24 +635,15 @@ def analyze_case(case_id: str, db: Session = Depends(get_db)) -> dict:
         )
     
     try:
-        # Clear prior outputs to keep runs deterministic
-        deleted_checklist = db.query(ChecklistItem).filter(ChecklistItem.case_id == case_id).delete()
-        deleted_timeline = db.query(TimelineItem).filter(TimelineItem.case_id == case_id).delete()
-        deleted_risks = db.query(Risk).filter(Risk.case_id == case_id).delete()
-        logger.info(
-            "cleared_prior_outputs",
-            case_id=case_id,
-            checklist=deleted_checklist,
-            timeline=deleted_timeline,
-            risks=deleted_risks,
-        )
-        
         # Load chunks
-        chunks = db.query(Chunk).filter(Chunk.case_id == case_id).order_by(Chunk.idx.asc()).all()
+        chunks = db.query(Chunk.id, Chunk.text).filter(Chunk.case_id == case_id).order_by(Chunk.idx.asc()).all()
+        chunk_ids: List[str] = [c.id for c in chunks]
         chunk_texts: List[str] = [c.text for c in chunks]
+        scenario, user_story = case.scenario, case.user_story
+        db.rollback()
         logger.info("chunks_loaded", case_id=case_id, count=len(chunks))
         
-        if not chunks and not case.user_story:
+        if not chunks and not user_story:
             logger.warning("no_content_found", case_id=case_id)
             return {
                 "ok": True,
@@ -420,9 +651,8 @@ def analyze_case(case_id: str, db: Session = Depends(get_db)) -> dict:
             }
         
         # Run reasoning
-        logger.info("running_reasoning", case_id=case_id, scenario=case.scenario)
-        rr = build_reasoning(case.scenario, chunk_texts, user_story=case.user_story or "")
-        case.summary = rr.summary
+        logger.info("running_reasoning", case_id=case_id, scenario=scenario)
+        rr = build_reasoning(scenario, chunk_texts, user_story=user_story or "")
         logger.info(
             "reasoning_completed",
             case_id=case_id,
@@ -431,9 +661,23 @@ def analyze_case(case_id: str, db: Session = Depends(get_db)) -> dict:
             risk_items=len(rr.risks),
         )
         
+        # Clear prior outputs to keep runs deterministic
+        deleted_checklist = db.query(ChecklistItem).filter(ChecklistItem.case_id == case_id).delete()
+        deleted_timeline = db.query(TimelineItem).filter(TimelineItem.case_id == case_id).delete()
+        deleted_risks = db.query(Risk).filter(Risk.case_id == case_id).delete()
+        logger.info(
+            "cleared_prior_outputs",
+            case_id=case_id,
+            checklist=deleted_checklist,
+            timeline=deleted_timeline,
+            risks=deleted_risks,
+        )
+        db.query(Case).filter(Case.id == case_id).update({Case.summary: rr.summary}, synchronize_session=False)
+        mark_case_written(db, case_id)
+        
         # Persist outputs with evidence chunk IDs
         for item in rr.checklist:
-            ids = [chunks[i].id for i in item.evidence_idx if i < len(chunks)]
+            ids = [chunk_ids[i] for i in item.evidence_idx if i < len(chunk_ids)]
             db.add(
                 ChecklistItem(
                     id=str(uuid.uuid4()),
@@ -446,7 +690,7 @@ def analyze_case(case_id: str, db: Session = Depends(get_db)) -> dict:
             )
         
         for item in rr.timeline:
-            ids = [chunks[i].id for i in item.evidence_idx if i < len(chunks)]
+            ids = [chunk_ids[i] for i in item.evidence_idx if i < len(chunk_ids)]
             db.add(
                 TimelineItem(
                     id=str(uuid.uuid4()),
@@ -460,7 +704,7 @@ def analyze_case(case_id: str, db: Session = Depends(get_db)) -> dict:
             )
         
         for item in rr.risks:
-            ids = [chunks[i].id for i in item.evidence_idx if i < len(chunks)]
+            ids = [chunk_ids[i] for i in item.evidence_idx if i < len(chunk_ids)]
             db.add(
                 Risk(
                     id=str(uuid.uuid4()),
@@ -473,12 +717,19 @@ def analyze_case(case_id: str, db: Session = Depends(get_db)) -> dict:
                 )
             )
         
+        stats.set_counters(
+            db,
+            case_id,
+            checklist_items=len(rr.checklist),
+            timeline_items=len(rr.timeline),
+            **stats.risk_counter_values(r.severity for r in rr.risks),
+        )
         db.commit()
         
         logger.info("analysis_completed", case_id=case_id)
         return {
             "ok": True,
-            "summary": case.summary,
+            "summary": rr.summary,
             "counts": {
                 "checklist": len(rr.checklist),
                 "timeline": len(rr.timeline),
@@ -497,8 +748,8 @@ def analyze_case(case_id: str, db: Session = Depends(get_db)) -> dict:
         )
 
 
-@app.get("/cases/{case_id}/outputs", response_model=dict)
-def get_outputs(case_id: str, db: Session = Depends(get_db)) -> dict:
+@app.get("/cases/{case_id}/outputs", response_model=OutputsOut)
+def get_outputs(case_id: str, db: Session = Depends(get_read_db)) -> dict:
     case = db.get(Case, case_id)
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
@@ -508,95 +759,47 @@ def get_outputs(case_id: str, db: Session = Depends(get_db)) -> dict:
     risks = db.query(Risk).filter(Risk.case_id == case_id).all()
     chunks = db.query(Chunk).filter(Chunk.case_id == case_id).all()
     
-    # Fetch documents to map IDs to filenames
     documents = db.query(Document).filter(Document.case_id == case_id).all()
-    doc_map = {d.id: d.filename for d in documents}
-
-    chunk_map = {
-        c.id: {
-            "id": c.id,
-            "document_id": c.document_id,
-            "filename": doc_map.get(c.document_id, "Unknown File"),
-            "idx": c.idx,
-            "text": c.text
-        } 
-        for c in chunks
-    }
 
-    def split_ids(s: str) -> List[str]:
-        return [x for x in (s or "").split(",") if x]
-
-    return {
-        "case": CaseOut(id=case.id, title=case.title, scenario=case.scenario, summary=case.summary, user_story=case.user_story).model_dump(),
-        "checklist": [
-            ChecklistItemOut(
-                id=i.id,
-                label=i.label,
-                status=i.status,
-                notes=i.notes,
-                evidence_chunk_ids=split_ids(i.evidence_chunk_ids),
-            ).model_dump()
-            for i in checklist
-        ],
-        "timeline": [
-            TimelineItemOut(
-                id=i.id,
-                label=i.label,
-                status=i.status,
-                due_date=i.due_date,
-                owner=i.owner,
-                notes=i.notes,
-                evidence_chunk_ids=split_ids(i.evidence_chunk_ids),
-            ).model_dump()
-            for i in timeline
-        ],
-        "risks": [
-            RiskOut(
-                id=i.id,
-                category=i.category,
-                severity=i.severity,
-                statement=i.statement,
-                reason=i.reason,
-                evidence_chunk_ids=split_ids(i.evidence_chunk_ids),
-            ).model_dump()
-            for i in risks
-        ],
-        "chunks": chunk_map,
-    }
+    return model_response(OutputsOut, outputs_payload(case, checklist, timeline, risks, chunks, documents))
 
 
 @app.get("/cases", response_model=List[CaseOut])
-def list_cases(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)) -> List[CaseOut]:
-    """List all cases with pagination."""
-    logger.info("listing_cases", skip=skip, limit=limit)
+def list_cases(
+    cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+) -> List[CaseOut]:
+    """List cases newest first, paginated by cursor."""
+    logger.info("listing_cases", cursor=cursor, limit=limit)
     
-    cases = db.query(Case).order_by(Case.created_at.desc()).offset(skip).limit(limit).all()
+    cases, next_cursor = _keyset_or_400(db.query(Case), Case.created_at, Case.id, cursor, limit)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
     
     logger.info("cases_listed", count=len(cases))
-    return [
-        CaseOut(id=c.id, title=c.title, scenario=c.scenario, summary=c.summary)
-        for c in cases
-    ]
+    return model_response(List[CaseOut], [case_dict(c) for c in cases], headers=headers)
 
 
 @app.delete("/cases/{case_id}", status_code=status.HTTP_200_OK)
 def delete_case(case_id: str, db: Session = Depends(get_db)) -> dict:
-    """Delete a case and all associated data."""
+    """Delete a case and all associated data; its stored files are removed in the background."""
     logger.info("deleting_case", case_id=case_id)
     
-    case = db.get(Case, case_id)
-    if not case:
-        logger.warning("delete_case_not_found", case_id=case_id)
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Case with ID {case_id} not found",
-        )
-    
     try:
-        db.delete(case)
+        storage_keys = deletion.delete_case_rows(db, case_id)
+        if storage_keys is None:
+            db.rollback()
+            logger.warning("delete_case_not_found", case_id=case_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Case with ID {case_id} not found",
+            )
         db.commit()
-        logger.info("case_deleted", case_id=case_id)
+        deletion.schedule_purge(storage_keys)
+        logger.info("case_deleted", case_id=case_id, objects=len(storage_keys))
         return {"success": True}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("case_deletion_failed", case_id=case_id, error=str(e), exc_info=True)
         db.rollback()
@@ -607,7 +810,7 @@ def delete_case(case_id: str, db: Session = Depends(get_db)) -> dict:
 
 
 @app.get("/cases/{case_id}/statistics", response_model=dict)
-def get_case_statistics(case_id: str, db: Session = Depends(get_db)) -> dict:
+def get_case_statistics(case_id: str, db: Session = Depends(get_read_db)) -> dict:
     """Get statistics about a case."""
     logger.info("fetching_statistics", case_id=case_id)
     
@@ -618,59 +821,42 @@ def get_case_statistics(case_id: str, db: Session = Depends(get_db)) -> dict:
             detail=f"Case with ID {case_id} not found",
         )
     
-    # Count various items
-    document_count = db.query(Document).filter(Document.case_id == case_id).count()
-    chunk_count = db.query(Chunk).filter(Chunk.case_id == case_id).count()
-    checklist_count = db.query(ChecklistItem).filter(ChecklistItem.case_id == case_id).count()
-    timeline_count = db.query(TimelineItem).filter(TimelineItem.case_id == case_id).count()
-    risk_count = db.query(Risk).filter(Risk.case_id == case_id).count()
-    
-    # Count risks by severity
-    risks = db.query(Risk).filter(Risk.case_id == case_id).all()
-    risk_breakdown = {"high": 0, "medium": 0, "low": 0}
-    for risk in risks:
-        severity = risk.severity.lower()
-        if severity in risk_breakdown:
-            risk_breakdown[severity] += 1
+    counts = stats.case_statistics(db, case_id)
     
     logger.info("statistics_fetched", case_id=case_id)
     
     return {
         "case_id": case_id,
-        "documents": document_count,
-        "chunks": chunk_count,
-        "checklist_items": checklist_count,
-        "timeline_items": timeline_count,
-        "total_risks": risk_count,
-        "risk_breakdown": risk_breakdown,
+        "documents": counts["documents"],
+        "chunks": counts["chunks"],
+        "checklist_items": counts["checklist_items"],
+        "timeline_items": counts["timeline_items"],
+        "total_risks": counts["risks"],
+        "risk_breakdown": {s: counts[f"risks_{s}"] for s in stats.SEVERITIES},
     }
 
 
 @app.get("/statistics", response_model=dict)
-def get_global_statistics(db: Session = Depends(get_db)) -> dict:
-    """Get global statistics across all cases."""
+def get_global_statistics(
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db),
+) -> dict:
+    """Get global statistics across all cases, as of the last rollup refresh."""
     logger.info("fetching_global_statistics")
-    
-    total_cases = db.query(Case).count()
-    total_documents = db.query(Document).count()
-    total_chunks = db.query(Chunk).count()
-    
-    # Count by scenario
-    from sqlalchemy import func
-    scenario_counts = (
-        db.query(Case.scenario, func.count(Case.id))
-        .group_by(Case.scenario)
-        .all()
-    )
-    
-    logger.info("global_statistics_fetched")
-    
-    return {
-        "total_cases": total_cases,
-        "total_documents": total_documents,
-        "total_chunks": total_chunks,
-        "cases_by_scenario": {scenario: count for scenario, count in scenario_counts},
-    }
+    result = rollups.global_statistics(db, primary)
+    logger.info("global_statistics_fetched", as_of=result["as_of"])
+    return result
+
+
+@app.get("/statistics/daily", response_model=dict)
+def get_daily_statistics(
+    since: dt.date = Query(None, description="First day to include (YYYY-MM-DD)"),
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db),
+) -> dict:
+    """Per-day, per-scenario counts from the statistics rollup."""
+    as_of = rollups.rollup_as_of(db, primary)
+    return {"as_of": as_of.isoformat(), "days": rollups.daily_statistics(db, since)}
 
 
 @app.post("/demo/preset", response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -712,14 +898,17 @@ def create_demo_preset(db: Session = Depends(get_db)) -> dict:
         )
         
         # Split into chunks
-        for idx, t in enumerate([demo_text[i : i + 200] for i in range(0, len(demo_text), 200)]):
+        for idx, chunk in enumerate(iter_chunks([demo_text], chunk_size=200, overlap=0)):
             db.add(
                 Chunk(
                     id=str(uuid.uuid4()),
                     case_id=case_id,
                     document_id=doc_id,
                     idx=idx,
-                    text=t,
+                    text=chunk.text,
+                    page=chunk.page,
+                    char_start=chunk.start,
+                    char_end=chunk.end,
                 )
             )
         
@@ -743,6 +932,7 @@ def create_demo_preset(db: Session = Depends(get_db)) -> dict:
         db.add(Risk(id=str(uuid.uuid4()), case_id=case_id, category="Financial", severity="low", statement="Proof of funds might be scrutinized.", reason="Ensure the host's bank statements show stable income."))
         db.add(Risk(id=str(uuid.uuid4()), case_id=case_id, category="Ties to Home", severity="medium", statement="Visitor must prove intent to return.", reason="Sam should provide proof of employment or property in Mexico."))
 
+        stats.recompute_counters(db, case_id)
         db.commit()
         
         logger.info("demo_preset_created", case_id=case_id)
@@ -761,12 +951,11 @@ def create_demo_preset(db: Session = Depends(get_db)) -> dict:
 def export_case(
     case_id: str,
     format: str = Query("json", regex="^(json|markdown)$"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Export case data in various formats (JSON or Markdown)."""
     logger.info("exporting_case", case_id=case_id, format=format)
     
-    # Get all case data (reuse get_outputs logic)
     case = db.get(Case, case_id)
     if not case:
         raise HTTPException(
@@ -774,112 +963,137 @@ def export_case(
             detail=f"Case with ID {case_id} not found",
         )
     
-    checklist = db.query(ChecklistItem).filter(ChecklistItem.case_id == case_id).all()
-    timeline = db.query(TimelineItem).filter(TimelineItem.case_id == case_id).all()
-    risks = db.query(Risk).filter(Risk.case_id == case_id).all()
-    chunks = db.query(Chunk).filter(Chunk.case_id == case_id).all()
-    
-    def split_ids(s: str) -> List[str]:
-        return [x for x in (s or "").split(",") if x]
-    
-    case_data = {
-        "case": {
-            "id": case.id,
-            "title": case.title,
-            "scenario": case.scenario,
-            "summary": case.summary,
-        },
-        "checklist": [
-            {
-                "id": i.id,
-                "label": i.label,
-                "status": i.status,
-                "notes": i.notes,
-                "evidence_chunk_ids": split_ids(i.evidence_chunk_ids),
-            }
-            for i in checklist
-        ],
-        "timeline": [
-            {
-                "id": i.id,
-                "label": i.label,
-                "due_date": i.due_date,
-                "owner": i.owner,
-                "notes": i.notes,
-                "evidence_chunk_ids": split_ids(i.evidence_chunk_ids),
-            }
-            for i in timeline
-        ],
-        "risks": [
-            {
-                "id": i.id,
-                "category": i.category,
-                "severity": i.severity,
-                "statement": i.statement,
-                "reason": i.reason,
-                "evidence_chunk_ids": split_ids(i.evidence_chunk_ids),
-            }
-            for i in risks
-        ],
-        "chunks": {
-            c.id: {"id": c.id, "document_id": c.document_id, "idx": c.idx, "text": c.text}
-            for c in chunks
-        },
-    }
-    
-    logger.info("case_data_prepared", case_id=case_id, format=format)
-    
     if format == "json":
-        content = export_case_json(case_data)
         media_type = "application/json"
         filename = f"case_{case_id[:8]}.json"
     else:  # markdown
-        content = export_case_markdown(case_data)
         media_type = "text/markdown"
         filename = f"case_{case_id[:8]}.md"
     
-    logger.info("case_exported", case_id=case_id, format=format)
+    logger.info("case_export_streaming", case_id=case_id, format=format)
     
-    return PlainTextResponse(
-        content=content,
+    return StreamingResponse(
+        stream_case_export(db.get_bind(), case_id, format),
         media_type=media_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
+def _export_job_out(job: ExportJob) -> ExportJobOut:
+    download_url = f"/exports/{job.id}/download" if job.status == "succeeded" else None
+    return ExportJobOut(**bulk_export.job_to_dict(job), download_url=download_url)
+
+
+@app.post("/exports", response_model=ExportJobOut, status_code=status.HTTP_202_ACCEPTED)
+def create_export(
+    payload: ExportCreate,
+    db: Session = Depends(get_db),
+) -> ExportJobOut:
+    """Start a bulk export of many cases (optionally with their documents) into one archive."""
+    job = ExportJob(
+        id=str(uuid.uuid4()),
+        format=payload.format,
+        include_documents=payload.include_documents,
+        scenario=payload.scenario or "",
+        case_ids=",".join(payload.case_ids or []),
+    )
+    db.add(job)
+    db.commit()
+    logger.info("bulk_export_queued", job_id=job.id, format=job.format, scenario=job.scenario)
+    # Case data may come from a replica; the job row itself is always read on the primary.
+    replica = read_router.engine_for() if read_router.replicas else None
+    bulk_export.submit(job.id, db.get_bind(), read_bind=replica)
+    return _export_job_out(job)
+
+
+@app.get("/exports/{job_id}", response_model=ExportJobOut)
+def get_export(job_id: str, db: Session = Depends(get_read_db)) -> ExportJobOut:
+    """Get the status of a bulk export job."""
+    job = db.get(ExportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return _export_job_out(job)
+
+
+@app.get("/exports/{job_id}/download")
+def download_export(job_id: str, db: Session = Depends(get_read_db)):
+    """Download the archive of a finished bulk export."""
+    job = db.get(ExportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Export is {job.status}")
+
+    filename = f"cases-{job.id[:8]}.{job.format}"
+    media_type = "application/zip" if job.format == "zip" else "application/x-ndjson"
+    store = get_store()
+    if hasattr(store, "get_download_url"):
+        url = store.get_download_url(job.storage_key, filename=filename)
+        if url.startswith("http"):
+            return RedirectResponse(url)
+    try:
+        path = store.get_file_path(job.storage_key)
+    except NotImplementedError:
+        raise HTTPException(status_code=501, detail="Download available only via direct S3 URL.")
+    return FileResponse(path, filename=filename, media_type=media_type)
+
+
 @app.get("/search")
 def search_cases(
     q: str = Query(..., min_length=2, description="Search query"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> List[CaseOut]:
-    """Search cases by title or scenario."""
+    """Fuzzy search cases by title, scenario or document filename, best match first."""
     logger.info("searching_cases", query=q)
     
-    # Simple search across title and scenario
-    search_term = f"%{q}%"
-    cases = (
-        db.query(Case)
-        .filter(
-            (Case.title.ilike(search_term)) | (Case.scenario.ilike(search_term))
-        )
-        .order_by(Case.created_at.desc())
-        .limit(50)
-        .all()
-    )
+    hits = fuzzy_search_cases(db, q, limit=50)
     
-    logger.info("search_completed", query=q, results=len(cases))
+    logger.info("search_completed", query=q, results=len(hits))
     
     return [
         CaseOut(id=c.id, title=c.title, scenario=c.scenario, summary=c.summary)
-        for c in cases
+        for c, _score in hits
     ]
 
 
+@app.get("/search/documents", response_model=ChunkSearchResponse)
+def search_documents(
+    q: str = Query(..., min_length=2, description="Full-text query over document contents"),
+    case_id: str | None = Query(None, description="Restrict results to one case"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+) -> ChunkSearchResponse:
+    """Ranked full-text search inside uploaded documents, with highlighted snippets."""
+    logger.info("searching_documents", query=q, case_id=case_id, page=page)
+
+    # Fetch one extra row to know whether another page exists without a COUNT(*).
+    hits = search_chunks(db, q, case_id=case_id, limit=page_size + 1, offset=(page - 1) * page_size)
+    has_more = len(hits) > page_size
+    hits = hits[:page_size]
+
+    logger.info("document_search_completed", query=q, results=len(hits))
+    return ChunkSearchResponse(
+        query=q,
+        page=page,
+        page_size=page_size,
+        has_more=has_more,
+        results=[ChunkSearchHit(**vars(h)) for h in hits],
+    )
+
+
 @app.get("/documents", response_model=List[DocumentOut])
-def list_documents(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)) -> List[DocumentOut]:
-    """List all documents."""
-    logger.info("listing_documents", skip=skip, limit=limit)
-    docs = db.query(Document).order_by(Document.created_at.desc()).offset(skip).limit(limit).all()
+def list_documents(
+    response: Response,
+    cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+) -> List[DocumentOut]:
+    """List all documents newest first, paginated by cursor."""
+    logger.info("listing_documents", cursor=cursor, limit=limit)
+    docs, next_cursor = _keyset_or_400(db.query(Document), Document.created_at, Document.id, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return [
         DocumentOut(
@@ -887,71 +1101,105 @@ def list_documents(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)
             case_id=d.case_id,
             filename=d.filename,
             content_type=d.content_type,
-            created_at=d.created_at.isoformat()
+            created_at=d.created_at.isoformat(),
+            status=d.status,
         ) for d in docs
     ]
 
 
 @app.get("/documents/{document_id}/download")
-def download_document(document_id: str, db: Session = Depends(get_db)):
-    """Download a document file."""
+def download_document(request: Request, document_id: str, db: Session = Depends(get_read_db)):
+    """Download a document file.
+
+    On S3 this redirects to the public URL or a short-lived presigned GET URL, so the
+    bytes go straight from storage to the client. Local storage serves the file with
+    byte-range and conditional GET support, keyed on the content hash.
+    """
     logger.info("downloading_document", document_id=document_id)
     doc = db.get(Document, document_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
+    if doc.status == "pending":
+        raise HTTPException(status_code=409, detail="Upload has not been completed")
 
     try:
         store = get_store()
         
-        # S3 Storage: Redirect to public URL
+        # S3 Storage: Redirect to a public or presigned URL
         if hasattr(store, "get_download_url"):
-             try:
-                 url = store.get_download_url(doc.storage_key)
-                 # Check if it's an HTTP URL we can redirect to
-                 if url.startswith("http"):
-                     return RedirectResponse(url)
-             except Exception:
-                 pass # Fallback or cleaner error
+            url = store.get_download_url(doc.storage_key, filename=doc.filename)
+            if url.startswith("http"):
+                return RedirectResponse(url)
         
         # Local Storage: File Response
-        # Ensure we are using local storage for this endpoint if get_file_path works
-        try:
-             path = store.get_file_path(doc.storage_key)
-             return FileResponse(path, filename=doc.filename, media_type=doc.content_type)
-        except NotImplementedError:
-             # If S3 but failed to get HTTP URL
-             raise HTTPException(status_code=501, detail="Download available only via direct S3 URL.")
-
+        path = store.get_file_path(doc.storage_key)
+        return file_response(
+            request,
+            path,
+            filename=doc.filename,
+            media_type=doc.content_type or None,
+            etag=f'"{doc.sha256}"' if doc.sha256 else f'W/"{doc.id}"',
+            last_modified=doc.created_at,
+            cache_control=f"private, max-age={DOCUMENT_CACHE_MAX_AGE}",
+        )
     except NotImplementedError:
         raise HTTPException(status_code=501, detail="Download not supported for this storage backend")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Stored file not found")
     except Exception as e:
         logger.error("download_failed", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to download file")
 
 
+@app.get("/documents/{document_id}/pages/{page}/thumbnail")
+def get_page_thumbnail(request: Request, document_id: str, page: int, db: Session = Depends(get_read_db)):
+    """A JPEG thumbnail of one page (1-based), generated in the background after upload.
+
+    Thumbnails never change, so local storage serves them as immutable for a year; on S3
+    this redirects to the object like ``download_document``.
+    """
+    thumb = db.get(DocumentPage, (document_id, page))
+    if thumb is None:
+        raise HTTPException(status_code=404, detail="Page preview not found")
+
+    store = get_store()
+    if hasattr(store, "get_download_url"):
+        url = store.get_download_url(thumb.storage_key)
+        if url.startswith("http"):
+            return RedirectResponse(url)
+    try:
+        path = store.get_file_path(thumb.storage_key)
+        return file_response(
+            request,
+            path,
+            filename=f"page-{page}.jpg",
+            media_type=thumb.content_type,
+            etag=f'"{thumb.storage_key.rsplit("/", 1)[-1]}"',
+            last_modified=thumb.created_at,
+            cache_control=f"private, max-age={THUMBNAIL_CACHE_MAX_AGE}, immutable",
+            disposition="inline",
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Page preview not found")
+
+
 @app.delete("/documents/{document_id}", status_code=status.HTTP_200_OK)
 def delete_document(document_id: str, db: Session = Depends(get_db)) -> dict:
-    """Delete a document file and its record."""
-    doc = db.get(Document, document_id)
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
-
+    """Delete a document record and its chunks; the stored file is removed in the background."""
     try:
-        # Delete from storage first
-        store = get_store()
-        try:
-            store.delete(doc.storage_key)
-        except Exception as e:
-            logger.error("storage_deletion_failed", error=str(e))
-            # Continue to delete DB record even if storage delete fails
-            # This prevents "zombie" records that point to nowhere
-
-        # Delete database record
-        db.delete(doc)
+        deleted = deletion.delete_document_rows(db, document_id)
+        if deleted is None:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Document not found")
+        counted = 1 if deleted.status == "ready" else 0
+        stats.bump_counters(db, deleted.case_id, documents=-counted, chunks=-deleted.chunks)
         db.commit()
+        deletion.schedule_purge(deleted.object_keys)
         logger.info("document_deleted", document_id=document_id)
         return {"success": True}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("document_deletion_failed", error=str(e), exc_info=True)
         db.rollback()
@@ -1009,8 +1257,3 @@ def chat_endpoint(payload: ChatRequest):
     response_text = generate_chat_response(payload.message)
     return {"response": response_text}
 
-
-def open_bytesio(data: bytes):
-    import io
-
-    return io.BytesIO(data)
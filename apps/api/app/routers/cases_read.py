@@ -0,0 +1,91 @@
+"""Async versions of the hot case read endpoints.
+
+Mounted ahead of the sync routes when ``DB_ASYNC`` is enabled (see
+:mod:`app.db.async_session`); paths, parameters and response bodies are identical.
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db.async_session import get_async_read_db
+from ..db.models import Case, ChecklistItem, Chunk, Document, Risk, TimelineItem
+from ..schemas.case import CaseOut, DocumentOut, OutputsOut
+from ..services.case_views import case_dict, document_dict, outputs_payload
+from ..services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    finish_page,
+    keyset_window,
+)
+from ..utils.logger import get_logger
+from ..utils.serialization import model_response
+
+router = APIRouter(tags=["cases"])
+logger = get_logger(__name__)
+
+
+async def _get_case_or_404(db: AsyncSession, case_id: str) -> Case:
+    case = await db.get(Case, case_id)
+    if not case:
+        logger.warning("case_not_found", case_id=case_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Case with ID {case_id} not found",
+        )
+    return case
+
+
+@router.get("/cases/{case_id}", response_model=CaseOut)
+async def get_case(case_id: str, db: AsyncSession = Depends(get_async_read_db)):
+    """Get details of a specific case."""
+    logger.info("fetching_case", case_id=case_id)
+    case = await _get_case_or_404(db, case_id)
+    return model_response(CaseOut, case_dict(case, with_story=True))
+
+
+@router.get("/cases/{case_id}/documents", response_model=List[DocumentOut])
+async def list_case_documents(case_id: str, db: AsyncSession = Depends(get_async_read_db)):
+    """List documents for a specific case."""
+    logger.info("listing_case_documents", case_id=case_id)
+    await _get_case_or_404(db, case_id)
+    docs = await db.scalars(
+        select(Document).where(Document.case_id == case_id).order_by(Document.created_at.desc())
+    )
+    return model_response(List[DocumentOut], [document_dict(d) for d in docs])
+
+
+@router.get("/cases/{case_id}/outputs", response_model=OutputsOut)
+async def get_outputs(case_id: str, db: AsyncSession = Depends(get_async_read_db)):
+    case = await _get_case_or_404(db, case_id)
+
+    async def rows(model):
+        return (await db.scalars(select(model).where(model.case_id == case_id))).all()
+
+    checklist = await rows(ChecklistItem)
+    timeline = await rows(TimelineItem)
+    risks = await rows(Risk)
+    chunks = await rows(Chunk)
+    documents = await rows(Document)
+    return model_response(OutputsOut, outputs_payload(case, checklist, timeline, risks, chunks, documents))
+
+
+@router.get("/cases", response_model=List[CaseOut])
+async def list_cases(
+    cursor: str | None = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """List cases newest first, paginated by cursor."""
+    logger.info("listing_cases", cursor=cursor, limit=limit)
+    try:
+        stmt = keyset_window(select(Case), Case.created_at, Case.id, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    cases, next_cursor = finish_page((await db.scalars(stmt)).all(), Case.created_at, Case.id, limit)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    logger.info("cases_listed", count=len(cases))
+    return model_response(List[CaseOut], [case_dict(c) for c in cases], headers=headers)
@@ -48,6 +48,26 @@ class ChunkOut(BaseModel):
     document_id: str
     idx: int
     text: str
+    page: int = 1
+    char_start: int = 0
+    char_end: int = 0
+
+
+class OutputChunkOut(BaseModel):
+    id: str
+    document_id: str
+    filename: str
+    idx: int
+    page: int
+    text: str
+
+
+class OutputsOut(BaseModel):
+    case: CaseOut
+    checklist: list[ChecklistItemOut]
+    timeline: list[TimelineItemOut]
+    risks: list[RiskOut]
+    chunks: dict[str, OutputChunkOut]  # cited evidence, by chunk id
 
 
 class CaseUpdateStory(BaseModel):
@@ -60,3 +80,18 @@ class DocumentOut(BaseModel):
     filename: str
     content_type: str
     created_at: str
+    status: str = "ready"
+
+
+class DirectUploadCreate(BaseModel):
+    filename: str = Field(min_length=1, max_length=255)
+    content_type: str = Field(min_length=1, max_length=120)
+    size: int = Field(gt=0)
+
+
+class DirectUploadOut(BaseModel):
+    document_id: str
+    upload_url: str
+    method: str
+    headers: dict[str, str]
+    expires_in: int
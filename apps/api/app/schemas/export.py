@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class ExportCreate(BaseModel):
+    format: Literal["zip", "jsonl"] = "zip"
+    include_documents: bool = True
+    scenario: Optional[str] = None
+    case_ids: Optional[List[str]] = None
+
+
+class ExportJobOut(BaseModel):
+    id: str
+    status: str
+    format: str
+    include_documents: bool
+    scenario: Optional[str] = None
+    case_ids: Optional[List[str]] = None
+    case_count: int = 0
+    document_count: int = 0
+    size_bytes: int = 0
+    error: str = ""
+    created_at: str
+    finished_at: Optional[str] = None
+    download_url: Optional[str] = None
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class ChunkSearchHit(BaseModel):
+    case_id: str
+    case_title: str
+    document_id: str
+    filename: str
+    chunk_id: str
+    chunk_idx: int
+    page: int
+    snippet: str
+    score: float
+
+
+class ChunkSearchResponse(BaseModel):
+    query: str
+    page: int
+    page_size: int
+    has_more: bool
+    results: list[ChunkSearchHit]
@@ -0,0 +1,330 @@
+"""Analytics export of every table as JSON Lines or Parquet.
+
+Rows are streamed from the database in batches and written to Hive-style partitions::
+
+    <out>/<table>/scenario=<scenario>/date=<YYYY-MM-DD>/part-00000.parquet
+
+``date`` is the row's creation day: a document's upload day for documents and chunks,
+the case's creation day for everything else. ``scenario`` is carried only by the
+partition path, as Hive-partitioned readers (pyarrow, DuckDB, Spark, BigQuery) expect.
+Parquet needs the optional ``pyarrow`` package.
+
+A partition's files are replaced on the first row written to it, and a full export
+(no ``since``) clears the table's directory first, so re-runs leave no stale parts.
+``since`` exports only the partitions from that day on, which is complete only for
+append-only tables (documents and chunks): analysis rewrites a case's summary and
+replaces its risks, timeline and checklist in place, in partitions dated by the
+case's creation, so those tables are refused with ``since`` and need a full export.
+Parquet rows are buffered across all open partitions up to ``BATCH_SIZE`` in total;
+past that the largest buffer is written out as a row group.
+
+Run from ``apps/api``::
+
+    python -m app.services.analytics_export --format parquet --out ./warehouse
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import glob
+import json
+import os
+import shutil
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..db.models import Case, ChecklistItem, Chunk, Document, Risk, TimelineItem
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BATCH_SIZE = int(os.getenv("ANALYTICS_EXPORT_BATCH_SIZE", "10000"))
+MAX_OPEN_PARTITIONS = 64
+FORMATS = ("jsonl", "parquet")
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    name: str
+    model: Any
+    columns: Tuple[Tuple[str, Any, str], ...]  # (output name, column, type: str | int | datetime)
+    joins: Tuple[Tuple[Any, Any], ...]  # (target, on clause)
+    partition_time: Any
+    append_only: bool = False  # rows are never rewritten, so ``since`` exports are complete
+
+
+def _cols(model, names: Sequence[str], types: Dict[str, str]) -> Tuple[Tuple[str, Any, str], ...]:
+    return tuple((n, getattr(model, n), types.get(n, "str")) for n in names)
+
+
+TABLES: Dict[str, TableSpec] = {
+    "cases": TableSpec(
+        "cases",
+        Case,
+        _cols(Case, ["id", "created_at", "title", "summary", "user_story"], {"created_at": "datetime"}),
+        (),
+        Case.created_at,
+    ),
+    "documents": TableSpec(
+        "documents",
+        Document,
+        _cols(Document, ["id", "case_id", "created_at", "filename", "content_type", "storage_key"], {"created_at": "datetime"}),
+        ((Case, Case.id == Document.case_id),),
+        Document.created_at,
+        append_only=True,
+    ),
+    "chunks": TableSpec(
+        "chunks",
+        Chunk,
+        _cols(
+            Chunk,
+            ["id", "case_id", "document_id", "idx", "page", "char_start", "char_end", "text"],
+            {"idx": "int", "page": "int", "char_start": "int", "char_end": "int"},
+        ),
+        ((Document, Document.id == Chunk.document_id), (Case, Case.id == Chunk.case_id)),
+        Document.created_at,
+        append_only=True,
+    ),
+    "risks": TableSpec(
+        "risks",
+        Risk,
+        _cols(Risk, ["id", "case_id", "category", "severity", "statement", "reason", "evidence_chunk_ids"], {}),
+        ((Case, Case.id == Risk.case_id),),
+        Case.created_at,
+    ),
+    "timeline": TableSpec(
+        "timeline",
+        TimelineItem,
+        _cols(TimelineItem, ["id", "case_id", "label", "due_date", "owner", "notes", "evidence_chunk_ids"], {}),
+        ((Case, Case.id == TimelineItem.case_id),),
+        Case.created_at,
+    ),
+    "checklist": TableSpec(
+        "checklist",
+        ChecklistItem,
+        _cols(ChecklistItem, ["id", "case_id", "label", "status", "notes", "evidence_chunk_ids"], {}),
+        ((Case, Case.id == ChecklistItem.case_id),),
+        Case.created_at,
+    ),
+}
+
+
+_PA_TYPES = {"str": "string", "int": "int64", "datetime": "timestamp[us]"}
+
+
+def _partition_value(value: Optional[str]) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in (value or "")) or "unknown"
+
+
+class _JsonlPartition:
+    buffered = 0
+
+    def __init__(self, path: str, spec: TableSpec) -> None:
+        self.f = open(path, "w", encoding="utf-8")
+
+    def write(self, row: Dict[str, Any]) -> None:
+        out = {k: (v.isoformat() if isinstance(v, dt.datetime) else v) for k, v in row.items()}
+        self.f.write(json.dumps(out, ensure_ascii=False, separators=(",", ":")))
+        self.f.write("\n")
+
+    def close(self) -> None:
+        self.f.close()
+
+
+class _ParquetPartition:
+    """Buffers rows until :class:`_PartitionedWriter` flushes them as one row group."""
+
+    def __init__(self, path: str, spec: TableSpec) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([(name, pa.type_for_alias(_PA_TYPES[t])) for name, _, t in spec.columns])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        self.rows: List[Dict[str, Any]] = []
+
+    @property
+    def buffered(self) -> int:
+        return len(self.rows)
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self.rows.append(row)
+
+    def flush(self) -> None:
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self.writer.close()
+
+
+class _PartitionedWriter:
+    """Routes rows to per-(scenario, date) files, keeping at most ``max_open`` open.
+
+    A partition closed to make room is continued in a new ``part-NNNNN`` file, so rows
+    need not arrive sorted by partition. Once more than ``max_buffered`` rows are
+    buffered in total, the partition buffering the most is flushed.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        spec: TableSpec,
+        fmt: str,
+        max_open: int = MAX_OPEN_PARTITIONS,
+        max_buffered: int = BATCH_SIZE,
+    ) -> None:
+        self.root = root
+        self.spec = spec
+        self.fmt = fmt
+        self.max_open = max_open
+        self.max_buffered = max_buffered
+        self.buffered = 0
+        self.open: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self.parts: Dict[Tuple[str, str], int] = {}
+        self.files: List[str] = []
+
+    def _writer(self, key: Tuple[str, str]):
+        w = self.open.get(key)
+        if w is not None:
+            self.open.move_to_end(key)
+            return w
+        if len(self.open) >= self.max_open:
+            _, oldest = self.open.popitem(last=False)
+            self.buffered -= oldest.buffered
+            oldest.close()
+        part = self.parts.get(key, 0)
+        self.parts[key] = part + 1
+        scenario, day = key
+        directory = os.path.join(self.root, self.spec.name, f"scenario={scenario}", f"date={day}")
+        os.makedirs(directory, exist_ok=True)
+        if part == 0:
+            for stale in glob.glob(os.path.join(directory, f"part-*.{self.fmt}")):
+                os.remove(stale)
+        path = os.path.join(directory, f"part-{part:05d}.{self.fmt}")
+        w = (_ParquetPartition if self.fmt == "parquet" else _JsonlPartition)(path, self.spec)
+        self.open[key] = w
+        self.files.append(path)
+        return w
+
+    def write(self, scenario: Optional[str], ts: Optional[dt.datetime], row: Dict[str, Any]) -> None:
+        day = ts.date().isoformat() if ts else "unknown"
+        w = self._writer((_partition_value(scenario), day))
+        w.write(row)
+        if w.buffered:
+            self.buffered += 1
+            if self.buffered > self.max_buffered:
+                fullest = max(self.open.values(), key=lambda p: p.buffered)
+                self.buffered -= fullest.buffered
+                fullest.flush()
+
+    def close(self) -> None:
+        while self.open:
+            _, w = self.open.popitem(last=False)
+            w.close()
+
+
+def _table_query(spec: TableSpec, since: Optional[dt.date]):
+    stmt = select(
+        *[col.label(name) for name, col, _ in spec.columns],
+        Case.scenario.label("_scenario"),
+        spec.partition_time.label("_ts"),
+    )
+    stmt = stmt.select_from(spec.model)
+    for target, on in spec.joins:
+        stmt = stmt.join(target, on)
+    if since is not None:
+        stmt = stmt.where(spec.partition_time >= dt.datetime.combine(since, dt.time.min))
+    return stmt
+
+
+def export_table(
+    db: Session, spec: TableSpec, out_dir: str, fmt: str, *, since: Optional[dt.date] = None
+) -> Dict[str, int]:
+    """Stream one table into ``out_dir``; returns row and file counts.
+
+    Without ``since`` the table's previous export is removed first.
+    """
+    if since is None:
+        shutil.rmtree(os.path.join(out_dir, spec.name), ignore_errors=True)
+    writer = _PartitionedWriter(out_dir, spec, fmt)
+    names = [name for name, _, _ in spec.columns]
+    rows = 0
+    try:
+        result = db.execute(_table_query(spec, since).execution_options(yield_per=BATCH_SIZE))
+        for batch in result.partitions():
+            for r in batch:
+                m = r._mapping
+                writer.write(m["_scenario"], m["_ts"], {n: m[n] for n in names})
+                rows += 1
+    finally:
+        writer.close()
+    logger.info("analytics_table_exported", table=spec.name, rows=rows, files=len(writer.files), format=fmt)
+    return {"rows": rows, "files": len(writer.files)}
+
+
+def export_analytics(
+    bind: Engine,
+    out_dir: str,
+    *,
+    fmt: str = "parquet",
+    tables: Optional[Iterable[str]] = None,
+    since: Optional[dt.date] = None,
+) -> Dict[str, Dict[str, int]]:
+    """Export the selected tables (all by default) as ``jsonl`` or ``parquet``."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r}; expected one of {FORMATS}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)") from e
+    names = list(tables or TABLES)
+    unknown = [n for n in names if n not in TABLES]
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(unknown)}")
+    rewritten = [n for n in names if not TABLES[n].append_only]
+    if since is not None and rewritten:
+        raise ValueError(
+            f"since only applies to append-only tables; {', '.join(rewritten)} "
+            "are rewritten in place and need a full export"
+        )
+
+    summary = {}
+    with Session(bind=bind) as db:
+        for name in names:
+            summary[name] = export_table(db, TABLES[name], out_dir, fmt, since=since)
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--tables", nargs="+", choices=list(TABLES), help="Tables to export (default: all)")
+    parser.add_argument(
+        "--since",
+        type=dt.date.fromisoformat,
+        help="Only rows created on or after YYYY-MM-DD (append-only tables: documents, chunks)",
+    )
+    args = parser.parse_args(argv)
+
+    from ..db.session import engine
+
+    try:
+        summary = export_analytics(engine, args.out, fmt=args.format, tables=args.tables, since=args.since)
+    except ValueError as e:
+        parser.error(str(e))
+    for name, counts in summary.items():
+        print(f"{name:10s} {counts['rows']:>12,d} rows  {counts['files']:>6,d} files")
+
+
+if __name__ == "__main__":
+    main()
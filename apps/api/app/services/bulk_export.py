@@ -0,0 +1,367 @@
+"""Bulk export of many cases into one archive.
+
+Jobs run on a small background thread pool (``BULK_EXPORT_WORKERS``). Each job streams
+its cases one at a time into a temporary file on disk, so memory does not grow with the
+number of cases, and fetches original documents from the object store with at most
+``BULK_EXPORT_FETCH_CONCURRENCY`` downloads in flight. The finished archive is uploaded
+to the store under ``exports/``.
+
+Archive layouts:
+
+* ``zip``: ``manifest.json`` plus, per case, ``cases/<id>/case.json``,
+  ``cases/<id>/report.md`` and ``cases/<id>/documents/<document id>-<filename>``.
+* ``jsonl``: one JSON object per case, the same shape as ``case.json`` plus a
+  ``documents`` list (file contents base64-encoded when documents are included).
+  Each line is rendered piece by piece and each document is read and encoded in
+  ``B64_CHUNK_BYTES`` slices, so no record or file is held in memory whole.
+"""
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..db.models import Case, Document, ExportJob
+from ..utils.logger import get_logger
+from .export import (
+    buffered,
+    case_header,
+    iter_case_export,
+    iter_checklist,
+    iter_chunks,
+    iter_risks,
+    iter_timeline,
+)
+from .storage import ObjectStore, get_store
+
+logger = get_logger(__name__)
+
+WORKERS = int(os.getenv("BULK_EXPORT_WORKERS", "2"))
+FETCH_CONCURRENCY = int(os.getenv("BULK_EXPORT_FETCH_CONCURRENCY", "4"))
+EXPORT_PREFIX = "exports"
+B64_CHUNK_BYTES = 48 * 1024  # JSON Lines exports read and encode documents this much at a time
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="bulk-export")
+        return _executor
+
+
+def submit(
+    job_id: str,
+    bind: Engine | Connection,
+    store: Optional[ObjectStore] = None,
+    read_bind: Engine | Connection | None = None,
+) -> Future:
+    """Queue ``job_id`` on the background pool."""
+    return _get_executor().submit(run_export_job, job_id, bind, store, read_bind)
+
+
+def shutdown(wait: bool = False) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=not wait)
+            _executor = None
+
+
+def _safe_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "._- " else "_" for ch in name).strip() or "document"
+
+
+def _read_object(store: ObjectStore, key: str) -> Optional[bytes]:
+    try:
+        with store.open(key) as f:
+            return f.read()
+    except (FileNotFoundError, NotImplementedError):
+        return None
+
+
+def fetch_documents(
+    store: ObjectStore, docs: Iterable[Tuple[str, str, str, str]], concurrency: int = FETCH_CONCURRENCY
+) -> Iterator[Tuple[Tuple[str, str, str, str], Optional[bytes]]]:
+    """Yield ``(doc, content)`` in input order with at most ``concurrency`` fetches in flight.
+
+    ``content`` is ``None`` when the object is missing from the store.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="bulk-export-fetch") as pool:
+        window: Deque[Tuple[Any, Future]] = deque()
+        for doc in docs:
+            window.append((doc, pool.submit(_read_object, store, doc[3])))
+            if len(window) >= concurrency:
+                d, fut = window.popleft()
+                yield d, fut.result()
+        while window:
+            d, fut = window.popleft()
+            yield d, fut.result()
+
+
+def _select_case_ids(db: Session, job: ExportJob) -> List[str]:
+    stmt = select(Case.id).order_by(Case.created_at, Case.id)
+    if job.scenario:
+        stmt = stmt.where(Case.scenario == job.scenario)
+    ids = [x for x in (job.case_ids or "").split(",") if x]
+    if ids:
+        stmt = stmt.where(Case.id.in_(ids))
+    return list(db.scalars(stmt))
+
+
+def _case_documents(db: Session, case_id: str) -> List[Tuple[str, str, str, str]]:
+    stmt = (
+        select(Document.id, Document.filename, Document.content_type, Document.storage_key)
+        .where(Document.case_id == case_id)
+        .order_by(Document.created_at, Document.id)
+    )
+    return [tuple(r) for r in db.execute(stmt)]
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.cases = 0
+        self.documents = 0
+        self.missing: List[str] = []
+
+
+def _write_zip(db: Session, store: ObjectStore, job: ExportJob, case_ids: List[str], out, stats: _Stats) -> None:
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for case_id in case_ids:
+            case = db.get(Case, case_id)
+            if case is None:
+                continue  # deleted while the job ran
+            base = f"cases/{case_id}"
+            for name, fmt in (("case.json", "json"), ("report.md", "markdown")):
+                with zf.open(f"{base}/{name}", "w") as entry:
+                    for piece in buffered(iter_case_export(db, case, fmt)):
+                        entry.write(piece)
+            if job.include_documents:
+                for (doc_id, filename, _, _), content in fetch_documents(store, _case_documents(db, case_id)):
+                    if content is None:
+                        stats.missing.append(doc_id)
+                        continue
+                    zf.writestr(f"{base}/documents/{doc_id}-{_safe_name(filename)}", content)
+                    stats.documents += 1
+            stats.cases += 1
+        manifest = {
+            "job_id": job.id,
+            "generated_at": dt.datetime.utcnow().isoformat(),
+            "scenario": job.scenario or None,
+            "cases": stats.cases,
+            "documents": stats.documents,
+            "missing_documents": stats.missing,
+        }
+        zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+
+
+def _compact(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _iter_joined(pieces: Iterable[str]) -> Iterator[str]:
+    sep = ""
+    for piece in pieces:
+        yield sep + piece
+        sep = ","
+
+
+def _iter_document_entries(
+    store: ObjectStore, docs: List[Tuple[str, str, str, str]], include: bool, stats: _Stats
+) -> Iterator[str]:
+    """A case's ``documents`` array items, each file base64-encoded as it is read."""
+    sep = ""
+    for doc_id, filename, content_type, key in docs:
+        entry = {"id": doc_id, "filename": filename, "content_type": content_type}
+        if not include:
+            yield sep + _compact(entry)
+            sep = ","
+            continue
+        try:
+            f = store.open(key)
+        except (FileNotFoundError, NotImplementedError):
+            stats.missing.append(doc_id)
+            yield sep + _compact(entry | {"missing": True})
+            sep = ","
+            continue
+        with f:
+            yield sep + _compact(entry)[:-1] + ',"content_base64":"'
+            rest = b""
+            while chunk := f.read(B64_CHUNK_BYTES):
+                chunk = rest + chunk
+                cut = len(chunk) - len(chunk) % 3  # whole 3-byte groups encode independently
+                rest = chunk[cut:]
+                yield base64.b64encode(chunk[:cut]).decode("ascii")
+            yield base64.b64encode(rest).decode("ascii") + '"}'
+        stats.documents += 1
+        sep = ","
+
+
+def _iter_jsonl_record(
+    db: Session, store: ObjectStore, job: ExportJob, case: Case, stats: _Stats
+) -> Iterator[str]:
+    """One case as a single compact JSON line, rendered piece by piece."""
+    docs = _case_documents(db, case.id)
+    yield '{"case":' + _compact(case_header(case))
+    for name, items in (
+        ("checklist", iter_checklist(db, case.id)),
+        ("timeline", iter_timeline(db, case.id)),
+        ("risks", iter_risks(db, case.id)),
+    ):
+        yield f',"{name}":['
+        yield from _iter_joined(_compact(item) for item in items)
+        yield "]"
+    yield ',"chunks":{'
+    yield from _iter_joined(f"{json.dumps(c['id'])}:{_compact(c)}" for c in iter_chunks(db, case.id))
+    yield '},"documents":['
+    yield from _iter_document_entries(store, docs, job.include_documents, stats)
+    yield "]}\n"
+
+
+def _write_jsonl(db: Session, store: ObjectStore, job: ExportJob, case_ids: List[str], out, stats: _Stats) -> None:
+    for case_id in case_ids:
+        case = db.get(Case, case_id)
+        if case is None:
+            continue
+        for piece in buffered(_iter_jsonl_record(db, store, job, case, stats)):
+            out.write(piece)
+        stats.cases += 1
+
+
+def run_export_job(
+    job_id: str,
+    bind: Engine | Connection,
+    store: Optional[ObjectStore] = None,
+    read_bind: Engine | Connection | None = None,
+) -> None:
+    """Build the archive for ``job_id`` and record the outcome on the job row.
+
+    Cases are read through ``read_bind`` when given, so the write session only holds
+    a connection for the job status updates; the job row itself is always read from
+    ``bind``.
+    """
+    store = store or get_store()
+    db = Session(bind=bind)
+    reader = Session(bind=read_bind) if read_bind is not None else db
+    try:
+        # Claim the job, so a job requeued at startup by several workers runs once.
+        claimed = db.execute(
+            update(ExportJob).where(ExportJob.id == job_id, ExportJob.status == "queued").values(status="running")
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return  # deleted, or already taken by another worker
+        # Keep a detached copy of the job's options: the row was just written on the
+        # primary and a lagging replica may not have it yet. Closing hands the write
+        # connection back for the duration of the export.
+        job = db.get(ExportJob, job_id)
+        db.expunge(job)
+        db.close()
+        logger.info("bulk_export_started", job_id=job_id, format=job.format)
+
+        stats = _Stats()
+        try:
+            case_ids = _select_case_ids(reader, job)
+            with tempfile.TemporaryFile() as out:
+                writer = _write_zip if job.format == "zip" else _write_jsonl
+                writer(reader, store, job, case_ids, out, stats)
+                size = out.tell()
+                out.seek(0)
+                stored = store.put(
+                    fileobj=out,
+                    filename=f"cases-{job_id[:8]}.{job.format}",
+                    content_type="application/zip" if job.format == "zip" else "application/x-ndjson",
+                    prefix=EXPORT_PREFIX,
+                )
+        except Exception as e:
+            db.rollback()
+            reader.rollback()
+            job = db.get(ExportJob, job_id)
+            job.status = "failed"
+            job.error = str(e)
+            job.finished_at = dt.datetime.utcnow()
+            db.commit()
+            logger.error("bulk_export_failed", job_id=job_id, error=str(e), exc_info=True)
+            return
+
+        job = db.get(ExportJob, job_id)
+        job.status = "succeeded"
+        job.storage_key = stored.key
+        job.size_bytes = size
+        job.case_count = stats.cases
+        job.document_count = stats.documents
+        if stats.missing:
+            job.error = f"{len(stats.missing)} document(s) missing from storage"
+        job.finished_at = dt.datetime.utcnow()
+        db.commit()
+        logger.info(
+            "bulk_export_completed",
+            job_id=job_id,
+            cases=stats.cases,
+            documents=stats.documents,
+            missing=len(stats.missing),
+            size_bytes=size,
+        )
+    finally:
+        if reader is not db:
+            reader.close()
+        db.close()
+
+
+def resume_interrupted_jobs(
+    bind: Engine | Connection,
+    store: Optional[ObjectStore] = None,
+    read_bind: Engine | Connection | None = None,
+) -> Tuple[int, int]:
+    """Deal with jobs a restart left behind; return ``(requeued, failed)``.
+
+    Call at startup. Queued jobs are submitted again (the claim in
+    :func:`run_export_job` keeps workers from running one twice). A job left
+    ``running`` lost its worker mid-archive and is marked failed, so clients stop
+    polling it and can start a new export.
+    """
+    with Session(bind=bind) as db:
+        failed = db.execute(
+            update(ExportJob)
+            .where(ExportJob.status == "running")
+            .values(status="failed", error="Interrupted by a server restart", finished_at=dt.datetime.utcnow())
+        ).rowcount
+        db.commit()
+        queued = list(db.scalars(select(ExportJob.id).where(ExportJob.status == "queued").order_by(ExportJob.created_at)))
+    for job_id in queued:
+        submit(job_id, bind, store, read_bind)
+    if queued or failed:
+        logger.info("bulk_export_jobs_resumed", requeued=len(queued), failed=failed)
+    return len(queued), failed
+
+
+def job_to_dict(job: ExportJob) -> Dict[str, Any]:
+    ids = [x for x in (job.case_ids or "").split(",") if x]
+    return {
+        "id": job.id,
+        "status": job.status,
+        "format": job.format,
+        "include_documents": job.include_documents,
+        "scenario": job.scenario or None,
+        "case_ids": ids or None,
+        "case_count": job.case_count or 0,
+        "document_count": job.document_count or 0,
+        "size_bytes": job.size_bytes or 0,
+        "error": job.error or "",
+        "created_at": job.created_at.isoformat() if job.created_at else "",
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
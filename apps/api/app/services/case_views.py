@@ -0,0 +1,95 @@
+"""Response shapes shared by the sync endpoints and the async read router."""
+from __future__ import annotations
+
+from typing import Iterable, List
+
+from ..db.models import Case, ChecklistItem, Chunk, Document, Risk, TimelineItem
+
+
+def case_dict(case: Case, with_story: bool = False) -> dict:
+    d = {"id": case.id, "title": case.title, "scenario": case.scenario, "summary": case.summary}
+    if with_story:
+        d["user_story"] = case.user_story
+    return d
+
+
+def document_dict(d: Document) -> dict:
+    return {
+        "id": d.id,
+        "case_id": d.case_id,
+        "filename": d.filename,
+        "content_type": d.content_type,
+        "created_at": d.created_at.isoformat(),
+        "status": d.status,
+    }
+
+
+def split_ids(s: str) -> List[str]:
+    return [x for x in (s or "").split(",") if x]
+
+
+def outputs_payload(
+    case: Case,
+    checklist: Iterable[ChecklistItem],
+    timeline: Iterable[TimelineItem],
+    risks: Iterable[Risk],
+    chunks: Iterable[Chunk],
+    documents: Iterable[Document],
+) -> dict:
+    """The ``/cases/{id}/outputs`` body.
+
+    Plain dicts shaped like :class:`~app.schemas.case.OutputsOut`, which the endpoints
+    validate and serialize in one pass.
+    """
+    # Map document IDs to filenames
+    doc_map = {d.id: d.filename for d in documents}
+
+    chunk_map = {
+        c.id: {
+            "id": c.id,
+            "document_id": c.document_id,
+            "filename": doc_map.get(c.document_id, "Unknown File"),
+            "idx": c.idx,
+            "page": c.page,
+            "text": c.text
+        }
+        for c in chunks
+    }
+
+    return {
+        "case": case_dict(case, with_story=True),
+        "checklist": [
+            {
+                "id": i.id,
+                "label": i.label,
+                "status": i.status,
+                "notes": i.notes,
+                "evidence_chunk_ids": split_ids(i.evidence_chunk_ids),
+            }
+            for i in checklist
+        ],
+        "timeline": [
+            {
+                "id": i.id,
+                "label": i.label,
+                "status": i.status,
+                "due_date": i.due_date,
+                "owner": i.owner,
+                "notes": i.notes,
+                "evidence_chunk_ids": split_ids(i.evidence_chunk_ids),
+            }
+            for i in timeline
+        ],
+        "risks": [
+            {
+                "id": i.id,
+                "category": i.category,
+                "severity": i.severity,
+                "statement": i.statement,
+                "reason": i.reason,
+                "evidence_chunk_ids": split_ids(i.evidence_chunk_ids),
+            }
+            for i in risks
+        ],
+        "chunks": chunk_map,
+    }
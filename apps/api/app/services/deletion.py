@@ -0,0 +1,173 @@
+"""Set-based deletion of cases and documents, and background removal of their blobs.
+
+Deleting through the ORM cascade loads every chunk, risk, timeline and checklist row
+of a case and deletes them one statement at a time. Here each table is cleared with one
+``DELETE ... WHERE case_id = :id``, so a case costs a fixed handful of statements
+whatever its size. Foreign keys also carry ``ON DELETE CASCADE``; the explicit child
+deletes keep databases whose constraints predate that (and SQLite connections without
+``foreign_keys``) correct.
+
+Stored files are removed after the commit, on a background thread, in batches of
+``STORAGE_DELETE_BATCH_SIZE`` (S3 ``DeleteObjects`` takes up to 1000 keys per call).
+Keys that fail are logged; the storage garbage collector picks them up later.
+
+The local store is content-addressed, so identical uploads share a key, and an upload
+of the same bytes can re-store and reference a key between the delete's commit and the
+purge. Content-addressed keys are therefore never purged here: the garbage collector
+removes them once unreferenced, and its grace period covers such a re-upload (it
+refreshes the file's mtime).
+
+A direct upload that is never completed leaves a ``pending`` document behind. Pending
+documents older than ``PENDING_UPLOAD_TTL_SECONDS`` (by default the presigned URL's
+lifetime plus an hour) can no longer be uploaded to; :func:`expire_pending_documents`
+deletes them, and the storage garbage collector runs it before each sweep.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ..db.models import Case, CaseCounters, ChecklistItem, Chunk, Document, DocumentPage, Risk, TimelineItem
+from ..db.routing import mark_case_written
+from ..utils.logger import get_logger
+from .fuzzy import forget_case, forget_document
+from .storage import CONTENT_KEY, S3_PRESIGN_EXPIRES_SECONDS, ObjectStore, get_store
+
+logger = get_logger(__name__)
+
+DELETE_BATCH_SIZE = int(os.getenv("STORAGE_DELETE_BATCH_SIZE", "1000"))
+PENDING_UPLOAD_TTL_SECONDS = float(
+    os.getenv("PENDING_UPLOAD_TTL_SECONDS", str(S3_PRESIGN_EXPIRES_SECONDS + 3600))
+)
+
+# Children before parents, for connections that enforce foreign keys without cascades.
+CASE_CHILD_MODELS = (Chunk, DocumentPage, Document, Risk, TimelineItem, ChecklistItem, CaseCounters)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class DeletedDocument:
+    case_id: str
+    storage_key: str  # empty if still in use or content-addressed (left to the GC)
+    chunks: int
+    preview_keys: List[str] = field(default_factory=list)
+    status: str = "ready"  # pending documents were never counted in the case statistics
+
+    @property
+    def object_keys(self) -> List[str]:
+        return [k for k in (self.storage_key, *self.preview_keys) if k]
+
+
+def _run(db: Session, stmt):
+    return db.execute(stmt, execution_options={"synchronize_session": False})
+
+
+def unreferenced(db: Session, keys: Sequence[str], column=Document.storage_key) -> List[str]:
+    """The subset of ``keys`` no row references in ``column`` any more (call after deleting rows)."""
+    keys = list(dict.fromkeys(k for k in keys if k))
+    in_use = set()
+    for start in range(0, len(keys), 500):
+        batch = keys[start:start + 500]
+        in_use.update(db.scalars(select(column).where(column.in_(batch)).distinct()))
+    return [k for k in keys if k not in in_use]
+
+
+def purgeable(keys: Sequence[str]) -> List[str]:
+    """The keys that may be removed right after the commit: not content-addressed ones."""
+    return [k for k in keys if k and not CONTENT_KEY.match(k)]
+
+
+def delete_case_rows(db: Session, case_id: str) -> Optional[List[str]]:
+    """Delete ``case_id`` and everything under it; return the storage keys to purge.
+
+    Returns None if the case does not exist. The caller commits.
+    """
+    keys = list(db.scalars(select(Document.storage_key).where(Document.case_id == case_id)))
+    preview_keys = list(db.scalars(select(DocumentPage.storage_key).where(DocumentPage.case_id == case_id)))
+    for model in CASE_CHILD_MODELS:
+        _run(db, delete(model).where(model.case_id == case_id))
+    if not _run(db, delete(Case).where(Case.id == case_id)).rowcount:
+        return None
+    forget_case(db, case_id)
+    mark_case_written(db, case_id)
+    return purgeable(unreferenced(db, keys) + unreferenced(db, preview_keys, DocumentPage.storage_key))
+
+
+def delete_document_rows(db: Session, document_id: str) -> Optional[DeletedDocument]:
+    """Delete a document and its chunks; None if it does not exist. The caller commits."""
+    row = db.execute(
+        select(Document.case_id, Document.storage_key, Document.status).where(Document.id == document_id)
+    ).first()
+    if row is None:
+        return None
+    preview_keys = list(db.scalars(select(DocumentPage.storage_key).where(DocumentPage.document_id == document_id)))
+    chunks = _run(db, delete(Chunk).where(Chunk.document_id == document_id)).rowcount
+    _run(db, delete(DocumentPage).where(DocumentPage.document_id == document_id))
+    _run(db, delete(Document).where(Document.id == document_id))
+    forget_document(db, document_id)
+    mark_case_written(db, row.case_id)
+    key = row.storage_key if purgeable(unreferenced(db, [row.storage_key])) else ""
+    return DeletedDocument(
+        case_id=row.case_id,
+        storage_key=key,
+        chunks=chunks,
+        preview_keys=purgeable(unreferenced(db, preview_keys, DocumentPage.storage_key)),
+        status=row.status,
+    )
+
+
+def expire_pending_documents(db: Session, older_than: float = PENDING_UPLOAD_TTL_SECONDS) -> List[DeletedDocument]:
+    """Delete direct uploads still ``pending`` after ``older_than`` seconds. The caller commits."""
+    cutoff = dt.datetime.utcnow() - dt.timedelta(seconds=older_than)
+    stale = db.scalars(select(Document.id).where(Document.status == "pending", Document.created_at < cutoff))
+    expired = [d for d in (delete_document_rows(db, document_id) for document_id in list(stale)) if d is not None]
+    if expired:
+        logger.info("pending_uploads_expired", documents=len(expired))
+    return expired
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="object-delete")
+        return _executor
+
+
+def purge_objects(keys: Sequence[str], store: Optional[ObjectStore] = None) -> List[str]:
+    """Delete stored objects in batches; return the keys that could not be deleted."""
+    store = store or get_store()
+    failed: List[str] = []
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = list(keys[start:start + DELETE_BATCH_SIZE])
+        failed.extend(store.delete_many(batch))
+    if failed:
+        logger.error("storage_purge_incomplete", requested=len(keys), failed=len(failed), sample=failed[:5])
+    else:
+        logger.info("storage_purged", objects=len(keys))
+    return failed
+
+
+def schedule_purge(keys: Sequence[str], store: Optional[ObjectStore] = None) -> Optional[Future]:
+    """Queue :func:`purge_objects` on the background thread (call after the commit)."""
+    keys = [k for k in keys if k]
+    if not keys:
+        return None
+    return _get_executor().submit(purge_objects, keys, store)
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
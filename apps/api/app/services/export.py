@@ -1,25 +1,133 @@
-"""Export service for generating reports."""
+"""Export service for generating reports.
+
+Exports are produced incrementally: rows are read in batches over a server-side cursor
+and rendered piece by piece, so memory does not grow with the size of the case.
+"""
 from __future__ import annotations
 
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from ..db.models import Case, ChecklistItem, Risk, TimelineItem
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
 
+from ..db.models import Case, ChecklistItem, Chunk, Risk, TimelineItem
 
-def export_case_json(case_data: Dict[str, Any]) -> str:
-    """Export case data as JSON."""
-    return json.dumps(case_data, indent=2)
+EXPORT_BATCH_SIZE = 500
+FLUSH_BYTES = 64 * 1024
 
 
-def export_case_markdown(case_data: Dict[str, Any]) -> str:
-    """Export case data as Markdown."""
-    case = case_data.get("case", {})
-    checklist = case_data.get("checklist", [])
-    timeline = case_data.get("timeline", [])
-    risks = case_data.get("risks", [])
-    
-    md = f"""# {case.get('title', 'Case Report')}
+def _split_ids(s: str) -> List[str]:
+    return [x for x in (s or "").split(",") if x]
+
+
+def _stream(db: Session, stmt) -> Iterator[Any]:
+    return db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def iter_checklist(db: Session, case_id: str) -> Iterator[Dict[str, Any]]:
+    t = ChecklistItem
+    stmt = select(t.id, t.label, t.status, t.notes, t.evidence_chunk_ids).where(t.case_id == case_id)
+    for r in _stream(db, stmt):
+        yield {
+            "id": r.id,
+            "label": r.label,
+            "status": r.status,
+            "notes": r.notes,
+            "evidence_chunk_ids": _split_ids(r.evidence_chunk_ids),
+        }
+
+
+def iter_timeline(db: Session, case_id: str) -> Iterator[Dict[str, Any]]:
+    t = TimelineItem
+    stmt = select(t.id, t.label, t.due_date, t.owner, t.notes, t.evidence_chunk_ids).where(t.case_id == case_id)
+    for r in _stream(db, stmt):
+        yield {
+            "id": r.id,
+            "label": r.label,
+            "due_date": r.due_date,
+            "owner": r.owner,
+            "notes": r.notes,
+            "evidence_chunk_ids": _split_ids(r.evidence_chunk_ids),
+        }
+
+
+def iter_risks(db: Session, case_id: str) -> Iterator[Dict[str, Any]]:
+    t = Risk
+    stmt = select(t.id, t.category, t.severity, t.statement, t.reason, t.evidence_chunk_ids).where(
+        t.case_id == case_id
+    )
+    for r in _stream(db, stmt):
+        yield {
+            "id": r.id,
+            "category": r.category,
+            "severity": r.severity,
+            "statement": r.statement,
+            "reason": r.reason,
+            "evidence_chunk_ids": _split_ids(r.evidence_chunk_ids),
+        }
+
+
+def iter_chunks(db: Session, case_id: str) -> Iterator[Dict[str, Any]]:
+    t = Chunk
+    stmt = select(t.id, t.document_id, t.idx, t.page, t.text).where(t.case_id == case_id)
+    for r in _stream(db, stmt):
+        yield {"id": r.id, "document_id": r.document_id, "idx": r.idx, "page": r.page, "text": r.text}
+
+
+def case_header(case: Case) -> Dict[str, Any]:
+    return {"id": case.id, "title": case.title, "scenario": case.scenario, "summary": case.summary}
+
+
+def _dump(obj: Any, level: int) -> str:
+    """``json.dumps(obj, indent=2)`` as it appears nested ``level`` levels deep."""
+    return json.dumps(obj, indent=2).replace("\n", "\n" + "  " * level)
+
+
+def _iter_json_array(items: Iterable[Any], level: int) -> Iterator[str]:
+    pad = "  " * (level + 1)
+    sep = "[\n"
+    for item in items:
+        yield f"{sep}{pad}{_dump(item, level + 1)}"
+        sep = ",\n"
+    yield "[]" if sep == "[\n" else "\n" + "  " * level + "]"
+
+
+def _iter_json_object(pairs: Iterable[tuple], level: int) -> Iterator[str]:
+    pad = "  " * (level + 1)
+    sep = "{\n"
+    for key, value in pairs:
+        yield f"{sep}{pad}{json.dumps(key)}: {_dump(value, level + 1)}"
+        sep = ",\n"
+    yield "{}" if sep == "{\n" else "\n" + "  " * level + "}"
+
+
+def iter_case_json(
+    case: Dict[str, Any],
+    checklist: Iterable[Dict[str, Any]],
+    timeline: Iterable[Dict[str, Any]],
+    risks: Iterable[Dict[str, Any]],
+    chunks: Iterable[Dict[str, Any]],
+) -> Iterator[str]:
+    """Render a case export as JSON, byte-for-byte what ``json.dumps(indent=2)`` gives."""
+    yield '{\n  "case": ' + _dump(case, 1)
+    for name, items in (("checklist", checklist), ("timeline", timeline), ("risks", risks)):
+        yield f',\n  "{name}": '
+        yield from _iter_json_array(items, 1)
+    yield ',\n  "chunks": '
+    yield from _iter_json_object(((c["id"], c) for c in chunks), 1)
+    yield "\n}"
+
+
+def iter_case_markdown(
+    case: Dict[str, Any],
+    checklist: Iterable[Dict[str, Any]],
+    timeline: Iterable[Dict[str, Any]],
+    risks: Iterable[Dict[str, Any]],
+) -> Iterator[str]:
+    """Render a case export as a Markdown report, one section item at a time."""
+    yield f"""# {case.get('title', 'Case Report')}
 
 ## Summary
 
@@ -33,39 +141,105 @@ def export_case_markdown(case_data: Dict[str, Any]) -> str:
 ## Checklist
 
 """
-    
+
     for idx, item in enumerate(checklist, 1):
         status_icon = "✅" if item.get("status") == "done" else "⏳" if item.get("status") == "in_progress" else "📋"
-        md += f"### {idx}. {status_icon} {item.get('label', 'Item')}\n\n"
-        md += f"**Status:** {item.get('status', 'todo')}  \n"
-        md += f"**Notes:** {item.get('notes', 'No notes.')}\n\n"
-        
+        parts = [
+            f"### {idx}. {status_icon} {item.get('label', 'Item')}\n\n",
+            f"**Status:** {item.get('status', 'todo')}  \n",
+            f"**Notes:** {item.get('notes', 'No notes.')}\n\n",
+        ]
         if item.get('evidence_chunk_ids'):
-            md += f"**Evidence chunks:** {len(item.get('evidence_chunk_ids', []))}\n\n"
-        md += "---\n\n"
-    
-    md += "## Timeline\n\n"
-    
+            parts.append(f"**Evidence chunks:** {len(item.get('evidence_chunk_ids', []))}\n\n")
+        parts.append("---\n\n")
+        yield "".join(parts)
+
+    yield "## Timeline\n\n"
+
     for idx, item in enumerate(timeline, 1):
-        md += f"### {idx}. {item.get('label', 'Task')}\n\n"
+        parts = [f"### {idx}. {item.get('label', 'Task')}\n\n"]
         if item.get('due_date'):
-            md += f"**Due:** {item.get('due_date')}  \n"
-        md += f"**Owner:** {item.get('owner', 'user')}  \n"
-        md += f"**Notes:** {item.get('notes', 'No notes.')}\n\n"
-        md += "---\n\n"
-    
-    md += "## Risks\n\n"
-    
+            parts.append(f"**Due:** {item.get('due_date')}  \n")
+        parts.append(f"**Owner:** {item.get('owner', 'user')}  \n")
+        parts.append(f"**Notes:** {item.get('notes', 'No notes.')}\n\n")
+        parts.append("---\n\n")
+        yield "".join(parts)
+
+    yield "## Risks\n\n"
+
     for idx, item in enumerate(risks, 1):
         severity = item.get('severity', 'medium')
         severity_icon = "🔴" if severity.lower() == "high" else "🟡" if severity.lower() == "medium" else "🟢"
-        md += f"### {idx}. {severity_icon} {item.get('statement', 'Risk')}\n\n"
-        md += f"**Severity:** {severity.upper()}  \n"
-        md += f"**Category:** {item.get('category', 'general')}  \n"
-        md += f"**Reason:** {item.get('reason', 'No reason provided.')}\n\n"
-        md += "---\n\n"
-    
-    md += "\n---\n\n*Generated by LifeBridge - AI-Powered Cross-Border Mobility Assistant*\n"
-    
-    return md
+        yield (
+            f"### {idx}. {severity_icon} {item.get('statement', 'Risk')}\n\n"
+            f"**Severity:** {severity.upper()}  \n"
+            f"**Category:** {item.get('category', 'general')}  \n"
+            f"**Reason:** {item.get('reason', 'No reason provided.')}\n\n"
+            "---\n\n"
+        )
+
+    yield "\n---\n\n*Generated by LifeBridge - AI-Powered Cross-Border Mobility Assistant*\n"
+
+
+def iter_case_export(db: Session, case: Case, format: str) -> Iterator[str]:
+    """Stream one case as ``json`` or ``markdown`` from ``db``."""
+    header = case_header(case)
+    if format == "json":
+        return iter_case_json(
+            header,
+            iter_checklist(db, case.id),
+            iter_timeline(db, case.id),
+            iter_risks(db, case.id),
+            iter_chunks(db, case.id),
+        )
+    return iter_case_markdown(header, iter_checklist(db, case.id), iter_timeline(db, case.id), iter_risks(db, case.id))
+
 
+def buffered(pieces: Iterable[str], size: int = FLUSH_BYTES) -> Iterator[bytes]:
+    """Coalesce small rendered pieces into ~``size``-byte writes."""
+    buf: List[bytes] = []
+    n = 0
+    for piece in pieces:
+        data = piece.encode("utf-8")
+        buf.append(data)
+        n += len(data)
+        if n >= size:
+            yield b"".join(buf)
+            buf, n = [], 0
+    if buf:
+        yield b"".join(buf)
+
+
+def stream_case_export(
+    bind: Engine | Connection, case_id: str, format: str, *, size: int = FLUSH_BYTES
+) -> Iterator[bytes]:
+    """Encoded export of one case, read through a session owned by the generator.
+
+    The request's session is closed before a streaming body is sent, so the stream
+    opens (and always closes) its own.
+    """
+    db = Session(bind=bind)
+    try:
+        case: Optional[Case] = db.get(Case, case_id)
+        if case is None:
+            return
+        yield from buffered(iter_case_export(db, case, format), size)
+    finally:
+        db.close()
+
+
+def export_case_json(case_data: Dict[str, Any]) -> str:
+    """Export case data as JSON."""
+    return json.dumps(case_data, indent=2)
+
+
+def export_case_markdown(case_data: Dict[str, Any]) -> str:
+    """Export case data as Markdown."""
+    return "".join(
+        iter_case_markdown(
+            case_data.get("case", {}),
+            case_data.get("checklist", []),
+            case_data.get("timeline", []),
+            case_data.get("risks", []),
+        )
+    )
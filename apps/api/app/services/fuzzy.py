@@ -0,0 +1,235 @@
+"""Typo-tolerant search over case titles, scenarios and document filenames.
+
+PostgreSQL answers with ``pg_trgm`` (``<%`` / ``word_similarity`` over GIN trigram
+indexes). Other databases use :class:`TrigramIndex`, an in-memory inverted index of
+the same padded trigrams, kept current by session hooks for writes made in this
+process and rebuilt after ``FUZZY_INDEX_TTL_SECONDS`` to pick up other workers' writes.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy import event, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..db.models import Base, Case, Document
+from ..db.pool import primary_engine
+
+FUZZY_THRESHOLD = float(os.getenv("FUZZY_SEARCH_THRESHOLD", "0.5"))
+INDEX_TTL_SECONDS = float(os.getenv("FUZZY_INDEX_TTL_SECONDS", "60"))
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(s: str) -> FrozenSet[str]:
+    """pg_trgm-style trigrams: lower-cased alphanumeric words padded with two leading
+    spaces and one trailing space."""
+    grams: Set[str] = set()
+    for word in _WORD.findall((s or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """Inverted trigram index mapping entries (case fields, filenames) to their case."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._grams: Dict[str, FrozenSet[str]] = {}
+        self._case_of: Dict[str, str] = {}
+        self.built_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def add(self, key: str, case_id: str, value: str) -> None:
+        with self._lock:
+            self.remove(key)
+            grams = trigrams(value)
+            self._grams[key] = grams
+            self._case_of[key] = case_id
+            for g in grams:
+                self._postings[g].add(key)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            for g in self._grams.pop(key, ()):
+                keys = self._postings.get(g)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._postings[g]
+            self._case_of.pop(key, None)
+
+    def remove_case(self, case_id: str) -> None:
+        with self._lock:
+            for key in [k for k, c in self._case_of.items() if c == case_id]:
+                self.remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._grams.clear()
+            self._case_of.clear()
+            self.built_at = 0.0
+
+    def search(self, q: str, threshold: float = FUZZY_THRESHOLD, limit: int = 50) -> List[Tuple[str, float]]:
+        """Return ``(case_id, score)`` best first.
+
+        The score is the share of the query's trigrams found in an entry, which like
+        ``word_similarity`` rewards a query matching part of a longer title.
+        """
+        q_grams = trigrams(q)
+        if not q_grams:
+            return []
+        with self._lock:
+            counts: Dict[str, int] = defaultdict(int)
+            for g in q_grams:
+                for key in self._postings.get(g, ()):
+                    counts[key] += 1
+            best: Dict[str, float] = {}
+            for key, n in counts.items():
+                score = n / len(q_grams)
+                case_id = self._case_of[key]
+                if score >= threshold and score > best.get(case_id, 0.0):
+                    best[case_id] = score
+        return sorted(best.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+
+    def build(self, db: Session) -> None:
+        with self._lock:
+            self.clear()
+            for case_id, title, scenario in db.execute(select(Case.id, Case.title, Case.scenario)):
+                self.add(f"c:{case_id}:title", case_id, title or "")
+                self.add(f"c:{case_id}:scenario", case_id, scenario or "")
+            for doc_id, case_id, filename in db.execute(select(Document.id, Document.case_id, Document.filename)):
+                self.add(f"d:{doc_id}", case_id, filename or "")
+            self.built_at = time.monotonic()
+
+
+_indexes: "weakref.WeakKeyDictionary[Engine, TrigramIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_index(engine: Engine) -> TrigramIndex:
+    with _indexes_lock:
+        index = _indexes.get(engine)
+        if index is None:
+            index = _indexes[engine] = TrigramIndex()
+        return index
+
+
+def _engine_of(session: Session) -> Optional[Engine]:
+    bind = session.get_bind()
+    # Read engines share the index of the engine whose commits keep it current.
+    return primary_engine(getattr(bind, "engine", bind))
+
+
+def _entries(obj) -> List[Tuple[str, str, str]]:
+    if isinstance(obj, Case):
+        return [
+            (f"c:{obj.id}:title", obj.id, obj.title or ""),
+            (f"c:{obj.id}:scenario", obj.id, obj.scenario or ""),
+        ]
+    return [(f"d:{obj.id}", obj.case_id, obj.filename or "")]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    # Capture plain values now; attributes are expired by the time after_commit runs.
+    pending = session.info.setdefault("fuzzy_pending", [])
+    for obj in session.new | session.dirty:
+        if isinstance(obj, (Case, Document)):
+            pending.extend(("add", entry) for entry in _entries(obj))
+    for obj in session.deleted:
+        if isinstance(obj, Case):
+            pending.append(("remove_case", obj.id))
+        elif isinstance(obj, Document):
+            pending.append(("remove", f"d:{obj.id}"))
+
+
+def forget_case(session: Session, case_id: str) -> None:
+    """Drop ``case_id`` from the index when ``session`` commits (for bulk ``DELETE``s)."""
+    session.info.setdefault("fuzzy_pending", []).append(("remove_case", case_id))
+
+
+def forget_document(session: Session, document_id: str) -> None:
+    session.info.setdefault("fuzzy_pending", []).append(("remove", f"d:{document_id}"))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    pending = session.info.pop("fuzzy_pending", None)
+    if not pending:
+        return
+    index = _indexes.get(_engine_of(session))
+    if index is None or not index.built_at:
+        return  # built lazily on the next search
+    for op, arg in pending:
+        if op == "add":
+            index.add(*arg)
+        elif op == "remove_case":
+            index.remove_case(arg)
+        else:
+            index.remove(arg)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop("fuzzy_pending", None)
+
+
+@event.listens_for(Base.metadata, "after_drop")
+def _reset_indexes(target, connection, **kw) -> None:
+    index = _indexes.get(connection.engine)
+    if index is not None:
+        index.clear()
+
+
+_POSTGRES_FUZZY = """
+WITH matches AS (
+    SELECT id AS case_id, word_similarity(:q, title) AS score FROM api_cases WHERE :q <% title
+    UNION ALL
+    SELECT id, word_similarity(:q, scenario) FROM api_cases WHERE :q <% scenario
+    UNION ALL
+    SELECT case_id, word_similarity(:q, filename) FROM api_documents WHERE :q <% filename
+)
+SELECT case_id, MAX(score) AS score FROM matches
+GROUP BY case_id
+ORDER BY score DESC
+LIMIT :limit
+"""
+
+
+def fuzzy_search_cases(
+    db: Session, q: str, *, limit: int = 50, threshold: float = FUZZY_THRESHOLD
+) -> List[Tuple[Case, float]]:
+    """Cases whose title, scenario or a document filename resembles ``q``, best first."""
+    engine = _engine_of(db)
+    if engine.dialect.name == "postgresql":
+        db.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :t, true)"),
+            {"t": str(threshold)},
+        )
+        ranked = [(r[0], float(r[1])) for r in db.execute(text(_POSTGRES_FUZZY), {"q": q, "limit": limit})]
+    else:
+        index = get_index(engine)
+        if not index.built_at or time.monotonic() - index.built_at > INDEX_TTL_SECONDS:
+            index.build(db)
+        ranked = index.search(q, threshold=threshold, limit=limit)
+
+    if not ranked:
+        return []
+    cases = {c.id: c for c in db.query(Case).filter(Case.id.in_([cid for cid, _ in ranked]))}
+    hits = [(cases[cid], score) for cid, score in ranked if cid in cases]
+    # Equal scores: newest case first, as the old listing did.
+    hits.sort(key=lambda h: (-h[1], -(h[0].created_at.timestamp() if h[0].created_at else 0)))
+    return hits
@@ -0,0 +1,114 @@
+"""Shared outbound HTTP clients.
+
+Services that call third-party APIs (GitHub for the knowledge base, zippopotam.us for
+attorney search) used to open an ``httpx.AsyncClient`` per request and paid DNS, TCP
+and TLS setup on every call. :class:`HttpClients` keeps one pooled client per upstream
+host for the life of the process instead: connections are kept alive and reused, HTTP/2
+is negotiated where the ``h2`` package is installed, and each host gets its own
+connection limit so one slow upstream cannot starve the others.
+
+Every request is timed into ``http_client_request_seconds{host=...}``. The API closes
+the clients on shutdown; a closed registry reopens clients on next use.
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from ..utils.logger import get_logger
+from ..utils.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() in ("1", "true", "yes")
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST", "20"))
+MAX_KEEPALIVE_PER_HOST = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST", "10"))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS", "60"))
+TIMEOUT_SECONDS = float(os.getenv("HTTP_CLIENT_TIMEOUT_SECONDS", "10"))
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS", "5"))
+
+REQUEST_SECONDS = REGISTRY.histogram("http_client_request_seconds", "Outbound HTTP request latency by upstream host")
+REQUESTS = REGISTRY.counter("http_client_requests_total", "Outbound HTTP responses by upstream host and status class")
+ERRORS = REGISTRY.counter("http_client_errors_total", "Outbound HTTP requests that failed without a response")
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HttpClients:
+    """One pooled ``httpx.AsyncClient`` per upstream host.
+
+    ``transport`` replaces the network for every client (tests pass an
+    ``httpx.MockTransport``).
+    """
+
+    def __init__(
+        self,
+        *,
+        http2: bool = HTTP2,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            logger.info("http2_unavailable", reason="h2 is not installed")
+        self.limits = limits or httpx.Limits(
+            max_connections=MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=MAX_KEEPALIVE_PER_HOST,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        )
+        self.timeout = timeout or httpx.Timeout(TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS)
+        self._transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """The pooled client for ``url``'s host, opened on first use."""
+        origin = httpx.URL(url)
+        key = f"{origin.scheme}://{origin.netloc.decode('ascii')}"
+        client = self._clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=self._transport,
+            )
+            self._clients[key] = client
+        return client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        host = httpx.URL(url).host
+        start = time.perf_counter()
+        try:
+            response = await self.client(url).request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            ERRORS.inc(host=host, error=type(e).__name__)
+            raise
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - start, host=host)
+        REQUESTS.inc(host=host, status=f"{response.status_code // 100}xx")
+        return response
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HttpClients()
+
+
+async def shutdown() -> None:
+    await http_clients.aclose()
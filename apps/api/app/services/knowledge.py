@@ -1,11 +1,28 @@
+import asyncio
+import os
 import httpx
-import time
 from typing import List, Dict, Optional
 from ..schemas.knowledge import KnowledgeTopic, KnowledgeContent
 from ..utils.logger import get_logger
+from .http_clients import HttpClients, http_clients
+from .swr_cache import SWRCache
 
 logger = get_logger(__name__)
 
+CACHE_MAX_ENTRIES = int(os.getenv("KNOWLEDGE_CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL_SECONDS = float(os.getenv("KNOWLEDGE_CACHE_TTL_SECONDS", "3600"))
+CACHE_STALE_SECONDS = float(os.getenv("KNOWLEDGE_CACHE_STALE_SECONDS", "86400"))
+CACHE_PATH = os.getenv("KNOWLEDGE_CACHE_PATH") or None
+
+
+class TopicNotFound(Exception):
+    pass
+
+
+def _if_none_match(etag: Optional[str]) -> Dict[str, str]:
+    return {"If-None-Match": etag} if etag else {}
+
+
 class KnowledgeService:
     # Source Configurations
     SOURCES = {
@@ -38,8 +55,16 @@ class KnowledgeService:
         {"id": "job-seeker", "source": "awesome", "file": "jobseeker.md", "title": "🔍 Job Seeker Visas", "description": "Visas allowing you to enter and search for work"},
     ]
 
-    _content_cache: Dict[str, Dict] = {} # {slug: {content: str, timestamp: float, sha: str}}
-    _CACHE_TTL = 3600  # 1 hour
+    def __init__(self, http: HttpClients = http_clients, cache: Optional[SWRCache] = None):
+        self.http = http
+        # {topic_id: {content, etag, sha, last_updated, commit_etag}}
+        self.cache = cache or SWRCache(
+            "knowledge",
+            max_entries=CACHE_MAX_ENTRIES,
+            ttl=CACHE_TTL_SECONDS,
+            stale_ttl=CACHE_STALE_SECONDS,
+            path=CACHE_PATH,
+        )
 
     async def get_topics(self) -> List[KnowledgeTopic]:
         topics = []
@@ -68,94 +93,100 @@ class KnowledgeService:
                 "description": "Dynamic topic"
             }
 
-        # Check cache
-        cached = self._content_cache.get(topic_id)
-        if cached and time.time() - cached["timestamp"] < self._CACHE_TTL:
-            return KnowledgeContent(
-                topic_id=topic_id,
-                title=topic["title"],
-                content=cached["content"],
-                last_updated=cached.get("last_updated"),
-                commit_sha=cached.get("sha")
-            )
-
         source_config = self.SOURCES.get(topic["source"], self.SOURCES["t3nsor"])
 
         try:
-            async with httpx.AsyncClient() as client:
-                # Fetch raw content
-                content_url = f"{source_config['base_url']}/{topic['file']}"
-                logger.info("fetching_knowledge_content", url=content_url)
-                resp = await client.get(content_url)
-                
-                # FALLBACK: If 404, try web search
-                if resp.status_code == 404:
-                    logger.info("topic_not_found_searching_web", topic=topic["title"])
-                    try:
-                        from duckduckgo_search import DDGS
-                        
-                        search_query = f"US immigration {topic['title']} guide"
-                        results = list(DDGS().text(search_query, max_results=5))
-                        
-                        md_content = f"# {topic['title']}\n\n"
-                        md_content += "> **Note:** This topic was not found in our curated library, so we searched the web for you.\n\n"
-                        
-                        if results:
-                            for res in results:
-                                md_content += f"### [{res['title']}]({res['href']})\n"
-                                md_content += f"{res['body']}\n\n"
-                        else:
-                            md_content += "No search results found. Please try a different topic."
-                            
-                        return KnowledgeContent(
-                            topic_id=topic_id,
-                            title=topic["title"],
-                            content=md_content,
-                            last_updated=None,
-                            commit_sha=None
-                        )
-                    except Exception as search_err:
-                        logger.error("web_search_failed", error=str(search_err))
-                        # Fall through to standard error handling
-                        pass
-
-                resp.raise_for_status()
-                content = resp.text
-
-                # Fetch metadata (commit info)
-                commit_sha = None
-                last_updated = None
-                try:
-                    commit_url = f"{source_config['api_url']}?path={topic['file']}&per_page=1"
-                    commit_resp = await client.get(commit_url)
-                    if commit_resp.status_code == 200:
-                        commits = commit_resp.json()
-                        if commits:
-                            commit_sha = commits[0]["sha"]
-                            last_updated = commits[0]["commit"]["author"]["date"]
-                except Exception as e:
-                    logger.warning("failed_to_fetch_commit_info", error=str(e))
-
-                # Update cache
-                self._content_cache[topic_id] = {
-                    "content": content,
-                    "timestamp": time.time(),
-                    "sha": commit_sha,
-                    "last_updated": last_updated
-                }
-
-                return KnowledgeContent(
-                    topic_id=topic_id,
-                    title=topic["title"],
-                    content=content,
-                    last_updated=last_updated,
-                    commit_sha=commit_sha
-                )
-
+            cached = await self.cache.get(topic_id, lambda previous: self._fetch(topic, source_config, previous))
+        except TopicNotFound:
+            # FALLBACK: If 404, try web search
+            return self._search_web(topic_id, topic)
         except Exception as e:
             logger.error("failed_to_fetch_knowledge", topic_id=topic_id, error=str(e))
             return None
 
+        return KnowledgeContent(
+            topic_id=topic_id,
+            title=topic["title"],
+            content=cached["content"],
+            last_updated=cached.get("last_updated"),
+            commit_sha=cached.get("sha")
+        )
+
+    async def _fetch(self, topic: Dict, source_config: Dict, previous: Optional[Dict]) -> Dict:
+        """Fetch a topic and its latest commit, revalidating ``previous`` with its ETags."""
+        previous = previous or {}
+        content_url = f"{source_config['base_url']}/{topic['file']}"
+        commit_url = f"{source_config['api_url']}?path={topic['file']}&per_page=1"
+        logger.info("fetching_knowledge_content", url=content_url, revalidate=bool(previous))
+
+        # Both requests at once; a 304 costs neither bandwidth nor GitHub API rate limit.
+        resp, commit_resp = await asyncio.gather(
+            self.http.get(content_url, headers=_if_none_match(previous.get("etag"))),
+            self._fetch_commit(commit_url, previous.get("commit_etag")),
+        )
+        if resp.status_code == 404:
+            raise TopicNotFound(topic["id"])
+        if resp.status_code == 304 and "content" in previous:
+            content = previous["content"]
+        else:
+            resp.raise_for_status()
+            content = resp.text
+
+        # Fetch metadata (commit info)
+        commit_sha = previous.get("sha")
+        last_updated = previous.get("last_updated")
+        commit_etag = previous.get("commit_etag")
+        if commit_resp is not None and commit_resp.status_code == 200:
+            commits = commit_resp.json()
+            if commits:
+                commit_sha = commits[0]["sha"]
+                last_updated = commits[0]["commit"]["author"]["date"]
+                commit_etag = commit_resp.headers.get("etag")
+
+        return {
+            "content": content,
+            "etag": resp.headers.get("etag") or previous.get("etag"),
+            "sha": commit_sha,
+            "last_updated": last_updated,
+            "commit_etag": commit_etag,
+        }
+
+    async def _fetch_commit(self, commit_url: str, etag: Optional[str]) -> Optional[httpx.Response]:
+        try:
+            return await self.http.get(commit_url, headers=_if_none_match(etag))
+        except Exception as e:
+            logger.warning("failed_to_fetch_commit_info", error=str(e))
+            return None
+
+    def _search_web(self, topic_id: str, topic: Dict) -> Optional[KnowledgeContent]:
+        logger.info("topic_not_found_searching_web", topic=topic["title"])
+        try:
+            from duckduckgo_search import DDGS
+            
+            search_query = f"US immigration {topic['title']} guide"
+            results = list(DDGS().text(search_query, max_results=5))
+            
+            md_content = f"# {topic['title']}\n\n"
+            md_content += "> **Note:** This topic was not found in our curated library, so we searched the web for you.\n\n"
+            
+            if results:
+                for res in results:
+                    md_content += f"### [{res['title']}]({res['href']})\n"
+                    md_content += f"{res['body']}\n\n"
+            else:
+                md_content += "No search results found. Please try a different topic."
+                
+            return KnowledgeContent(
+                topic_id=topic_id,
+                title=topic["title"],
+                content=md_content,
+                last_updated=None,
+                commit_sha=None
+            )
+        except Exception as search_err:
+            logger.error("web_search_failed", error=str(search_err))
+            return None
+
 knowledge_service = KnowledgeService()
 
 async def get_knowledge_service() -> KnowledgeService:
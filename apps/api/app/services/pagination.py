@@ -0,0 +1,63 @@
+"""Keyset (cursor) pagination for newest-first listings.
+
+Pages are addressed by the ``(created_at, id)`` of the last row served rather than by
+an offset, so every page is an index range scan on ``(created_at, id)`` no matter how
+deep the client pages. Cursors are opaque URL-safe strings.
+"""
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: dt.datetime, row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[dt.datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return dt.datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed pagination cursor") from e
+
+
+def keyset_window(stmt: Any, created_col: Any, id_col: Any, cursor: Optional[str], limit: int) -> Any:
+    """Restrict a ``Query`` or ``select()`` to the page after ``cursor`` (one extra row)."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.filter(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return stmt.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def finish_page(rows: List[Any], created_col: Any, id_col: Any, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched by :func:`keyset_window` and build the next cursor."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
+
+
+def keyset_page(
+    query: Query, created_col: Any, id_col: Any, cursor: Optional[str], limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one newest-first page of ``query`` and the cursor for the next page."""
+    rows = keyset_window(query, created_col, id_col, cursor, limit).all()
+    return finish_page(rows, created_col, id_col, limit)
@@ -0,0 +1,161 @@
+"""Page thumbnails for uploaded documents.
+
+Extraction already holds a decoded image of every page it OCRs (scanned PDFs, image
+uploads). :class:`PageImages` is passed to ``extract_text(on_page_image=...)`` and
+shrinks each of those to a thumbnail on the spot, so no page is rasterized twice and
+full-size rasters are not kept. PDFs with a text layer are never rasterized for OCR;
+their pages are rendered here, directly at thumbnail size.
+
+Thumbnails are stored under ``previews/`` and recorded in ``api_document_pages`` on a
+background thread after the upload has committed, so uploads do not wait for them.
+"""
+from __future__ import annotations
+
+import io
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..db.models import Document, DocumentPage
+from ..utils.logger import get_logger
+from .storage import ObjectStore, get_store
+
+logger = get_logger(__name__)
+
+THUMBNAIL_PX = int(os.getenv("PREVIEW_THUMBNAIL_PX", "320"))  # longest side
+JPEG_QUALITY = int(os.getenv("PREVIEW_JPEG_QUALITY", "80"))
+MAX_PAGES = int(os.getenv("PREVIEW_MAX_PAGES", "50"))
+WORKERS = int(os.getenv("PREVIEW_WORKERS", "1"))
+PREVIEW_PREFIX = "previews"
+THUMBNAIL_CONTENT_TYPE = "image/jpeg"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class Thumbnail:
+    page: int
+    data: bytes
+    width: int
+    height: int
+
+
+def make_thumbnail(img: Any, page: int, size: int = THUMBNAIL_PX) -> Thumbnail:
+    """A JPEG no larger than ``size`` on either side; ``img`` (a PIL image) is not modified."""
+    from PIL import ImageOps
+
+    thumb = ImageOps.contain(img, (size, size))
+    if thumb.mode not in ("RGB", "L"):
+        thumb = thumb.convert("RGB")
+    out = io.BytesIO()
+    thumb.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    return Thumbnail(page=page, data=out.getvalue(), width=thumb.width, height=thumb.height)
+
+
+class PageImages:
+    """An ``on_page_image`` sink keeping a thumbnail of each of the first ``max_pages`` pages."""
+
+    def __init__(self, max_pages: int = MAX_PAGES) -> None:
+        self.max_pages = max_pages
+        self.thumbnails: Dict[int, Thumbnail] = {}
+
+    def __call__(self, page: int, img: Any) -> None:
+        if page > self.max_pages:
+            return
+        try:
+            self.thumbnails[page] = make_thumbnail(img, page)
+        except Exception as e:
+            logger.warning("thumbnail_failed", page=page, error=str(e))
+
+
+def render_pdf_thumbnails(data: bytes, max_pages: int = MAX_PAGES) -> List[Thumbnail]:
+    """Rasterize a PDF's pages straight at thumbnail size (for PDFs extraction did not render)."""
+    from pdf2image import convert_from_bytes
+
+    images = convert_from_bytes(data, size=THUMBNAIL_PX, last_page=max_pages)
+    return [make_thumbnail(img, i + 1) for i, img in enumerate(images)]
+
+
+def generate_previews(
+    document_id: str,
+    content_type: str,
+    data: bytes,
+    thumbnails: Dict[int, Thumbnail],
+    bind: Engine | Connection,
+    store: Optional[ObjectStore] = None,
+) -> int:
+    """Store the document's page thumbnails and record them; returns the number of pages."""
+    store = store or get_store()
+    try:
+        pages = [thumbnails[n] for n in sorted(thumbnails)]
+        if not pages and "pdf" in (content_type or "").lower():
+            pages = render_pdf_thumbnails(data)
+        if not pages:
+            return 0
+
+        # Store first, so the (possibly single) writer connection is held only for the inserts.
+        keys = [
+            store.put(
+                fileobj=io.BytesIO(thumb.data),
+                filename=f"page-{thumb.page}.jpg",
+                content_type=THUMBNAIL_CONTENT_TYPE,
+                prefix=PREVIEW_PREFIX,
+            ).key
+            for thumb in pages
+        ]
+        with Session(bind=bind) as db:
+            doc = db.get(Document, document_id)
+            if doc is None:
+                return 0  # deleted while queued; the storage GC reclaims the thumbnails
+            for thumb, key in zip(pages, keys):
+                db.merge(
+                    DocumentPage(
+                        document_id=document_id,
+                        page=thumb.page,
+                        case_id=doc.case_id,
+                        storage_key=key,
+                        content_type=THUMBNAIL_CONTENT_TYPE,
+                        width=thumb.width,
+                        height=thumb.height,
+                    )
+                )
+            db.commit()
+        logger.info("document_previews_generated", document_id=document_id, pages=len(pages))
+        return len(pages)
+    except Exception as e:
+        logger.error("document_previews_failed", document_id=document_id, error=str(e), exc_info=True)
+        return 0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="previews")
+        return _executor
+
+
+def submit(
+    document_id: str,
+    content_type: str,
+    data: bytes,
+    thumbnails: Dict[int, Thumbnail],
+    bind: Engine | Connection,
+    store: Optional[ObjectStore] = None,
+) -> Future:
+    """Queue :func:`generate_previews` on the background pool (call after the commit)."""
+    return _get_executor().submit(generate_previews, document_id, content_type, data, thumbnails, bind, store)
+
+
+def shutdown(wait: bool = False) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=not wait)
+            _executor = None
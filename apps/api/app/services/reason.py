@@ -1,19 +1,22 @@
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
 from typing import List, Sequence
 
 
 def _norm(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip()).lower()
+    return " ".join((s or "").split()).lower()
 
 
-def _find_chunks(chunks: Sequence[str], keywords: Sequence[str], max_hits: int = 3) -> List[int]:
+def _find_chunks(views: Sequence[str], keywords: Sequence[str], max_hits: int = 3) -> List[int]:
+    """Indices of chunks whose normalized view contains any keyword.
+
+    ``views`` are the per-chunk normalized texts built once per analysis, so chunks are
+    not re-normalized for every keyword lookup.
+    """
     keys = [_norm(k) for k in keywords if k.strip()]
     hits: List[int] = []
-    for i, c in enumerate(chunks):
-        c2 = _norm(c)
+    for i, c2 in enumerate(views):
         if any(k in c2 for k in keys):
             hits.append(i)
         if len(hits) >= max_hits:
@@ -57,7 +60,10 @@ class ReasoningResult:
 
 def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "") -> ReasoningResult:
     scenario_n = _norm(scenario)
-    text_all = _norm(" ".join(chunks) + " " + user_story)
+    # Chunks arrive whitespace-normalized from ingestion; one lower-cased view per chunk is
+    # enough for every lookup below, without concatenating the whole case into one string.
+    views = [_norm(c) for c in chunks]
+    user_story_n = _norm(user_story)
 
     # 1. Try LLM Generation first
     from .llm import generate_case_plan_llm
@@ -74,7 +80,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 label=item.get("label", "Action Item"),
                 status=item.get("status", "todo"),
                 notes=item.get("notes", ""),
-                evidence_idx=_find_chunks(chunks, item.get("evidence_keywords", []))
+                evidence_idx=_find_chunks(views, item.get("evidence_keywords", []))
             ))
         
         for item in llm_plan.get("timeline", []):
@@ -83,7 +89,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 due_date=item.get("due_date", ""),
                 owner=item.get("owner", "user"),
                 notes=item.get("notes", ""),
-                evidence_idx=_find_chunks(chunks, item.get("evidence_keywords", []))
+                evidence_idx=_find_chunks(views, item.get("evidence_keywords", []))
             ))
 
         for item in llm_plan.get("risks", []):
@@ -92,7 +98,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 severity=item.get("severity", "medium"),
                 statement=item.get("statement", "Risk Detected"),
                 reason=item.get("reason", ""),
-                evidence_idx=_find_chunks(chunks, item.get("evidence_keywords", []))
+                evidence_idx=_find_chunks(views, item.get("evidence_keywords", []))
             ))
             
         return ReasoningResult(
@@ -104,7 +110,11 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
 
     # 2. Fallback to Rule-Based Logic
     def has_any(*terms: str) -> bool:
-        return any(_norm(t) in text_all for t in terms)
+        for t in terms:
+            t_n = _norm(t)
+            if t_n in user_story_n or any(t_n in v for v in views):
+                return True
+        return False
 
     # ... (rest of the existing rule-based code below, preserved as fallback) ...
     # Universal baseline
@@ -113,7 +123,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
             label="Collect identity documents for each traveler",
             status="todo",
             notes="Use passports or national IDs. Ensure names and dates match across documents.",
-            evidence_idx=_find_chunks(chunks, ["passport", "id", "date of birth", "name"]),
+            evidence_idx=_find_chunks(views, ["passport", "id", "date of birth", "name"]),
         )
     )
     # ... existing logic continues ...
@@ -122,7 +132,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
             label="Collect proof of relationship or purpose",
             status="todo",
             notes="Examples: birth certificate, marriage certificate, invitation letter, or enrollment letter.",
-            evidence_idx=_find_chunks(chunks, ["birth", "marriage", "invitation", "enrollment"]),
+            evidence_idx=_find_chunks(views, ["birth", "marriage", "invitation", "enrollment"]),
         )
     )
 
@@ -132,7 +142,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
             due_date="",
             owner="user",
             notes="Confirm names, IDs, and dates. Correct errors before submitting anything.",
-            evidence_idx=_find_chunks(chunks, ["name", "passport", "id", "dob"]),
+            evidence_idx=_find_chunks(views, ["name", "passport", "id", "dob"]),
         )
     )
 
@@ -143,7 +153,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 label="Prepare a short family context statement",
                 status="todo",
                 notes="One page. Explain who is traveling, who they will stay with, and the dates.",
-                evidence_idx=_find_chunks(chunks, ["relationship", "address", "stay", "family"]),
+                evidence_idx=_find_chunks(views, ["relationship", "address", "stay", "family"]),
             )
         )
         timeline.append(
@@ -152,7 +162,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 due_date="",
                 owner="user",
                 notes="Capture preferred travel window and constraints like school schedule.",
-                evidence_idx=_find_chunks(chunks, ["date", "school", "travel"]),
+                evidence_idx=_find_chunks(views, ["date", "school", "travel"]),
             )
         )
         if not has_any("birth certificate", "certificate of birth", "birth"):
@@ -172,7 +182,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 label="Collect offer letter and role details",
                 status="todo",
                 notes="Include job title, start date, compensation, and location.",
-                evidence_idx=_find_chunks(chunks, ["offer", "employment", "salary", "start date"]),
+                evidence_idx=_find_chunks(views, ["offer", "employment", "salary", "start date"]),
             )
         )
         if not has_any("offer", "employment"):
@@ -182,7 +192,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                     severity="medium",
                     statement="Offer letter not detected",
                     reason="The system did not find strong signals for an offer or employment letter.",
-                    evidence_idx=_find_chunks(chunks, ["offer", "employment"]),
+                    evidence_idx=_find_chunks(views, ["offer", "employment"]),
                 )
             )
 
@@ -192,7 +202,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 label="Consult an attorney immediately regarding status",
                 status="todo",
                 notes="Deportation proceedings are complex and time-sensitive. Do not ignore notices.",
-                evidence_idx=_find_chunks(chunks, ["deport", "court", "notice", "judge"]),
+                evidence_idx=_find_chunks(views, ["deport", "court", "notice", "judge"]),
             )
         )
         risks.append(
@@ -211,7 +221,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 label="Gather academic records and transcripts",
                 status="todo",
                 notes="Include diplomas, current enrollment letters, and official transcripts.",
-                evidence_idx=_find_chunks(chunks, ["transcript", "diploma", "degree", "university"]),
+                evidence_idx=_find_chunks(views, ["transcript", "diploma", "degree", "university"]),
             )
         )
         timeline.append(
@@ -220,7 +230,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 due_date="",
                 owner="user",
                 notes="Ensure you meet the university's start date and orientation requirements.",
-                evidence_idx=_find_chunks(chunks, ["deadline", "start date", "orientation"]),
+                evidence_idx=_find_chunks(views, ["deadline", "start date", "orientation"]),
             )
         )
 
@@ -230,7 +240,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 label="Collect proof of bona fide marriage",
                 status="todo",
                 notes="Photos, joint bank accounts, lease agreements, and affidavits from friends.",
-                evidence_idx=_find_chunks(chunks, ["photo", "bank", "lease", "affidavit", "joint"]),
+                evidence_idx=_find_chunks(views, ["photo", "bank", "lease", "affidavit", "joint"]),
             )
         )
         if not has_any("marriage certificate"):
@@ -251,11 +261,10 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 label="Verify LCA and I-129 Petition details",
                 status="todo",
                 notes="Ensure the Labor Condition Application (LCA) matches your actual work location and salary.",
-                evidence_idx=_find_chunks(chunks, ["lca", "labor condition", "i-129", "petition", "salary"]),
+                evidence_idx=_find_chunks(views, ["lca", "labor condition", "i-129", "petition", "salary"]),
             )
         )
         # Check for stamping issues in user story
-        user_story_n = _norm(user_story)
         if "stamp" in user_story_n and ("no" in user_story_n or "not" in user_story_n or "expired" in user_story_n):
              risks.append(
                 RiskItem(
@@ -283,7 +292,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                     severity="medium",
                     statement="I-797 Approval Notice not detected",
                     reason="Travel requires the original I-797 Approval Notice. Digital copies are often insufficient.",
-                    evidence_idx=_find_chunks(chunks, ["i-797", "approval"]),
+                    evidence_idx=_find_chunks(views, ["i-797", "approval"]),
                 )
              )
 
@@ -295,7 +304,7 @@ def build_reasoning(scenario: str, chunks: Sequence[str], user_story: str = "")
                 severity="medium",
                 statement="Document expiration may cause delays",
                 reason="At least one document references an expiration or validity window.",
-                evidence_idx=_find_chunks(chunks, ["expire", "expiration", "valid until", "validity"], max_hits=5),
+                evidence_idx=_find_chunks(views, ["expire", "expiration", "valid until", "validity"], max_hits=5),
             )
         )
 
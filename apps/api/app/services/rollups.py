@@ -0,0 +1,124 @@
+"""Global statistics served from the ``api_stats_daily`` rollup.
+
+A background task refreshes the rollup every ``STATS_ROLLUP_INTERVAL_SECONDS``. On
+SQLite each refresh recomputes only the days since the previous one; deletes of older
+rows are picked up by a full rebuild every ``STATS_ROLLUP_FULL_REFRESH_SECONDS``. On
+PostgreSQL the materialized view is refreshed concurrently, so readers never block.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import os
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..db.models import StatsRollupState
+from ..db.rollups import POSTGRES_REFRESH, ROLLUP_TABLE, SQLITE_REFRESH_FROM
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROLLUP_NAME = ROLLUP_TABLE
+REFRESH_INTERVAL_SECONDS = float(os.getenv("STATS_ROLLUP_INTERVAL_SECONDS", "300"))
+FULL_REFRESH_SECONDS = float(os.getenv("STATS_ROLLUP_FULL_REFRESH_SECONDS", "3600"))
+
+_EPOCH_DAY = "0001-01-01"
+
+
+def refresh_rollups(db: Session, *, full: bool = False) -> dt.datetime:
+    """Bring ``api_stats_daily`` up to date and return the new ``as_of`` time."""
+    now = dt.datetime.utcnow()
+    state = db.get(StatsRollupState, ROLLUP_NAME)
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        db.execute(text(POSTGRES_REFRESH))
+        full = True
+    else:
+        if state is None or (now - state.full_refreshed_at).total_seconds() >= FULL_REFRESH_SECONDS:
+            full = True
+        # Whole days are recomputed, so rows committed late on the watermark day still land.
+        since = _EPOCH_DAY if full else state.refreshed_at.date().isoformat()
+        for stmt in SQLITE_REFRESH_FROM:
+            db.execute(text(stmt), {"since": since})
+
+    if state is None:
+        state = StatsRollupState(name=ROLLUP_NAME, refreshed_at=now, full_refreshed_at=now)
+        db.add(state)
+    else:
+        state.refreshed_at = now
+        if full:
+            state.full_refreshed_at = now
+    db.commit()
+    logger.info("stats_rollup_refreshed", full=full, as_of=now.isoformat())
+    return now
+
+
+def rollup_as_of(db: Session, primary: Optional[Session] = None) -> dt.datetime:
+    """When the rollup was last refreshed; refreshes it now if it never has been.
+
+    ``db`` may be a read replica; the first refresh then runs on ``primary``.
+    """
+    state = db.get(StatsRollupState, ROLLUP_NAME)
+    return state.refreshed_at if state is not None else refresh_rollups(primary or db)
+
+
+def global_statistics(db: Session, primary: Optional[Session] = None) -> Dict:
+    """Totals and per-scenario case counts from the rollup."""
+    as_of = rollup_as_of(db, primary)
+
+    by_scenario: Dict[str, int] = {}
+    totals = {"total_cases": 0, "total_documents": 0, "total_chunks": 0}
+    rows = db.execute(
+        text(
+            f"SELECT scenario, SUM(cases), SUM(documents), SUM(chunks) FROM {ROLLUP_TABLE} GROUP BY scenario"
+        )
+    )
+    for scenario, cases, documents, chunks in rows:
+        if cases:
+            by_scenario[scenario] = int(cases)
+        totals["total_cases"] += int(cases or 0)
+        totals["total_documents"] += int(documents or 0)
+        totals["total_chunks"] += int(chunks or 0)
+
+    return {**totals, "cases_by_scenario": by_scenario, "as_of": as_of.isoformat()}
+
+
+def daily_statistics(db: Session, since: Optional[dt.date] = None) -> List[Dict]:
+    """Per-day, per-scenario rows from the rollup, oldest first."""
+    stmt = f"SELECT day, scenario, cases, documents, chunks FROM {ROLLUP_TABLE}"
+    params = {}
+    if since is not None:
+        stmt += " WHERE day >= :since"
+        params["since"] = since if db.get_bind().dialect.name == "postgresql" else since.isoformat()
+    stmt += " ORDER BY day, scenario"
+    return [
+        {
+            "day": str(day),
+            "scenario": scenario,
+            "cases": int(cases),
+            "documents": int(documents),
+            "chunks": int(chunks),
+        }
+        for day, scenario, cases, documents, chunks in db.execute(text(stmt), params)
+    ]
+
+
+async def run_refresher(
+    session_factory: Callable[[], Session], interval: float = REFRESH_INTERVAL_SECONDS
+) -> None:
+    """Refresh the rollup every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(_refresh_with, session_factory)
+        except Exception as e:
+            logger.error("stats_rollup_refresh_failed", error=str(e), exc_info=True)
+
+
+def _refresh_with(session_factory: Callable[[], Session]) -> None:
+    with session_factory() as db:
+        refresh_rollups(db)
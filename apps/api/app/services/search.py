@@ -0,0 +1,124 @@
+"""Search over cases and uploaded document contents."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..db.search_index import FTS_TABLE, TS_CONFIG
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+
+@dataclass
+class ChunkHit:
+    chunk_id: str
+    chunk_idx: int
+    page: int
+    case_id: str
+    case_title: str
+    document_id: str
+    filename: str
+    snippet: str
+    score: float
+
+
+def _fts5_query(q: str) -> str:
+    """Turn user input into an FTS5 query of AND-ed phrases.
+
+    Each whitespace-separated term is quoted, so punctuation such as the hyphen in
+    ``I-797`` is tokenized like the indexed text instead of being parsed as syntax.
+    A trailing ``*`` keeps prefix matching.
+    """
+    terms = []
+    for raw in q.split():
+        prefix = raw.endswith("*")
+        term = raw.rstrip("*").replace('"', '""')
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+_SQLITE_SEARCH = f"""
+SELECT c.id, c.idx, c.page, c.case_id, k.title, c.document_id, d.filename,
+       snippet({FTS_TABLE}, 0, :hl_start, :hl_end, '…', 16) AS snippet,
+       -bm25({FTS_TABLE}) AS score
+FROM {FTS_TABLE}
+JOIN api_chunks c ON c.rowid = {FTS_TABLE}.rowid
+JOIN api_documents d ON d.id = c.document_id
+JOIN api_cases k ON k.id = c.case_id
+WHERE {FTS_TABLE} MATCH :query
+  AND (:case_id IS NULL OR c.case_id = :case_id)
+ORDER BY bm25({FTS_TABLE})
+LIMIT :limit OFFSET :offset
+"""
+
+# Rank and paginate first; ts_headline is expensive, so it only runs on the page.
+_POSTGRES_SEARCH = f"""
+WITH q AS (SELECT websearch_to_tsquery('{TS_CONFIG}', :query) AS query),
+hits AS (
+    SELECT c.id, c.idx, c.page, c.case_id, c.document_id, c.text,
+           ts_rank_cd(to_tsvector('{TS_CONFIG}', c.text), q.query) AS score
+    FROM api_chunks c, q
+    WHERE to_tsvector('{TS_CONFIG}', c.text) @@ q.query
+      AND (CAST(:case_id AS VARCHAR) IS NULL OR c.case_id = :case_id)
+    ORDER BY score DESC, c.id
+    LIMIT :limit OFFSET :offset
+)
+SELECT h.id, h.idx, h.page, h.case_id, k.title, h.document_id, d.filename,
+       ts_headline('{TS_CONFIG}', h.text, q.query,
+                   'StartSel=' || :hl_start || ', StopSel=' || :hl_end
+                   || ', MaxWords=35, MinWords=12, MaxFragments=2') AS snippet,
+       h.score
+FROM hits h
+CROSS JOIN q
+JOIN api_documents d ON d.id = h.document_id
+JOIN api_cases k ON k.id = h.case_id
+ORDER BY h.score DESC, h.id
+"""
+
+
+def search_chunks(
+    db: Session,
+    q: str,
+    *,
+    case_id: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[ChunkHit]:
+    """Ranked full-text search over ``Chunk.text`` with highlighted snippets."""
+    dialect = db.get_bind().dialect.name
+    params = {
+        "case_id": case_id,
+        "limit": limit,
+        "offset": offset,
+        "hl_start": HIGHLIGHT_START,
+        "hl_end": HIGHLIGHT_END,
+    }
+    if dialect == "sqlite":
+        query = _fts5_query(q)
+        if not query:
+            return []
+        rows = db.execute(text(_SQLITE_SEARCH), {**params, "query": query}).all()
+    elif dialect == "postgresql":
+        rows = db.execute(text(_POSTGRES_SEARCH), {**params, "query": q}).all()
+    else:
+        raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+
+    return [
+        ChunkHit(
+            chunk_id=r[0],
+            chunk_idx=r[1],
+            page=r[2] or 1,
+            case_id=r[3],
+            case_title=r[4],
+            document_id=r[5],
+            filename=r[6],
+            snippet=r[7] or "",
+            score=float(r[8] or 0.0),
+        )
+        for r in rows
+    ]
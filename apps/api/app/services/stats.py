@@ -0,0 +1,200 @@
+"""Per-case statistics.
+
+Per-case statistics come from ``api_case_counters`` when it holds a row for the case;
+write paths keep that row current with :func:`bump_counters` / :func:`set_counters`.
+Otherwise (counters disabled, or a case that predates them) the numbers are computed
+by one grouped query.
+"""
+from __future__ import annotations
+
+import os
+from typing import Dict
+
+from sqlalchemy import case, func, literal_column, select, update
+from sqlalchemy.orm import Session
+
+from ..db.models import Case, CaseCounters, ChecklistItem, Chunk, Document, Risk, TimelineItem
+
+COUNTERS_ENABLED = os.getenv("STATS_COUNTERS_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+
+SEVERITIES = ("high", "medium", "low")
+COUNTER_FIELDS = (
+    "documents",
+    "chunks",
+    "checklist_items",
+    "timeline_items",
+    "risks",
+    "risks_high",
+    "risks_medium",
+    "risks_low",
+)
+
+
+def _counted(model):
+    """Rows that count towards the statistics: documents only once their upload completed."""
+    return (model.status == "ready",) if model is Document else ()
+
+
+def _count_for_case(model, case_id: str):
+    return (
+        select(func.count())
+        .select_from(model)
+        .where(model.case_id == case_id, *_counted(model))
+        .scalar_subquery()
+    )
+
+
+def compute_case_counts(db: Session, case_id: str) -> Dict[str, int]:
+    """All per-case counts in one statement; risks use conditional aggregation."""
+    severity = func.lower(Risk.severity)
+    risk_agg = (
+        select(
+            func.count().label("risks"),
+            *[
+                func.coalesce(func.sum(case((severity == s, 1), else_=0)), 0).label(f"risks_{s}")
+                for s in SEVERITIES
+            ],
+        )
+        .where(Risk.case_id == case_id)
+        .subquery()
+    )
+    stmt = select(
+        _count_for_case(Document, case_id).label("documents"),
+        _count_for_case(Chunk, case_id).label("chunks"),
+        _count_for_case(ChecklistItem, case_id).label("checklist_items"),
+        _count_for_case(TimelineItem, case_id).label("timeline_items"),
+        risk_agg.c.risks,
+        *[risk_agg.c[f"risks_{s}"] for s in SEVERITIES],
+    )
+    row = db.execute(stmt).one()
+    return {k: int(v or 0) for k, v in row._mapping.items()}
+
+
+def _upsert_computed(db: Session, case_id: str) -> None:
+    db.flush()
+    counts = compute_case_counts(db, case_id)
+    row = db.get(CaseCounters, case_id)
+    if row is None:
+        db.add(CaseCounters(case_id=case_id, **counts))
+    else:
+        for k, v in counts.items():
+            setattr(row, k, v)
+
+
+def init_counters(db: Session, case_id: str) -> None:
+    """Start counters for a newly created case."""
+    if COUNTERS_ENABLED:
+        db.add(CaseCounters(case_id=case_id, **{f: 0 for f in COUNTER_FIELDS}))
+
+
+def bump_counters(db: Session, case_id: str, **deltas: int) -> None:
+    """Add ``deltas`` to the case's counters inside the caller's transaction.
+
+    A case without a counters row (created before counters existed) gets one
+    computed from scratch instead.
+    """
+    if not COUNTERS_ENABLED or not deltas:
+        return
+    db.flush()
+    values = {
+        getattr(CaseCounters, k): getattr(CaseCounters, k) + literal_column(str(int(v)))
+        for k, v in deltas.items()
+    }
+    result = db.execute(
+        update(CaseCounters)
+        .where(CaseCounters.case_id == case_id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        _upsert_computed(db, case_id)
+
+
+def set_counters(db: Session, case_id: str, **values: int) -> None:
+    """Overwrite counters (e.g. after analysis replaces all outputs)."""
+    if not COUNTERS_ENABLED or not values:
+        return
+    db.flush()
+    result = db.execute(
+        update(CaseCounters)
+        .where(CaseCounters.case_id == case_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        _upsert_computed(db, case_id)
+
+
+def recompute_counters(db: Session, case_id: str) -> None:
+    if COUNTERS_ENABLED:
+        _upsert_computed(db, case_id)
+
+
+def risk_counter_values(severities) -> Dict[str, int]:
+    values = {"risks": 0, **{f"risks_{s}": 0 for s in SEVERITIES}}
+    for sev in severities:
+        values["risks"] += 1
+        key = f"risks_{(sev or '').lower()}"
+        if key in values:
+            values[key] += 1
+    return values
+
+
+def case_statistics(db: Session, case_id: str) -> Dict[str, int]:
+    counts = None
+    if COUNTERS_ENABLED:
+        row = db.get(CaseCounters, case_id)
+        if row is not None:
+            counts = {f: getattr(row, f) for f in COUNTER_FIELDS}
+    if counts is None:
+        counts = compute_case_counts(db, case_id)
+    return counts
+
+
+def drop_counters(db: Session, case_id: str) -> None:
+    db.query(CaseCounters).filter(CaseCounters.case_id == case_id).delete(synchronize_session=False)
+
+
+def backfill_counters(db: Session) -> int:
+    """Create counters for cases that have none, using grouped counts per table."""
+    if not COUNTERS_ENABLED:
+        return 0
+    missing = [
+        cid
+        for (cid,) in db.execute(
+            select(Case.id).where(~select(CaseCounters.case_id).where(CaseCounters.case_id == Case.id).exists())
+        )
+    ]
+    if not missing:
+        return 0
+    rows = {cid: {f: 0 for f in COUNTER_FIELDS} for cid in missing}
+    for field, model in (
+        ("documents", Document),
+        ("chunks", Chunk),
+        ("checklist_items", ChecklistItem),
+        ("timeline_items", TimelineItem),
+    ):
+        stmt = (
+            select(model.case_id, func.count())
+            .where(model.case_id.in_(missing), *_counted(model))
+            .group_by(model.case_id)
+        )
+        for cid, n in db.execute(stmt):
+            rows[cid][field] = n
+    severity = func.lower(Risk.severity)
+    stmt = (
+        select(
+            Risk.case_id,
+            func.count(),
+            *[func.sum(case((severity == s, 1), else_=0)) for s in SEVERITIES],
+        )
+        .where(Risk.case_id.in_(missing))
+        .group_by(Risk.case_id)
+    )
+    for cid, total, *by_severity in db.execute(stmt):
+        rows[cid]["risks"] = total
+        for s, n in zip(SEVERITIES, by_severity):
+            rows[cid][f"risks_{s}"] = int(n or 0)
+    db.add_all(CaseCounters(case_id=cid, **counts) for cid, counts in rows.items())
+    db.commit()
+    return len(rows)
@@ -1,20 +1,75 @@
 from __future__ import annotations
 
+import datetime as dt
+import hashlib
 import os
+import re
+import tempfile
+import time
+import threading
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# DeleteObjects accepts at most 1000 keys per request; ListObjectsV2 returns at most 1000.
+S3_DELETE_BATCH = 1000
+S3_LIST_PAGE = 1000
+
+_MB = 1024 * 1024
+# Connections the S3 client keeps open; transfers and request threads share them.
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+# Objects at least this large are uploaded as concurrent multipart parts.
+S3_MULTIPART_THRESHOLD_MB = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "8"))
+S3_MULTIPART_CHUNKSIZE_MB = int(os.getenv("S3_MULTIPART_CHUNKSIZE_MB", "8"))
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "10"))
+S3_CONNECT_TIMEOUT = float(os.getenv("S3_CONNECT_TIMEOUT", "5"))
+S3_READ_TIMEOUT = float(os.getenv("S3_READ_TIMEOUT", "60"))
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+# Local store durability: "never", "file" (fsync the data before the rename) or
+# "always" (also fsync the directory so the rename itself survives a crash).
+STORAGE_FSYNC = os.getenv("STORAGE_FSYNC", "file").strip().lower()
+# Lifetime of presigned upload and download URLs.
+S3_PRESIGN_EXPIRES_SECONDS = int(os.getenv("S3_PRESIGN_EXPIRES_SECONDS", "900"))
 
 
 @dataclass
 class StoredObject:
     key: str
     url: str
+    sha256: str = ""
+
+
+@dataclass
+class PresignedUpload:
+    url: str
+    headers: Dict[str, str]
+    expires_in: int
+    method: str = "PUT"
+
+
+@dataclass
+class ObjectInfo:
+    key: str
+    last_modified: dt.datetime  # timezone-aware, UTC
+
+
+def new_key(filename: str, prefix: str = "uploads") -> str:
+    """A fresh object key under ``prefix`` keeping ``filename``'s extension."""
+    ext = ""
+    if "." in filename:
+        ext = "." + filename.split(".")[-1].lower()
+    return f"{prefix}/{uuid.uuid4()}{ext}"
 
 
 class ObjectStore:
-    def put(self, *, fileobj: BinaryIO, filename: str, content_type: str) -> StoredObject:
+    def put(self, *, fileobj: BinaryIO, filename: str, content_type: str, prefix: str = "uploads") -> StoredObject:
+        """Store ``fileobj`` read from its current position, streaming rather than buffering it."""
+        raise NotImplementedError
+
+    def open(self, key: str) -> BinaryIO:
+        """Open a stored object for reading; raises ``FileNotFoundError`` if it is missing."""
         raise NotImplementedError
 
     def get_file_path(self, key: str) -> str:
@@ -23,32 +78,170 @@ class ObjectStore:
     def delete(self, key: str) -> None:
         raise NotImplementedError
 
+    def size(self, key: str) -> int:
+        """Size of a stored object in bytes; raises ``FileNotFoundError`` if it is missing."""
+        raise NotImplementedError
+
+    def presign_upload(
+        self, key: str, content_type: str, expires_in: int = S3_PRESIGN_EXPIRES_SECONDS
+    ) -> Optional[PresignedUpload]:
+        """A URL the client can upload ``key`` to directly, or None if the store cannot issue one."""
+        return None
+
+    def delete_many(self, keys: Sequence[str]) -> List[str]:
+        """Delete ``keys`` (missing ones are not an error); return the keys that failed."""
+        failed = []
+        for key in keys:
+            try:
+                self.delete(key)
+            except Exception:
+                failed.append(key)
+        return failed
+
+    def delete_unmodified(self, keys: Sequence[str], cutoff: dt.datetime) -> Tuple[List[str], List[str]]:
+        """Delete ``keys`` unless rewritten after ``cutoff``; return (skipped, failed) keys.
+
+        Only content-addressed keys are ever rewritten, so by default nothing is skipped.
+        """
+        return [], self.delete_many(keys)
+
+    def list_objects(self, prefix: str = "uploads", page_size: int = S3_LIST_PAGE) -> Iterator[List[ObjectInfo]]:
+        """Yield the objects under ``prefix/`` in pages of at most ``page_size``."""
+        raise NotImplementedError
+
+
+# ``<prefix>/ab/cd/<sha256>``: the layout written by LocalObjectStore.put.
+CONTENT_KEY = re.compile(r"^(?:.+/)?([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}$")
+
+
+def content_key(digest: str, prefix: str = "uploads") -> str:
+    return f"{prefix}/{digest[:2]}/{digest[2:4]}/{digest}"
+
 
 class LocalObjectStore(ObjectStore):
-    def __init__(self, base_dir: str) -> None:
+    """Content-addressed files under ``base_dir``, sharded by hash prefix.
+
+    ``put`` streams into a temporary file while hashing, then renames it to
+    ``<prefix>/ab/cd/<sha256>``: readers never see a partial file, identical uploads
+    share one file, and no directory grows past 256 entries per level. Keys from the
+    older flat ``<prefix>/<uuid>.<ext>`` layout stay readable.
+    """
+
+    TMP_DIR = ".tmp"
+    STALE_TMP_SECONDS = 3600
+
+    def __init__(self, base_dir: str, fsync: str = STORAGE_FSYNC) -> None:
         self.base = Path(base_dir).resolve()
         self.base.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self.tmp = self.base / self.TMP_DIR
+        self.tmp.mkdir(exist_ok=True)
+        self._remove_stale_tmp()
 
-    def put(self, *, fileobj: BinaryIO, filename: str, content_type: str) -> StoredObject:
-        _ = content_type
-        ext = ""
-        if "." in filename:
-            ext = "." + filename.split(".")[-1].lower()
-        key = f"uploads/{uuid.uuid4()}{ext}"
-        path = self.base / key
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "wb") as f:
-            f.write(fileobj.read())
-        return StoredObject(key=key, url=str(path))
+    def _remove_stale_tmp(self) -> None:
+        """Drop temporary files left behind by a crash mid-write."""
+        cutoff = time.time() - self.STALE_TMP_SECONDS
+        for path in self.tmp.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _fsync_dir(self, path: Path) -> None:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def put(self, *, fileobj: BinaryIO, filename: str, content_type: str, prefix: str = "uploads") -> StoredObject:
+        _ = content_type, filename
+        digest = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = fileobj.read(_MB)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    f.write(chunk)
+                if self.fsync in ("file", "always"):
+                    f.flush()
+                    os.fsync(f.fileno())
+            sha = digest.hexdigest()
+            key = content_key(sha, prefix)
+            path = self.base / key
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Same content, same key: replacing an existing copy is harmless.
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+        if self.fsync == "always":
+            self._fsync_dir(path.parent)
+        return StoredObject(key=key, url=str(path), sha256=sha)
 
     def get_file_path(self, key: str) -> str:
         return str(self.base / key)
 
+    def open(self, key: str) -> BinaryIO:
+        return open(self.base / key, "rb")
+
+    def size(self, key: str) -> int:
+        return (self.base / key).stat().st_size
+
     def delete(self, key: str) -> None:
         path = self.base / key
         if path.exists():
             path.unlink()
 
+    def delete_unmodified(self, keys: Sequence[str], cutoff: dt.datetime) -> Tuple[List[str], List[str]]:
+        # An identical upload os.replace()s the file, refreshing its mtime: check it
+        # right before each unlink rather than trusting the listing.
+        limit = cutoff.timestamp()
+        skipped: List[str] = []
+        failed: List[str] = []
+        for key in keys:
+            path = self.base / key
+            try:
+                if path.stat().st_mtime > limit:
+                    skipped.append(key)
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                failed.append(key)
+        return skipped, failed
+
+    def list_objects(self, prefix: str = "uploads", page_size: int = S3_LIST_PAGE) -> Iterator[List[ObjectInfo]]:
+        root = self.base / prefix
+        page: List[ObjectInfo] = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = Path(dirpath) / name
+                try:
+                    mtime = path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                page.append(
+                    ObjectInfo(
+                        key=path.relative_to(self.base).as_posix(),
+                        last_modified=dt.datetime.fromtimestamp(mtime, tz=dt.timezone.utc),
+                    )
+                )
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+        if page:
+            yield page
+
 
 class S3ObjectStore(ObjectStore):
     def __init__(
@@ -62,27 +255,42 @@ class S3ObjectStore(ObjectStore):
         public_base_url: Optional[str] = None,
     ) -> None:
         import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
 
         self.bucket = bucket
         self.public_base_url = public_base_url
+        # One client per process: boto3 clients are thread-safe, and building one costs
+        # credential resolution, endpoint setup and a fresh connection pool.
         self.client = boto3.client(
             "s3",
             endpoint_url=endpoint_url,
             aws_access_key_id=access_key,
             aws_secret_access_key=secret_key,
             region_name=region,
+            config=Config(
+                max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                connect_timeout=S3_CONNECT_TIMEOUT,
+                read_timeout=S3_READ_TIMEOUT,
+                retries={"max_attempts": S3_MAX_ATTEMPTS, "mode": "adaptive"},
+                tcp_keepalive=True,
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD_MB * _MB,
+            multipart_chunksize=S3_MULTIPART_CHUNKSIZE_MB * _MB,
+            max_concurrency=S3_MAX_CONCURRENCY,
+            use_threads=S3_MAX_CONCURRENCY > 1,
         )
 
-    def put(self, *, fileobj: BinaryIO, filename: str, content_type: str) -> StoredObject:
-        ext = ""
-        if "." in filename:
-            ext = "." + filename.split(".")[-1].lower()
-        key = f"uploads/{uuid.uuid4()}{ext}"
+    def put(self, *, fileobj: BinaryIO, filename: str, content_type: str, prefix: str = "uploads") -> StoredObject:
+        key = new_key(filename, prefix)
         self.client.upload_fileobj(
             Fileobj=fileobj,
             Bucket=self.bucket,
             Key=key,
             ExtraArgs={"ContentType": content_type or "application/octet-stream"},
+            Config=self.transfer_config,
         )
         if self.public_base_url:
             url = f"{self.public_base_url.rstrip('/')}/{key}"
@@ -90,19 +298,101 @@ class S3ObjectStore(ObjectStore):
             url = f"s3://{self.bucket}/{key}"
         return StoredObject(key=key, url=url)
 
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        except self.client.exceptions.NoSuchKey as e:
+            raise FileNotFoundError(key) from e
+
     def get_file_path(self, key: str) -> str:
         raise NotImplementedError("S3 storage does not support direct file path access. Use download URL.")
 
-    def get_download_url(self, key: str) -> str:
+    def size(self, key: str) -> int:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                raise FileNotFoundError(key) from e
+            raise
+
+    def get_download_url(
+        self, key: str, filename: Optional[str] = None, expires_in: int = S3_PRESIGN_EXPIRES_SECONDS
+    ) -> str:
+        """The public URL of ``key`` if the bucket has one, else a presigned GET URL."""
         if self.public_base_url:
             return f"{self.public_base_url.rstrip('/')}/{key}"
-        return f"s3://{self.bucket}/{key}"
+        params = {"Bucket": self.bucket, "Key": key}
+        if filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{filename.replace(chr(34), "")}"'
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
+
+    def presign_upload(
+        self, key: str, content_type: str, expires_in: int = S3_PRESIGN_EXPIRES_SECONDS
+    ) -> Optional[PresignedUpload]:
+        content_type = content_type or "application/octet-stream"
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.bucket, "Key": key, "ContentType": content_type},
+            ExpiresIn=expires_in,
+        )
+        # The signature covers Content-Type, so the client must send the same header.
+        return PresignedUpload(url=url, headers={"Content-Type": content_type}, expires_in=expires_in)
 
     def delete(self, key: str) -> None:
         self.client.delete_object(Bucket=self.bucket, Key=key)
 
+    def delete_many(self, keys: Sequence[str]) -> List[str]:
+        failed: List[str] = []
+        for start in range(0, len(keys), S3_DELETE_BATCH):
+            batch = keys[start:start + S3_DELETE_BATCH]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True},
+                )
+            except Exception:
+                failed.extend(batch)
+                continue
+            failed.extend(err["Key"] for err in response.get("Errors", []))
+        return failed
+
+    def list_objects(self, prefix: str = "uploads", page_size: int = S3_LIST_PAGE) -> Iterator[List[ObjectInfo]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=self.bucket,
+            Prefix=f"{prefix.rstrip('/')}/",
+            PaginationConfig={"PageSize": min(page_size, S3_LIST_PAGE)},
+        )
+        for response in pages:
+            contents = response.get("Contents", [])
+            if contents:
+                yield [ObjectInfo(key=o["Key"], last_modified=o["LastModified"]) for o in contents]
+
+
+_store: Optional[ObjectStore] = None
+_store_lock = threading.Lock()
+
 
 def get_store() -> ObjectStore:
+    """The process-wide object store, built from the environment on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_store()
+    return _store
+
+
+def reset_store() -> None:
+    """Forget the cached store so the next :func:`get_store` re-reads the environment."""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+def _create_store() -> ObjectStore:
     endpoint = os.getenv("S3_ENDPOINT", "").strip()
     bucket = os.getenv("S3_BUCKET", "").strip()
     access = os.getenv("S3_ACCESS_KEY", "").strip()
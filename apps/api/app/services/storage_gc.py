@@ -0,0 +1,258 @@
+"""Garbage collection of stored objects that no row references.
+
+Uploads whose database transaction failed after ``store.put``, and deletes whose blob
+removal failed, leave objects behind that nothing points at. The collector lists the
+objects under the ``STORAGE_GC_PREFIXES`` page by page and deletes those that are not
+the ``storage_key`` of any document, page preview or export job.
+
+The referenced keys are loaded once per run into an exact set, or, past
+``STORAGE_GC_EXACT_MAX`` keys, into a Bloom filter sized for
+``STORAGE_GC_BLOOM_ERROR``. A Bloom filter never misses a referenced key, so a false
+positive only keeps an orphan for another run; each run uses a fresh salt, so the same
+orphan is not kept twice in a row. Objects younger than ``STORAGE_GC_GRACE_SECONDS``
+are skipped: their row may not be committed yet.
+
+Orphans are deleted in batches, and an identical upload can reuse a content-addressed
+key between the listing and the delete. Right before each batch is deleted its keys
+are looked up again in the database, and the local store re-checks each file's
+modification time against the grace cutoff; keys found in use are kept.
+
+Each run first expires abandoned direct uploads (see
+:func:`~app.services.deletion.expire_pending_documents`) and removes their objects.
+
+Runs every ``STORAGE_GC_INTERVAL_SECONDS`` in the API process (0 disables), or once
+from the command line::
+
+    python -m app.services.storage_gc --dry-run
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import hashlib
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Sequence, Set, Union
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..db.models import Document, DocumentPage, ExportJob
+from ..utils.logger import get_logger
+from ..utils.metrics import REGISTRY
+from .deletion import (
+    DELETE_BATCH_SIZE,
+    PENDING_UPLOAD_TTL_SECONDS,
+    expire_pending_documents,
+    purge_objects,
+)
+from .storage import ObjectStore, get_store
+
+logger = get_logger(__name__)
+
+INTERVAL_SECONDS = float(os.getenv("STORAGE_GC_INTERVAL_SECONDS", "86400"))
+GRACE_SECONDS = float(os.getenv("STORAGE_GC_GRACE_SECONDS", "86400"))
+PREFIXES = [p.strip() for p in os.getenv("STORAGE_GC_PREFIXES", "uploads,previews").split(",") if p.strip()]
+DRY_RUN = os.getenv("STORAGE_GC_DRY_RUN", "false").lower() in ("1", "true", "yes")
+EXACT_MAX = int(os.getenv("STORAGE_GC_EXACT_MAX", "250000"))
+BLOOM_ERROR = float(os.getenv("STORAGE_GC_BLOOM_ERROR", "0.001"))
+LIST_PAGE_SIZE = int(os.getenv("STORAGE_GC_PAGE_SIZE", "1000"))
+
+GC_SCANNED = REGISTRY.counter("storage_gc_objects_scanned_total", "Stored objects examined by the garbage collector.")
+GC_ORPHANS = REGISTRY.counter("storage_gc_orphans_total", "Unreferenced objects found (dry_run label: not deleted).")
+GC_DELETED = REGISTRY.counter("storage_gc_deleted_total", "Unreferenced objects deleted.")
+GC_FAILED = REGISTRY.counter("storage_gc_delete_failures_total", "Unreferenced objects that could not be deleted.")
+GC_DURATION = REGISTRY.histogram(
+    "storage_gc_run_seconds", "Duration of garbage collector runs.", buckets=(1, 5, 15, 60, 300, 900, 3600, 10800)
+)
+GC_LAST_SUCCESS = REGISTRY.gauge("storage_gc_last_success_timestamp", "Unix time the last run completed.")
+
+
+class BloomFilter:
+    """A salted Bloom filter over strings: no false negatives, ``error_rate`` false positives."""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR, salt: Optional[bytes] = None) -> None:
+        capacity = max(1, capacity)
+        self.size = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.salt = salt if salt is not None else os.urandom(16)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16, salt=self.salt).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+@dataclass
+class GcReport:
+    dry_run: bool
+    expired: int = 0
+    scanned: int = 0
+    too_recent: int = 0
+    orphans: int = 0
+    reused: int = 0  # orphans referenced or rewritten again before their batch was deleted
+    deleted: int = 0
+    failed: int = 0
+    exact: bool = True
+    sample: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "expired": self.expired,
+            "scanned": self.scanned,
+            "too_recent": self.too_recent,
+            "orphans": self.orphans,
+            "reused": self.reused,
+            "deleted": self.deleted,
+            "failed": self.failed,
+            "exact": self.exact,
+            "sample": self.sample,
+        }
+
+
+_REFERENCE_COLUMNS = (Document.storage_key, DocumentPage.storage_key, ExportJob.storage_key)
+
+
+def referenced_keys(db: Session, exact_max: int = EXACT_MAX) -> Union[Set[str], BloomFilter]:
+    """Every ``storage_key`` in use, as a set or (past ``exact_max``) a Bloom filter."""
+    total = sum(db.scalar(select(func.count()).select_from(col.class_)) or 0 for col in _REFERENCE_COLUMNS)
+    refs: Union[Set[str], BloomFilter] = set() if total <= exact_max else BloomFilter(total)
+    for col in _REFERENCE_COLUMNS:
+        rows = db.execute(select(col).where(col != "").execution_options(yield_per=10_000))
+        for (key,) in rows:
+            refs.add(key)
+    return refs
+
+
+def still_referenced(db: Session, keys: Sequence[str]) -> Set[str]:
+    """Those of ``keys`` some row references now (the caller's snapshot is ended first)."""
+    db.rollback()
+    found: Set[str] = set()
+    for col in _REFERENCE_COLUMNS:
+        found.update(db.scalars(select(col).where(col.in_(list(keys)))))
+    return found
+
+
+def collect_garbage(
+    db: Session,
+    store: Optional[ObjectStore] = None,
+    *,
+    dry_run: bool = DRY_RUN,
+    grace_seconds: float = GRACE_SECONDS,
+    prefixes: Sequence[str] = PREFIXES,
+    page_size: int = LIST_PAGE_SIZE,
+    exact_max: int = EXACT_MAX,
+    pending_ttl_seconds: float = PENDING_UPLOAD_TTL_SECONDS,
+) -> GcReport:
+    """Delete (or with ``dry_run`` only count) objects under ``prefixes`` that nothing references."""
+    store = store or get_store()
+    started = time.perf_counter()
+    cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(seconds=grace_seconds)
+    expired = [] if dry_run else expire_pending_documents(db, pending_ttl_seconds)
+    if expired:
+        db.commit()
+        keys = [k for d in expired for k in d.object_keys]
+        if keys:
+            purge_objects(keys, store)
+    refs = referenced_keys(db, exact_max)
+    report = GcReport(dry_run=dry_run, expired=len(expired), exact=isinstance(refs, set))
+    mode = "true" if dry_run else "false"
+
+    batch: List[str] = []
+
+    def flush() -> None:
+        if not batch:
+            return
+        in_use = still_referenced(db, batch)
+        skipped, failed = store.delete_unmodified([k for k in batch if k not in in_use], cutoff)
+        deleted = len(batch) - len(in_use) - len(skipped) - len(failed)
+        report.reused += len(in_use) + len(skipped)
+        report.deleted += deleted
+        report.failed += len(failed)
+        GC_DELETED.inc(deleted)
+        GC_FAILED.inc(len(failed))
+        batch.clear()
+
+    pages = (page for prefix in prefixes for page in store.list_objects(prefix, page_size))
+    for page in pages:
+        report.scanned += len(page)
+        GC_SCANNED.inc(len(page))
+        for obj in page:
+            if obj.last_modified > cutoff:
+                report.too_recent += 1
+                continue
+            if obj.key in refs:
+                continue
+            report.orphans += 1
+            GC_ORPHANS.inc(dry_run=mode)
+            if len(report.sample) < 20:
+                report.sample.append(obj.key)
+            if not dry_run:
+                batch.append(obj.key)
+                if len(batch) >= DELETE_BATCH_SIZE:
+                    flush()
+    if not dry_run:
+        flush()
+
+    GC_DURATION.observe(time.perf_counter() - started)
+    GC_LAST_SUCCESS.set(time.time())
+    logger.info("storage_gc_completed", **{k: v for k, v in report.as_dict().items() if k != "sample"})
+    return report
+
+
+async def run_collector(
+    session_factory: Callable[[], Session], interval: float = INTERVAL_SECONDS
+) -> None:
+    """Collect garbage every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(_collect_with, session_factory)
+        except Exception as e:
+            logger.error("storage_gc_failed", error=str(e), exc_info=True)
+
+
+def _collect_with(session_factory: Callable[[], Session]) -> GcReport:
+    with session_factory() as db:
+        return collect_garbage(db)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", default=DRY_RUN, help="Report orphans without deleting")
+    parser.add_argument("--grace-hours", type=float, default=GRACE_SECONDS / 3600, help="Skip objects newer than this")
+    parser.add_argument("--prefix", nargs="+", default=PREFIXES, help="Key prefixes to scan (default: %(default)s)")
+    parser.add_argument("--page-size", type=int, default=LIST_PAGE_SIZE)
+    args = parser.parse_args(argv)
+
+    from ..db.session import SessionLocal
+
+    with SessionLocal() as db:
+        report = collect_garbage(
+            db,
+            dry_run=args.dry_run,
+            grace_seconds=args.grace_hours * 3600,
+            prefixes=args.prefix,
+            page_size=args.page_size,
+        )
+    print(f"scanned {report.scanned:,d}  recent {report.too_recent:,d}  orphans {report.orphans:,d}"
+          f"  deleted {report.deleted:,d}  failed {report.failed:,d}{'  (dry run)' if report.dry_run else ''}")
+    for key in report.sample:
+        print(f"  {key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Move local files from the flat ``<prefix>/<uuid>.<ext>`` layout to content-addressed keys.
+
+Each document and export job whose key is not yet ``<prefix>/ab/cd/<sha256>`` is
+re-stored through :meth:`LocalObjectStore.put` (atomic, deduplicating), its row is
+pointed at the new key in batches, and the old file is removed once the batch has
+committed and nothing references it any more. Rows whose file is missing are reported
+and left alone, so the tool can be re-run safely::
+
+    python -m app.services.storage_migrate --dry-run
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..db.models import Document, ExportJob
+from ..utils.logger import get_logger
+from .deletion import unreferenced
+from .storage import CONTENT_KEY, LocalObjectStore, get_store
+
+logger = get_logger(__name__)
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class MigrationReport:
+    dry_run: bool
+    migrated: int = 0
+    missing: int = 0
+    removed: int = 0
+
+
+def _legacy_rows(db: Session, model) -> List[Tuple[str, str]]:
+    stmt = select(model.id, model.storage_key).where(model.storage_key != "")
+    rows = db.execute(stmt.execution_options(yield_per=10_000))
+    return [(row_id, key) for row_id, key in rows if not CONTENT_KEY.match(key)]
+
+
+def migrate_local_keys(
+    db: Session,
+    store: Optional[LocalObjectStore] = None,
+    *,
+    dry_run: bool = False,
+    batch_size: int = BATCH_SIZE,
+) -> MigrationReport:
+    store = store or get_store()
+    if not isinstance(store, LocalObjectStore):
+        raise ValueError("Only local storage uses the content-addressed layout")
+    report = MigrationReport(dry_run=dry_run)
+
+    for model in (Document, ExportJob):
+        legacy = _legacy_rows(db, model)
+        db.rollback()
+        for start in range(0, len(legacy), batch_size):
+            updates, old_keys = [], []
+            for row_id, key in legacy[start:start + batch_size]:
+                try:
+                    with store.open(key) as f:
+                        if dry_run:
+                            report.migrated += 1
+                            continue
+                        prefix = key.rsplit("/", 1)[0] if "/" in key else "uploads"
+                        stored = store.put(fileobj=f, filename=key, content_type="", prefix=prefix)
+                except FileNotFoundError:
+                    report.missing += 1
+                    logger.warning("storage_migrate_missing", table=model.__tablename__, id=row_id, storage_key=key)
+                    continue
+                values = {"id": row_id, "storage_key": stored.key}
+                if model is Document:
+                    values["sha256"] = stored.sha256
+                updates.append(values)
+                old_keys.append(key)
+            if not updates:
+                continue
+            db.execute(update(model), updates)
+            db.commit()
+            report.migrated += len(updates)
+
+            for key in unreferenced(db, old_keys) if model is Document else old_keys:
+                store.delete(key)
+                report.removed += 1
+            db.rollback()
+            logger.info("storage_migrate_batch", table=model.__tablename__, migrated=report.migrated)
+
+    logger.info("storage_migrate_completed", **report.__dict__)
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Count legacy keys without moving anything")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    from ..db.session import SessionLocal
+
+    with SessionLocal() as db:
+        report = migrate_local_keys(db, dry_run=args.dry_run, batch_size=args.batch_size)
+    verb = "would migrate" if report.dry_run else "migrated"
+    print(f"{verb} {report.migrated:,d}  missing {report.missing:,d}  old files removed {report.removed:,d}")
+
+
+if __name__ == "__main__":
+    main()
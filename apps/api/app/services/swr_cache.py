@@ -0,0 +1,171 @@
+"""Bounded async cache with stale-while-revalidate and single-flight fetches.
+
+Each entry is fresh for ``ttl`` seconds and then stale for up to ``stale_ttl`` more:
+
+* fresh entries are returned as-is;
+* stale entries are returned immediately while one background task refetches them;
+* missing (or too old) entries are fetched before returning.
+
+Concurrent callers for the same key share a single in-flight fetch, so a burst of
+requests for a cold key costs one upstream call. ``fetch(previous)`` receives the last
+value stored for the key, even an expired one, so it can revalidate with a conditional
+request. If a background refresh fails the stale value keeps being served.
+
+At most ``max_entries`` keys are kept, least recently used evicted first. With ``path``
+set the entries are saved there as JSON after every fetch and loaded on first use, so a
+restarted process does not start cold. Values must be JSON-serializable.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..utils.logger import get_logger
+from ..utils.metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "swr_cache_requests_total", "Cache lookups by cache and result (fresh, stale, miss, coalesced)"
+)
+CACHE_REFRESH_FAILURES = REGISTRY.counter(
+    "swr_cache_refresh_failures_total", "Background refreshes that failed and kept serving the stale value"
+)
+
+Fetch = Callable[[Optional[Dict[str, Any]]], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class CacheEntry:
+    value: Dict[str, Any]
+    fetched_at: float  # wall clock, so persisted entries age across restarts
+
+
+class SWRCache:
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: int = 256,
+        ttl: float = 3600.0,
+        stale_ttl: float = 86400.0,
+        path: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.path = path
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._loaded = path is None
+        self._save_lock: Optional[asyncio.Lock] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        return self._entries.get(key)
+
+    async def get(self, key: str, fetch: Fetch) -> Dict[str, Any]:
+        """The cached value for ``key``, fetching (once, however many callers) as needed."""
+        if not self._loaded:
+            self._loaded = True
+            await asyncio.to_thread(self._load)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = time.time() - entry.fetched_at
+            if age < self.ttl:
+                CACHE_REQUESTS.inc(cache=self.name, result="fresh")
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                CACHE_REQUESTS.inc(cache=self.name, result="stale")
+                self._refresh(key, fetch, background=True)
+                return entry.value
+
+        result = "coalesced" if key in self._inflight else "miss"
+        CACHE_REQUESTS.inc(cache=self.name, result=result)
+        # Shielded: a caller that gives up must not cancel the fetch the others wait on.
+        return await asyncio.shield(self._refresh(key, fetch, background=False))
+
+    def _refresh(self, key: str, fetch: Fetch, *, background: bool) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch, background))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return task
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _fetch(self, key: str, fetch: Fetch, background: bool) -> Dict[str, Any]:
+        previous = self._entries.get(key)
+        try:
+            value = await fetch(previous.value if previous else None)
+        except Exception as e:
+            if background:
+                CACHE_REFRESH_FAILURES.inc(cache=self.name)
+                logger.warning("cache_refresh_failed", cache=self.name, key=key, error=str(e))
+                return previous.value
+            raise
+        self._entries[key] = CacheEntry(value=value, fetched_at=time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self.path:
+            await self._save()
+        return value
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("cache_load_failed", cache=self.name, path=self.path, error=str(e))
+            return
+        for key, item in list(data.items())[-self.max_entries :]:
+            self._entries.setdefault(key, CacheEntry(value=item["value"], fetched_at=item["fetched_at"]))
+        logger.info("cache_loaded", cache=self.name, entries=len(self._entries))
+
+    async def _save(self) -> None:
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        async with self._save_lock:
+            # Snapshot under the lock so saves land in order.
+            snapshot = {k: {"value": e.value, "fetched_at": e.fetched_at} for k, e in self._entries.items()}
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except OSError as e:
+                logger.warning("cache_save_failed", cache=self.name, path=self.path, error=str(e))
+
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".cache-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    async def aclose(self) -> None:
+        """Cancel in-flight fetches (their event loop is about to close)."""
+        tasks, self._inflight = list(self._inflight.values()), {}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._save_lock = None
@@ -0,0 +1,149 @@
+"""File responses with byte ranges and conditional GET.
+
+Starlette's ``FileResponse`` always sends the whole file and ignores ``If-None-Match``.
+PDF viewers fetch a document page by page with ``Range`` requests and revalidate it on
+every view, so :func:`file_response` answers
+
+* ``If-None-Match`` / ``If-Modified-Since`` with ``304 Not Modified``;
+* a single ``Range: bytes=...`` with ``206 Partial Content`` (``If-Range`` honoured),
+  or ``416`` when it lies outside the file;
+
+and anything else (including multi-range requests) with the full file.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """The inclusive ``(start, end)`` of a single-range header, or None to send everything.
+
+    Raises :class:`RangeNotSatisfiable` if the range starts past the end of the file.
+    """
+    if not header:
+        return None
+    m = _RANGE.match(header.strip())
+    if not m or (not m.group(1) and not m.group(2)):
+        return None  # malformed or multi-range: ignore it
+    first, last = m.groups()
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if end < start:
+        return None
+    return start, end
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` list."""
+    if header.strip() == "*":
+        return True
+    ours = etag[2:] if etag.startswith("W/") else etag
+    return any((tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip()) == ours for tag in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: dt.datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def content_disposition(filename: str, disposition: str = "attachment") -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+def _iter_slice(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(
+    request: Request,
+    path: str,
+    *,
+    filename: str,
+    media_type: Optional[str],
+    etag: str,
+    last_modified: dt.datetime,
+    cache_control: str,
+    disposition: str = "attachment",
+) -> Response:
+    """Serve ``path`` honouring conditional and range headers (``last_modified`` is UTC)."""
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=dt.timezone.utc)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified.timestamp(), usegmt=True),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since"):
+        if _not_modified_since(request.headers["if-modified-since"], last_modified):
+            return Response(status_code=304, headers=headers)
+
+    size = os.stat(path).st_size
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and if_range is not None and not (
+        if_range.strip() == etag or _not_modified_since(if_range, last_modified)
+    ):
+        range_header = None  # the client's copy is stale: send the whole new file
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        return FileResponse(
+            path, filename=filename, media_type=media_type, headers=headers, content_disposition_type=disposition
+        )
+
+    start, end = byte_range
+    headers.update(
+        {
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": content_disposition(filename, disposition),
+        }
+    )
+    return StreamingResponse(_iter_slice(path, start, end), status_code=206, media_type=media_type, headers=headers)
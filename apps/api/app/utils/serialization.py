@@ -0,0 +1,47 @@
+"""Fast JSON responses.
+
+``JSONResponse`` here is FastAPI's ``ORJSONResponse`` when ``orjson`` is installed and
+the stdlib-backed ``JSONResponse`` otherwise; it is the app's default response class.
+
+Endpoints on hot paths skip FastAPI's ``jsonable_encoder`` pass by returning a
+response themselves: :func:`json_response` for plain dicts/lists, and
+:func:`model_response`, which validates against the response type and serializes to
+JSON in one pydantic-core call.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse as _StdJSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as JSONResponse
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    JSONResponse = _StdJSONResponse
+
+MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=None)
+def adapter_for(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+def json_response(
+    content: Any, *, status_code: int = 200, headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """Serialize already JSON-shaped ``content`` (dicts, lists, str/int/float/None)."""
+    return JSONResponse(content, status_code=status_code, headers=dict(headers or {}))
+
+
+def model_response(
+    tp: Any, content: Any, *, status_code: int = 200, headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """Validate ``content`` as ``tp`` (e.g. ``list[CaseOut]``) and serialize it to JSON."""
+    adapter = adapter_for(tp)
+    body = adapter.dump_json(adapter.validate_python(content))
+    return Response(body, status_code=status_code, media_type=MEDIA_TYPE, headers=dict(headers or {}))
@@ -0,0 +1,77 @@
+"""Benchmark full-text search over a large chunk table.
+
+Builds a throwaway SQLite database with ``--chunks`` synthetic chunks (FTS5 index
+maintained by the same triggers the API uses) and times ranked searches.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.bench_search --chunks 100000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.db import search_index  # noqa: F401  (registers the FTS DDL)
+from app.db.models import Base, Case, Chunk, Document
+from app.services.search import search_chunks
+
+from .bench_chunker import WORDS
+
+
+def populate(engine, n_chunks: int, chunks_per_doc: int = 50) -> None:
+    """Filler text from a large vocabulary, with domain terms sprinkled into ~2% of chunks."""
+    rnd = random.Random(3)
+    filler = ["".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rnd.randint(3, 9))) for _ in range(20_000)]
+    cases, docs, chunks = [], [], []
+    for d in range(0, n_chunks, chunks_per_doc):
+        case_id, doc_id = str(uuid.uuid4()), str(uuid.uuid4())
+        cases.append({"id": case_id, "title": f"Case {d}", "scenario": "job_onboarding", "summary": "", "user_story": ""})
+        docs.append({"id": doc_id, "case_id": case_id, "filename": f"doc{d}.pdf", "content_type": "application/pdf", "storage_key": f"uploads/{doc_id}.pdf"})
+        for i in range(chunks_per_doc):
+            words = [rnd.choice(filler) for _ in range(90)]
+            if rnd.random() < 0.02:
+                words[rnd.randrange(len(words))] = rnd.choice(WORDS)
+            body = " ".join(words)
+            chunks.append({"id": str(uuid.uuid4()), "case_id": case_id, "document_id": doc_id, "idx": i, "text": body, "page": 1 + i // 5, "char_start": 0, "char_end": len(body)})
+    with engine.begin() as conn:
+        conn.execute(insert(Case), cases)
+        conn.execute(insert(Document), docs)
+        for i in range(0, len(chunks), 10_000):
+            conn.execute(insert(Chunk), chunks[i : i + 10_000])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        t0 = time.perf_counter()
+        populate(engine, args.chunks)
+        print(f"indexed {args.chunks} chunks in {time.perf_counter() - t0:.1f} s")
+
+        with Session(engine) as db:
+            for q in ["I-797", "approval notice", "biometrics interview", "salary"]:
+                timings = []
+                for _ in range(args.runs):
+                    t0 = time.perf_counter()
+                    hits = search_chunks(db, q, limit=20)
+                    timings.append((time.perf_counter() - t0) * 1000)
+                print(f"{q!r:<24} hits={len(hits):>3}  median={statistics.median(timings):7.2f} ms  max={max(timings):7.2f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Benchmark response serialization for ``/cases/{id}/outputs`` and ``/cases``.
+
+Compares the previous path (build pydantic models, ``model_dump()`` them, then FastAPI's
+response-model validation + ``jsonable_encoder`` + stdlib ``json``) with the current
+one (plain dicts through ``orjson``, or one pydantic-core validate + ``dump_json``).
+Rows are in-memory stand-ins for ORM objects, so only serialization is timed.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.bench_serialization --chunks 2000 --cases 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.schemas.case import CaseOut, ChecklistItemOut, RiskOut, TimelineItemOut
+from app.utils.serialization import adapter_for, json_response
+
+from .bench_chunker import WORDS
+
+
+def _text(rnd: random.Random, n: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(n))
+
+
+def make_rows(n_chunks: int, n_items: int, n_cases: int):
+    rnd = random.Random(7)
+    ns = SimpleNamespace
+    ids = lambda: str(uuid.uuid4())  # noqa: E731
+    case = ns(id=ids(), title="Family Visit", scenario="family_reunion", summary=_text(rnd, 60), user_story=_text(rnd, 40))
+    chunks = [ns(id=ids(), document_id="d1", idx=i, page=1 + i // 5, text=_text(rnd, 90)) for i in range(n_chunks)]
+    ev = lambda: ",".join(rnd.choice(chunks).id for _ in range(3))  # noqa: E731
+    checklist = [ns(id=ids(), label=_text(rnd, 4), status="todo", notes=_text(rnd, 20), evidence_chunk_ids=ev()) for _ in range(n_items)]
+    timeline = [
+        ns(id=ids(), label=_text(rnd, 4), status="todo", due_date="2025-01-15", owner="user", notes=_text(rnd, 20), evidence_chunk_ids=ev())
+        for _ in range(n_items)
+    ]
+    risks = [
+        ns(id=ids(), category="Financial", severity="medium", statement=_text(rnd, 12), reason=_text(rnd, 20), evidence_chunk_ids=ev())
+        for _ in range(n_items)
+    ]
+    cases = [ns(id=ids(), title=_text(rnd, 4), scenario="study", summary=_text(rnd, 30), user_story="") for _ in range(n_cases)]
+    return case, chunks, checklist, timeline, risks, cases
+
+
+def _split(s: str) -> List[str]:
+    return [x for x in (s or "").split(",") if x]
+
+
+def _stdlib_render(content) -> bytes:
+    # starlette.responses.JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def legacy_outputs(case, chunks, checklist, timeline, risks) -> bytes:
+    payload = {
+        "case": CaseOut(id=case.id, title=case.title, scenario=case.scenario, summary=case.summary, user_story=case.user_story).model_dump(),
+        "checklist": [
+            ChecklistItemOut(id=i.id, label=i.label, status=i.status, notes=i.notes, evidence_chunk_ids=_split(i.evidence_chunk_ids)).model_dump()
+            for i in checklist
+        ],
+        "timeline": [
+            TimelineItemOut(
+                id=i.id, label=i.label, status=i.status, due_date=i.due_date, owner=i.owner, notes=i.notes,
+                evidence_chunk_ids=_split(i.evidence_chunk_ids),
+            ).model_dump()
+            for i in timeline
+        ],
+        "risks": [
+            RiskOut(
+                id=i.id, category=i.category, severity=i.severity, statement=i.statement, reason=i.reason,
+                evidence_chunk_ids=_split(i.evidence_chunk_ids),
+            ).model_dump()
+            for i in risks
+        ],
+        "chunks": {c.id: {"id": c.id, "document_id": c.document_id, "filename": "f.pdf", "idx": c.idx, "page": c.page, "text": c.text} for c in chunks},
+    }
+    adapter = TypeAdapter(dict)
+    return _stdlib_render(jsonable_encoder(adapter.dump_python(adapter.validate_python(payload), mode="json")))
+
+
+def current_outputs(case, chunks, checklist, timeline, risks) -> bytes:
+    payload = {
+        "case": {"id": case.id, "title": case.title, "scenario": case.scenario, "summary": case.summary, "user_story": case.user_story},
+        "checklist": [
+            {"id": i.id, "label": i.label, "status": i.status, "notes": i.notes, "evidence_chunk_ids": _split(i.evidence_chunk_ids)}
+            for i in checklist
+        ],
+        "timeline": [
+            {
+                "id": i.id, "label": i.label, "status": i.status, "due_date": i.due_date, "owner": i.owner, "notes": i.notes,
+                "evidence_chunk_ids": _split(i.evidence_chunk_ids),
+            }
+            for i in timeline
+        ],
+        "risks": [
+            {
+                "id": i.id, "category": i.category, "severity": i.severity, "statement": i.statement, "reason": i.reason,
+                "evidence_chunk_ids": _split(i.evidence_chunk_ids),
+            }
+            for i in risks
+        ],
+        "chunks": {c.id: {"id": c.id, "document_id": c.document_id, "filename": "f.pdf", "idx": c.idx, "page": c.page, "text": c.text} for c in chunks},
+    }
+    return json_response(payload).body
+
+
+def legacy_cases(cases) -> bytes:
+    models = [CaseOut(id=c.id, title=c.title, scenario=c.scenario, summary=c.summary) for c in cases]
+    adapter = TypeAdapter(List[CaseOut])
+    content = [m.model_dump() for m in models]
+    return _stdlib_render(jsonable_encoder(adapter.dump_python(adapter.validate_python(content), mode="json")))
+
+
+def current_cases(cases) -> bytes:
+    adapter = adapter_for(List[CaseOut])
+    rows = [{"id": c.id, "title": c.title, "scenario": c.scenario, "summary": c.summary} for c in cases]
+    return adapter.dump_json(adapter.validate_python(rows))
+
+
+def bench(fn: Callable[[], bytes], repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=30, help="checklist/timeline/risk items each")
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    case, chunks, checklist, timeline, risks, cases = make_rows(args.chunks, args.items, args.cases)
+    assert json.loads(legacy_outputs(case, chunks, checklist, timeline, risks)) == json.loads(
+        current_outputs(case, chunks, checklist, timeline, risks)
+    )
+    assert json.loads(legacy_cases(cases)) == json.loads(current_cases(cases))
+
+    size = len(current_outputs(case, chunks, checklist, timeline, risks))
+    for name, old, new in (
+        (f"/cases/{{id}}/outputs ({args.chunks} chunks, {size / 1e6:.1f} MB)",
+         lambda: legacy_outputs(case, chunks, checklist, timeline, risks),
+         lambda: current_outputs(case, chunks, checklist, timeline, risks)),
+        (f"/cases ({args.cases} rows)", lambda: legacy_cases(cases), lambda: current_cases(cases)),
+    ):
+        t_old, t_new = bench(old, args.repeat), bench(new, args.repeat)
+        print(name)
+        print(f"  before: {t_old * 1e3:8.2f} ms  ({1 / t_old:8.1f} resp/s)")
+        print(f"  after:  {t_new * 1e3:8.2f} ms  ({1 / t_new:8.1f} resp/s)  {t_old / t_new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark concurrent uploads, analyses and reads against a SQLite file.
+
+``legacy`` is the previous setup: one engine, default pysqlite transactions, rollback
+journal, and an analysis that clears old outputs before reasoning (so it holds the write
+lock while it thinks). ``tuned`` is SQLite production mode (``app.db.sqlite``): WAL,
+pragmas, one serialized writer, a reader pool, and reasoning outside the write
+transaction. Extraction and reasoning are simulated with sleeps.
+
+Run from ``apps/api``::
+
+    python -m benchmarks.bench_sqlite_concurrency --workers 8 --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Base, Case, ChecklistItem, Chunk, Document
+from app.db.sqlite import create_sqlite_engines
+
+CHUNKS_PER_UPLOAD = 40
+
+
+def _new_chunks(case_id: str, doc_id: str) -> List[Chunk]:
+    return [
+        Chunk(id=str(uuid.uuid4()), case_id=case_id, document_id=doc_id, idx=i, text="lorem ipsum " * 40, page=1)
+        for i in range(CHUNKS_PER_UPLOAD)
+    ]
+
+
+def upload(writer: Engine, reader: Engine, case_id: str, work: float) -> None:
+    with Session(reader) as read_db:
+        assert read_db.get(Case, case_id) is not None
+    time.sleep(work)  # storage + extraction
+    doc_id = str(uuid.uuid4())
+    with Session(writer) as db:
+        db.add(Document(id=doc_id, case_id=case_id, filename="f.pdf", content_type="application/pdf", storage_key="k"))
+        db.add_all(_new_chunks(case_id, doc_id))
+        db.commit()
+
+
+def analyze_legacy(writer: Engine, reader: Engine, case_id: str, work: float) -> None:
+    with Session(writer) as db:
+        db.query(ChecklistItem).filter(ChecklistItem.case_id == case_id).delete()
+        db.query(Chunk.text).filter(Chunk.case_id == case_id).all()
+        time.sleep(work)  # reasoning, write lock held
+        db.add(ChecklistItem(id=str(uuid.uuid4()), case_id=case_id, label="x", status="todo"))
+        db.commit()
+
+
+def analyze_tuned(writer: Engine, reader: Engine, case_id: str, work: float) -> None:
+    with Session(reader) as read_db:
+        read_db.query(Chunk.text).filter(Chunk.case_id == case_id).all()
+    time.sleep(work)  # reasoning
+    with Session(writer) as db:
+        db.query(ChecklistItem).filter(ChecklistItem.case_id == case_id).delete()
+        db.add(ChecklistItem(id=str(uuid.uuid4()), case_id=case_id, label="x", status="todo"))
+        db.commit()
+
+
+def read(writer: Engine, reader: Engine, case_id: str, work: float) -> None:
+    with Session(reader) as db:
+        db.execute(select(func.count()).select_from(Chunk).where(Chunk.case_id == case_id)).scalar()
+        db.query(ChecklistItem).filter(ChecklistItem.case_id == case_id).all()
+
+
+def run(mode: str, workers: int, seconds: float, work: float) -> Dict[str, Tuple[int, int, List[float]]]:
+    tmp = tempfile.mkdtemp()
+    url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    if mode == "legacy":
+        writer = reader = create_engine(url, connect_args={"check_same_thread": False})
+        analyze = analyze_legacy
+    else:
+        writer, reader = create_sqlite_engines(url)
+        analyze = analyze_tuned
+    Base.metadata.create_all(bind=writer)
+    case_ids = [str(uuid.uuid4()) for _ in range(workers)]
+    with Session(writer) as db:
+        db.add_all(Case(id=cid, title="bench", scenario="study") for cid in case_ids)
+        db.commit()
+
+    ops: List[Tuple[str, Callable]] = [("upload", upload), ("analyze", analyze), ("read", read), ("read", read)]
+    results: Dict[str, List] = defaultdict(lambda: [0, 0, []])
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(n: int) -> None:
+        i = n
+        while time.perf_counter() < deadline:
+            name, fn = ops[i % len(ops)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                fn(writer, reader, case_ids[n], work)
+                ok = True
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                entry = results[name]
+                entry[0 if ok else 1] += 1
+                if ok:
+                    entry[2].append(elapsed)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.dispose()
+    reader.dispose()
+    return {k: tuple(v) for k, v in results.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--work-ms", type=float, default=50.0, help="simulated extraction/reasoning time")
+    args = parser.parse_args()
+
+    for mode in ("legacy", "tuned"):
+        results = run(mode, args.workers, args.seconds, args.work_ms / 1000)
+        print(mode)
+        for name in ("upload", "analyze", "read"):
+            ok, failed, latencies = results.get(name, (0, 0, []))
+            p50 = statistics.median(latencies) * 1e3 if latencies else 0.0
+            p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1e3 if latencies else 0.0
+            print(
+                f"  {name:8s} {ok / args.seconds:8.1f} ok/s  {failed:5d} failed"
+                f"  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
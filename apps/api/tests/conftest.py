@@ -10,7 +10,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.db.models import Base
-from app.main import app, get_db
+from app.main import app, get_db, get_read_db
+from app.services import previews
 
 
 # Use in-memory SQLite for tests
@@ -42,9 +43,12 @@ def db():
 
 
 @pytest.fixture(scope="function")
-def client():
+def client(monkeypatch):
     """Create a test client with overridden database."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Generate previews inline: a background thread would share the StaticPool connection.
+    monkeypatch.setattr(previews, "submit", previews.generate_previews)
     Base.metadata.create_all(bind=engine)
     
     with TestClient(app) as test_client:
@@ -0,0 +1,96 @@
+"""Test the analytics export."""
+import datetime as dt
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.analytics_export import TABLES, _PartitionedWriter, export_analytics
+
+from .conftest import engine
+
+
+def _read_jsonl(root: str, table: str):
+    rows = []
+    for dirpath, _, files in os.walk(os.path.join(root, table)):
+        for name in files:
+            with open(os.path.join(dirpath, name), encoding="utf-8") as f:
+                rows.extend((dirpath, json.loads(line)) for line in f)
+    return rows
+
+
+def test_export_jsonl_partitioned(client: TestClient, tmp_path):
+    """Test every table is written, partitioned by scenario and creation day."""
+    case_id = client.post("/demo/preset").json()["case_id"]
+    client.post("/cases", json={"title": "Study Permit", "scenario": "study"})
+
+    summary = export_analytics(engine, str(tmp_path), fmt="jsonl")
+    assert summary["cases"]["rows"] == 2
+    assert summary["cases"]["files"] == 2
+    assert summary["risks"]["rows"] == 2
+    assert summary["checklist"]["rows"] == 3
+
+    risks = _read_jsonl(str(tmp_path), "risks")
+    assert all("scenario=family_reunion" in d and os.path.basename(d).startswith("date=") for d, _ in risks)
+    assert {r["case_id"] for _, r in risks} == {case_id}
+
+    chunks = _read_jsonl(str(tmp_path), "chunks")
+    assert chunks and all(r["text"] for _, r in chunks)
+
+
+def test_export_parquet_matches_jsonl(client: TestClient, tmp_path):
+    """Test Parquet output holds the same rows with typed columns."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    client.post("/demo/preset")
+
+    summary = export_analytics(engine, str(tmp_path / "pq"), fmt="parquet", tables=["chunks", "cases"])
+    assert set(summary) == {"chunks", "cases"}
+
+    table = pq.read_table(str(tmp_path / "pq" / "chunks"))
+    assert table.num_rows == summary["chunks"]["rows"]
+    assert str(table.schema.field("idx").type) == "int64"
+    cases = pq.read_table(str(tmp_path / "pq" / "cases"))
+    assert str(cases.schema.field("created_at").type).startswith("timestamp")
+
+
+def test_reexport_replaces_previous_parts(client: TestClient, tmp_path):
+    """Test a re-run leaves no parts or partitions from the previous export behind."""
+    client.post("/demo/preset")
+    export_analytics(engine, str(tmp_path), fmt="jsonl", tables=["documents"])
+    (partition,) = [d for d, _, files in os.walk(tmp_path / "documents") if files]
+    open(os.path.join(partition, "part-00003.jsonl"), "w").close()
+    os.makedirs(tmp_path / "documents" / "scenario=gone" / "date=2020-01-01")
+
+    export_analytics(engine, str(tmp_path), fmt="jsonl", tables=["documents"])
+    assert os.listdir(partition) == ["part-00000.jsonl"]
+    assert not (tmp_path / "documents" / "scenario=gone").exists()
+
+    open(os.path.join(partition, "part-00003.jsonl"), "w").close()
+    export_analytics(engine, str(tmp_path), fmt="jsonl", tables=["documents"], since=dt.date(2000, 1, 1))
+    assert os.listdir(partition) == ["part-00000.jsonl"]
+
+
+def test_since_refused_for_tables_rewritten_in_place(tmp_path):
+    """Test an incremental export is refused for tables analysis rewrites."""
+    with pytest.raises(ValueError, match="risks"):
+        export_analytics(engine, str(tmp_path), fmt="jsonl", tables=["chunks", "risks"], since=dt.date(2024, 1, 1))
+    with pytest.raises(ValueError, match="cases"):
+        export_analytics(engine, str(tmp_path), fmt="jsonl", since=dt.date(2024, 1, 1))
+
+
+def test_parquet_buffer_is_bounded_across_partitions(tmp_path):
+    """Test buffered Parquet rows stay under the limit however many partitions are open."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    writer = _PartitionedWriter(str(tmp_path), TABLES["cases"], "parquet", max_buffered=5)
+    day = dt.datetime(2024, 1, 1)
+    for i in range(40):
+        writer.write(f"s{i % 4}", day, {"id": str(i), "created_at": day, "title": "t", "summary": "", "user_story": ""})
+        assert writer.buffered <= 5
+    writer.close()
+    assert pq.read_table(str(tmp_path / "cases")).num_rows == 40
+
+
+def test_export_rejects_unknown_table(tmp_path):
+    with pytest.raises(ValueError):
+        export_analytics(engine, str(tmp_path), fmt="jsonl", tables=["nope"])
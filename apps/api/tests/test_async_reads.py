@@ -0,0 +1,75 @@
+"""Test the async read endpoints against a SQLite file through aiosqlite."""
+import datetime as dt
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import Base, Case, ChecklistItem, Chunk, Document
+from app.services.pagination import NEXT_CURSOR_HEADER
+
+pytest.importorskip("aiosqlite")
+
+from app.db.async_session import async_url, create_read_engine, get_async_read_db  # noqa: E402
+from app.routers import cases_read  # noqa: E402
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    now = dt.datetime(2025, 1, 1)
+    with Session(sync_engine) as db:
+        for i in range(3):
+            db.add(Case(id=f"c{i}", title=f"Case {i}", scenario="study", created_at=now + dt.timedelta(minutes=i)))
+        db.add(Document(id="d1", case_id="c0", filename="passport.pdf", content_type="application/pdf", storage_key="k"))
+        db.add(Chunk(id="k1", case_id="c0", document_id="d1", idx=0, text="Passport valid until 2030", page=1))
+        db.add(ChecklistItem(id="i1", case_id="c0", label="Passport", status="done", evidence_chunk_ids="k1"))
+        db.commit()
+    sync_engine.dispose()
+
+    engine = create_read_engine(url, "t-async")
+
+    async def override():
+        async with AsyncSession(engine) as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(cases_read.router)
+    app.dependency_overrides[get_async_read_db] = override
+    with TestClient(app) as client:
+        yield client
+
+
+def test_async_url():
+    assert async_url("sqlite:////data/app.db") == "sqlite+aiosqlite:////data/app.db"
+    assert async_url("postgresql+psycopg://db/app") == "postgresql+psycopg://db/app"
+
+
+def test_async_case_and_outputs(async_client):
+    response = async_client.get("/cases/c0")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Case 0"
+    assert async_client.get("/cases/missing").status_code == 404
+
+    docs = async_client.get("/cases/c0/documents").json()
+    assert [d["filename"] for d in docs] == ["passport.pdf"]
+
+    outputs = async_client.get("/cases/c0/outputs").json()
+    assert outputs["checklist"][0]["evidence_chunk_ids"] == ["k1"]
+    assert outputs["chunks"]["k1"]["filename"] == "passport.pdf"
+
+
+def test_async_list_cases_pages(async_client):
+    first = async_client.get("/cases", params={"limit": 2})
+    assert [c["id"] for c in first.json()] == ["c2", "c1"]
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+
+    second = async_client.get("/cases", params={"limit": 2, "cursor": cursor})
+    assert [c["id"] for c in second.json()] == ["c0"]
+    assert NEXT_CURSOR_HEADER not in second.headers
+    assert async_client.get("/cases", params={"cursor": "garbage!"}).status_code == 400
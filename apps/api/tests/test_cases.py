@@ -111,3 +111,137 @@ def test_search_cases(client: TestClient):
     assert len(data) == 1
     assert "Family" in data[0]["title"]
 
+
+
+def test_list_cases_cursor_pagination(client: TestClient):
+    """Test paging through cases with the opaque cursor."""
+    created = [
+        client.post("/cases", json={"title": f"Case {i}", "scenario": "study"}).json()["id"]
+        for i in range(5)
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/cases", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(c["id"] for c in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert sorted(seen) == sorted(created)
+    assert len(seen) == len(set(seen))
+
+
+def test_list_cases_rejects_bad_cursor(client: TestClient):
+    """Test a malformed cursor is a client error."""
+    response = client.get("/cases", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_case_statistics_track_writes(client: TestClient):
+    """Test maintained counters agree with the grouped query across writes."""
+    from app.services.stats import compute_case_counts
+    from .conftest import TestingSessionLocal
+
+    case_id = client.post("/demo/preset").json()["case_id"]
+
+    data = client.get(f"/cases/{case_id}/statistics").json()
+    assert data["documents"] == 1
+    assert data["chunks"] >= 1
+    assert data["checklist_items"] == 3
+    assert data["timeline_items"] == 2
+    assert data["total_risks"] == 2
+    assert data["risk_breakdown"] == {"high": 0, "medium": 1, "low": 1}
+
+    with TestingSessionLocal() as db:
+        counts = compute_case_counts(db, case_id)
+    assert counts["chunks"] == data["chunks"]
+    assert counts["risks_medium"] == 1
+
+    doc_id = client.get(f"/cases/{case_id}/documents").json()[0]["id"]
+    assert client.delete(f"/documents/{doc_id}").status_code == 200
+    data = client.get(f"/cases/{case_id}/statistics").json()
+    assert data["documents"] == 0
+    assert data["chunks"] == 0
+
+
+
+def test_global_statistics_rollup(client: TestClient):
+    """Test /statistics serves the rollup and reflects writes after a refresh."""
+    from app.services.rollups import refresh_rollups
+    from .conftest import TestingSessionLocal
+
+    case_id = client.post("/demo/preset").json()["case_id"]
+    client.post("/cases", json={"title": "Study Permit", "scenario": "study"})
+
+    data = client.get("/statistics").json()
+    assert data["total_cases"] == 2
+    assert data["total_documents"] == 1
+    assert data["total_chunks"] >= 1
+    assert data["cases_by_scenario"] == {"family_reunion": 1, "study": 1}
+    assert data["as_of"]
+
+    # Served from the rollup until the next refresh.
+    client.delete(f"/cases/{case_id}")
+    assert client.get("/statistics").json()["total_cases"] == 2
+
+    with TestingSessionLocal() as db:
+        refresh_rollups(db, full=True)
+    data = client.get("/statistics").json()
+    assert data["total_cases"] == 1
+    assert data["total_documents"] == 0
+    assert data["cases_by_scenario"] == {"study": 1}
+
+    daily = client.get("/statistics/daily").json()
+    assert [d["scenario"] for d in daily["days"]] == ["study"]
+
+
+def test_export_case_streams_json_and_markdown(client: TestClient):
+    """Test the streamed export matches the documented JSON layout and report."""
+    import json
+
+    from app.services.export import export_case_json
+
+    case_id = client.post("/demo/preset").json()["case_id"]
+
+    response = client.get(f"/cases/{case_id}/export", params={"format": "json"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    data = json.loads(response.text)
+    assert list(data) == ["case", "checklist", "timeline", "risks", "chunks"]
+    assert data["case"]["id"] == case_id
+    assert len(data["checklist"]) == 3
+    assert all(c["text"] for c in data["chunks"].values())
+    # Same bytes as rendering the whole document at once.
+    assert response.text == export_case_json(data)
+
+    response = client.get(f"/cases/{case_id}/export", params={"format": "markdown"})
+    assert response.status_code == 200
+    assert response.text.startswith("# Family Reunion (Demo)")
+    assert response.text.count("### ") == 3 + 2 + 2
+
+    assert client.get("/cases/missing/export").status_code == 404
+
+
+def test_outputs_are_validated(client: TestClient):
+    """Test outputs go out through the OutputsOut schema, which rejects malformed rows."""
+    from pydantic import ValidationError
+
+    from app.schemas.case import OutputsOut
+    from app.utils.serialization import model_response
+
+    case_id = client.post("/demo/preset").json()["case_id"]
+    outputs = client.get(f"/cases/{case_id}/outputs").json()
+    assert OutputsOut.model_validate(outputs).case.id == case_id
+    assert "OutputsOut" in client.get("/openapi.json").json()["components"]["schemas"]
+
+    outputs["risks"][0]["severity"] = None
+    with pytest.raises(ValidationError):
+        model_response(OutputsOut, outputs)
@@ -0,0 +1,105 @@
+"""Test set-based case/document deletion and removal of stored files."""
+import io
+import uuid
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.db.models import Case, ChecklistItem, Chunk, Document
+from app.services import deletion
+from app.services.storage import LocalObjectStore
+from app.services.storage_gc import collect_garbage
+
+from .conftest import TestingSessionLocal, engine
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Purge inline against a temporary local store."""
+    store = LocalObjectStore(str(tmp_path))
+    monkeypatch.setattr(deletion, "schedule_purge", lambda keys, _store=None: deletion.purge_objects(keys, store))
+    return store
+
+
+def _seed_case(store, chunks: int, documents: int = 2) -> str:
+    case_id = str(uuid.uuid4())
+    with TestingSessionLocal() as db:
+        db.add(Case(id=case_id, title="Delete me", scenario="study"))
+        for d in range(documents):
+            body = f"%PDF-1.4 {case_id} {d}".encode()
+            stored = store.put(fileobj=io.BytesIO(body), filename="f.pdf", content_type="application/pdf")
+            doc_id = str(uuid.uuid4())
+            db.add(Document(id=doc_id, case_id=case_id, filename="f.pdf", storage_key=stored.key))
+            db.add_all(
+                Chunk(id=str(uuid.uuid4()), case_id=case_id, document_id=doc_id, idx=i, text=f"chunk {i}")
+                for i in range(chunks)
+            )
+        db.add(ChecklistItem(id=str(uuid.uuid4()), case_id=case_id, label="Passport"))
+        db.commit()
+    return case_id
+
+
+def _collect(store) -> None:
+    """Run the garbage collector, which removes content-addressed files deletes leave behind."""
+    with TestingSessionLocal() as db:
+        collect_garbage(db, store, dry_run=False, grace_seconds=0)
+
+
+def _count(model, **where) -> int:
+    with TestingSessionLocal() as db:
+        stmt = select(func.count()).select_from(model)
+        for col, value in where.items():
+            stmt = stmt.where(getattr(model, col) == value)
+        return db.scalar(stmt)
+
+
+def test_delete_case_removes_rows_and_files(client, store):
+    case_id = _seed_case(store, chunks=20)
+    keys = [p.relative_to(store.base).as_posix() for p in (store.base / "uploads").rglob("*") if p.is_file()]
+    assert len(keys) == 2
+
+    response = client.delete(f"/cases/{case_id}")
+    assert response.status_code == 200
+    assert _count(Case, id=case_id) == 0
+    assert _count(Document, case_id=case_id) == 0
+    assert _count(Chunk, case_id=case_id) == 0
+    assert _count(ChecklistItem, case_id=case_id) == 0
+    assert all((store.base / k).exists() for k in keys)
+    _collect(store)
+    assert not any((store.base / k).exists() for k in keys)
+
+    assert client.delete(f"/cases/{case_id}").status_code == 404
+
+
+def test_delete_case_statement_count_is_constant(client, store):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    small, large = _seed_case(store, chunks=5), _seed_case(store, chunks=500)
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        client.delete(f"/cases/{small}")
+        n_small = len(statements)
+        statements.clear()
+        client.delete(f"/cases/{large}")
+        n_large = len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert n_small == n_large
+
+
+def test_delete_document_updates_counts(client, store):
+    case_id = _seed_case(store, chunks=7, documents=2)
+    with TestingSessionLocal() as db:
+        doc = db.scalars(select(Document).where(Document.case_id == case_id)).first()
+        doc_id, key = doc.id, doc.storage_key
+
+    assert client.delete(f"/documents/{doc_id}").status_code == 200
+    assert _count(Chunk, document_id=doc_id) == 0
+    assert _count(Chunk, case_id=case_id) == 7
+    _collect(store)
+    assert not (store.base / key).exists()
+    assert client.get(f"/cases/{case_id}/statistics").json()["chunks"] == 7
+    assert client.delete(f"/documents/{doc_id}").status_code == 404
@@ -0,0 +1,66 @@
+"""Test range requests and conditional GET on local document downloads."""
+import hashlib
+
+import pytest
+
+from app.services.extract import ExtractResult, TextChunk
+from app.services.storage import LocalObjectStore
+from app.utils.file_responses import RangeNotSatisfiable, parse_range
+
+BODY = b"%PDF-1.4 " + bytes(range(256)) * 64
+
+
+@pytest.fixture
+def document(client, tmp_path, monkeypatch):
+    store = LocalObjectStore(str(tmp_path))
+    monkeypatch.setattr("app.main.get_store", lambda: store)
+    monkeypatch.setattr(
+        "app.main.extract_text",
+        lambda ct, data, **_: ExtractResult(chunks=[TextChunk(text="Passport", page=1, start=0, end=8)], page_count=1),
+    )
+    case_id = client.post("/cases", json={"title": "Viewer", "scenario": "study"}).json()["id"]
+    response = client.post(f"/cases/{case_id}/documents", files={"file": ("id.pdf", BODY, "application/pdf")})
+    return response.json()["document_id"]
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=100-", 100)
+
+
+def test_download_is_cacheable(client, document):
+    url = f"/documents/{document}/download"
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.content == BODY
+    assert full.headers["etag"] == f'"{hashlib.sha256(BODY).hexdigest()}"'
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["cache-control"].startswith("private, max-age=")
+
+    assert client.get(url, headers={"If-None-Match": full.headers["etag"]}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": full.headers["last-modified"]}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_download_ranges(client, document):
+    url = f"/documents/{document}/download"
+    part = client.get(url, headers={"Range": "bytes=10-19"})
+    assert part.status_code == 206
+    assert part.content == BODY[10:20]
+    assert part.headers["content-range"] == f"bytes 10-19/{len(BODY)}"
+
+    tail = client.get(url, headers={"Range": "bytes=-16"})
+    assert tail.status_code == 206 and tail.content == BODY[-16:]
+
+    unsatisfiable = client.get(url, headers={"Range": f"bytes={len(BODY)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(BODY)}"
+
+    stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200 and stale.content == BODY
@@ -0,0 +1,137 @@
+"""Test bulk export jobs."""
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import bulk_export
+from app.services.storage import LocalObjectStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Run export jobs inline against a temporary local store."""
+    store = LocalObjectStore(str(tmp_path))
+    monkeypatch.setattr(
+        bulk_export,
+        "submit",
+        lambda job_id, bind, _store=None, read_bind=None: bulk_export.run_export_job(job_id, bind, store, read_bind),
+    )
+    monkeypatch.setattr("app.main.get_store", lambda: store)
+    return store
+
+
+def _add_document(store, case_id: str, name: str, body: bytes) -> str:
+    from app.db.models import Document
+    from .conftest import TestingSessionLocal
+
+    stored = store.put(fileobj=io.BytesIO(body), filename=name, content_type="text/plain")
+    with TestingSessionLocal() as db:
+        doc = Document(id=f"doc-{name}", case_id=case_id, filename=name, content_type="text/plain", storage_key=stored.key)
+        db.add(doc)
+        db.commit()
+        return doc.id
+
+
+def test_bulk_export_zip(client: TestClient, store):
+    """Test a ZIP export holds every matching case and its documents."""
+    a = client.post("/cases", json={"title": "Visit A", "scenario": "family_reunion"}).json()["id"]
+    b = client.post("/cases", json={"title": "Visit B", "scenario": "family_reunion"}).json()["id"]
+    client.post("/cases", json={"title": "Other", "scenario": "study"})
+    doc_id = _add_document(store, a, "letter.txt", b"Invitation letter for a family visit.")
+
+    response = client.post("/exports", json={"format": "zip", "scenario": "family_reunion"})
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    job = client.get(f"/exports/{job_id}").json()
+    assert job["status"] == "succeeded"
+    assert job["case_count"] == 2
+    assert job["document_count"] == 1
+    assert job["download_url"] == f"/exports/{job_id}/download"
+
+    archive = client.get(job["download_url"])
+    assert archive.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(archive.content)) as zf:
+        names = set(zf.namelist())
+        assert f"cases/{a}/case.json" in names
+        assert f"cases/{b}/report.md" in names
+        assert zf.read(f"cases/{a}/documents/{doc_id}-letter.txt") == b"Invitation letter for a family visit."
+        assert json.loads(zf.read(f"cases/{a}/case.json"))["case"]["title"] == "Visit A"
+        assert json.loads(zf.read("manifest.json"))["cases"] == 2
+
+
+def test_bulk_export_jsonl_records_missing_documents(client: TestClient, store):
+    """Test a JSON Lines export writes one case per line and flags missing files."""
+    case_id = client.post("/demo/preset").json()["case_id"]
+
+    job_id = client.post("/exports", json={"format": "jsonl", "case_ids": [case_id]}).json()["id"]
+    job = client.get(f"/exports/{job_id}").json()
+    assert job["status"] == "succeeded"
+    assert "missing" in job["error"]
+
+    lines = client.get(f"/exports/{job_id}/download").content.splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record["case"]["id"] == case_id
+    assert record["documents"][0]["missing"] is True
+
+
+def test_export_not_ready(client: TestClient):
+    """Test unknown jobs are 404."""
+    assert client.get("/exports/missing").status_code == 404
+    assert client.get("/exports/missing/download").status_code == 404
+
+
+def test_job_row_is_read_from_primary(client: TestClient, store, tmp_path):
+    """Test a job succeeds when the replica has not caught up with its row yet."""
+    from sqlalchemy import create_engine
+
+    from app.db.models import Base, ExportJob
+    from .conftest import TestingSessionLocal, engine
+
+    lagging = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=lagging)
+    with TestingSessionLocal() as db:
+        db.add(ExportJob(id="job-lag", format="jsonl", include_documents=False, scenario="", case_ids=""))
+        db.commit()
+
+    bulk_export.run_export_job("job-lag", engine, store, read_bind=lagging)
+    assert client.get("/exports/job-lag").json()["status"] == "succeeded"
+    lagging.dispose()
+
+
+def test_jsonl_streams_document_contents(client: TestClient, store, monkeypatch):
+    """Test documents are base64-encoded slice by slice into a valid line."""
+    import base64
+
+    monkeypatch.setattr(bulk_export, "B64_CHUNK_BYTES", 1000)  # not a multiple of 3
+    case_id = client.post("/cases", json={"title": "Big", "scenario": "study"}).json()["id"]
+    body = bytes(range(256)) * 40 + b"tail"
+    _add_document(store, case_id, "scan.bin", body)
+
+    job_id = client.post("/exports", json={"format": "jsonl", "case_ids": [case_id]}).json()["id"]
+    (line,) = client.get(f"/exports/{job_id}/download").content.splitlines()
+    record = json.loads(line)
+    assert record["case"]["title"] == "Big"
+    assert base64.b64decode(record["documents"][0]["content_base64"]) == body
+
+
+def test_resume_interrupted_jobs(client: TestClient, store):
+    """Test startup requeues queued jobs and fails ones a restart cut short."""
+    from app.db.models import ExportJob
+    from .conftest import TestingSessionLocal, engine
+
+    with TestingSessionLocal() as db:
+        db.add(ExportJob(id="job-queued", format="jsonl", status="queued"))
+        db.add(ExportJob(id="job-running", format="zip", status="running"))
+        db.commit()
+
+    assert bulk_export.resume_interrupted_jobs(engine, store) == (1, 1)
+    assert client.get("/exports/job-queued").json()["status"] == "succeeded"
+    running = client.get("/exports/job-running").json()
+    assert running["status"] == "failed" and "restart" in running["error"]
+    bulk_export.run_export_job("job-queued", engine, store)  # already done: not run again
+    assert client.get("/exports/job-queued").json()["status"] == "succeeded"
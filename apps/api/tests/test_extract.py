@@ -0,0 +1,63 @@
+"""Test text chunking."""
+from app.services.extract import chunk_text, extract_text, iter_chunks
+
+
+def _document(pages):
+    return " ".join(" ".join(p.split()) for p in pages if p.strip())
+
+
+def test_chunks_respect_sentence_boundaries():
+    """Chunks end on sentence boundaries when sentences fit."""
+    text = " ".join(f"Sentence number {i} is here." for i in range(50))
+    chunks = list(iter_chunks([text], chunk_size=120, overlap=0))
+    assert len(chunks) > 1
+    for c in chunks:
+        assert len(c.text) <= 120
+        assert c.text.startswith("Sentence")
+        assert c.text.endswith(".")
+
+
+def test_offsets_and_pages_are_stable():
+    """Offsets index into the cleaned document and page numbers are kept."""
+    pages = [
+        "Passport  number P123.\nValid until 2030.",
+        "",
+        "Form I-797 approval notice.   Receipt WAC123.",
+    ]
+    doc = _document(pages)
+    chunks = list(iter_chunks(pages, chunk_size=30, overlap=10))
+    assert {c.page for c in chunks} == {1, 3}
+    for c in chunks:
+        assert doc[c.start:c.end] == c.text
+
+
+def test_overlap_repeats_trailing_sentence():
+    """Consecutive chunks share whole sentences up to the overlap budget."""
+    text = "Alpha one. Bravo two. Charlie three. Delta four."
+    assert chunk_text(text, chunk_size=25, overlap=12) == [
+        "Alpha one. Bravo two.",
+        "Bravo two. Charlie three.",
+        "Delta four.",
+    ]
+    assert chunk_text(text, chunk_size=25, overlap=0) == [
+        "Alpha one. Bravo two.",
+        "Charlie three.",
+        "Delta four.",
+    ]
+
+
+def test_long_sentence_split_on_words():
+    """A sentence longer than the chunk size is split between words."""
+    text = " ".join(["word"] * 100)
+    chunks = chunk_text(text, chunk_size=50, overlap=0)
+    assert all(len(c) <= 50 for c in chunks)
+    assert all(not c.startswith(" ") and not c.endswith(" ") for c in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_extract_text_fallback():
+    """Unknown content yields a single placeholder chunk."""
+    result = extract_text("application/octet-stream", b"")
+    assert result.page_count == 1
+    assert len(result.chunks) == 1
+    assert result.text_length == len(result.chunks[0].text)
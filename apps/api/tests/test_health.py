@@ -18,3 +18,13 @@ def test_health_returns_json(client: TestClient):
     response = client.get("/health")
     assert response.headers["content-type"] == "application/json"
 
+
+
+def test_metrics_exposes_pool(client: TestClient):
+    """Test /metrics renders pool metrics in Prometheus text format."""
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in response.text
+    assert 'db_pool_checkouts_total{pool="primary"}' in response.text
@@ -0,0 +1,69 @@
+"""Test the shared outbound HTTP client registry."""
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.attorneys import AttorneyService
+from app.services.http_clients import ERRORS, REQUEST_SECONDS, HttpClients
+from app.services.knowledge import KnowledgeService
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "api.github.com":
+        return httpx.Response(200, json=[{"sha": "abc123", "commit": {"author": {"date": "2024-01-01T00:00:00Z"}}}])
+    if request.url.host == "api.zippopotam.us":
+        return httpx.Response(200, json={"places": [{"place name": "Austin", "state abbreviation": "TX"}]})
+    if request.url.host == "down.example":
+        raise httpx.ConnectError("refused", request=request)
+    return httpx.Response(200, text=f"# {request.url.path}")
+
+
+def test_one_client_per_host():
+    async def scenario():
+        http = HttpClients(transport=httpx.MockTransport(_handler))
+        first = http.client("https://raw.githubusercontent.com/a.md")
+        assert http.client("https://raw.githubusercontent.com/b.md") is first
+        assert http.client("https://api.github.com/repos") is not first
+
+        before = REQUEST_SECONDS.count(host="raw.githubusercontent.com")
+        assert (await http.get("https://raw.githubusercontent.com/a.md")).text == "# /a.md"
+        assert REQUEST_SECONDS.count(host="raw.githubusercontent.com") == before + 1
+
+        errors = ERRORS.value(host="down.example", error="ConnectError")
+        try:
+            await http.get("https://down.example/")
+        except httpx.ConnectError:
+            pass
+        assert ERRORS.value(host="down.example", error="ConnectError") == errors + 1
+
+        await http.aclose()
+        assert first.is_closed
+        assert http.client("https://raw.githubusercontent.com/a.md") is not first
+        await http.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_knowledge_uses_injected_clients():
+    async def scenario():
+        http = HttpClients(transport=httpx.MockTransport(_handler))
+        content = await KnowledgeService(http=http).get_content("pooled-client-topic")
+        assert content.content == "# /t3nsor/us-immigration-faq/master/pooled-client-topic.md"
+        assert content.commit_sha == "abc123"
+        await http.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_attorney_search_uses_injected_clients(monkeypatch):
+    pytest.importorskip("google.generativeai")
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+
+    async def scenario():
+        http = HttpClients(transport=httpx.MockTransport(_handler))
+        search = await AttorneyService(http=http).search(zip_code="73301")
+        assert (search.location_city, search.location_state) == ("Austin", "TX")
+        await http.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,52 @@
+"""Test connection pool settings and instrumentation."""
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.db import pool
+
+
+def _engine(tmp_path, monkeypatch, name, **env):
+    for k, v in env.items():
+        monkeypatch.setenv(k, str(v))
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **pool.engine_options(url, name=name))
+    pool.instrument_engine(engine, name=name)
+    return engine
+
+
+def test_pool_settings_from_env(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch, "t-settings", DB_POOL_SIZE=3, DB_MAX_OVERFLOW=1, DB_PRE_PING="never")
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 1
+    assert engine.pool._pre_ping is False
+
+    monkeypatch.setenv("DB_PRE_PING", "sometimes")
+    with pytest.raises(ValueError):
+        pool.pool_settings()
+
+
+def test_pool_counts_checkouts_and_timeouts(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch, "t-timeout", DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT=0)
+    with engine.connect() as held:
+        held.execute(text("SELECT 1"))
+        assert pool.pool_status(engine, "t-timeout")["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    status = pool.pool_status(engine, "t-timeout")
+    assert status["checkouts"] == 1
+    assert status["timeouts"] == 1
+    assert status["checked_out"] == 0
+    assert pool.POOL_WAIT.count(pool="t-timeout") == 2
+
+
+def test_idle_pre_ping_replaces_dead_connection(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch, "t-ping", DB_PRE_PING="idle", DB_PRE_PING_IDLE_SECONDS=0)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        dbapi_conn = conn.connection.dbapi_connection
+    dbapi_conn.close()  # simulate the server dropping an idle connection
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+    assert pool.pool_status(engine, "t-ping")["connects"] == 2
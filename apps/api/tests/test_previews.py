@@ -0,0 +1,60 @@
+"""Test page thumbnail generation and the thumbnail endpoint."""
+import io
+
+import pytest
+
+from app.services import deletion
+from app.services.previews import THUMBNAIL_PX, PageImages
+from app.services.storage import LocalObjectStore
+from app.services.storage_gc import collect_garbage
+
+from .conftest import TestingSessionLocal
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _png(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(out, format="PNG")
+    return out.getvalue()
+
+
+def test_page_images_keeps_small_thumbnails():
+    original = Image.new("RGBA", (1700, 2200))
+    sink = PageImages(max_pages=1)
+    sink(1, original)
+    sink(2, original)
+
+    assert list(sink.thumbnails) == [1]
+    thumb = sink.thumbnails[1]
+    assert max(thumb.width, thumb.height) == THUMBNAIL_PX
+    assert Image.open(io.BytesIO(thumb.data)).format == "JPEG"
+    assert original.size == (1700, 2200)
+
+
+def test_thumbnail_endpoint(client, tmp_path, monkeypatch):
+    store = LocalObjectStore(str(tmp_path))
+    monkeypatch.setattr("app.main.get_store", lambda: store)
+    monkeypatch.setattr(deletion, "schedule_purge", lambda keys, _store=None: deletion.purge_objects(keys, store))
+    case_id = client.post("/cases", json={"title": "Scan", "scenario": "study"}).json()["id"]
+    upload = client.post(f"/cases/{case_id}/documents", files={"file": ("scan.png", _png(1200, 800), "image/png")})
+    doc_id = upload.json()["document_id"]
+
+    url = f"/documents/{doc_id}/pages/1/thumbnail"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["content-disposition"].startswith("inline")
+    assert Image.open(io.BytesIO(response.content)).size == (THUMBNAIL_PX, THUMBNAIL_PX * 2 // 3)
+    assert client.get(url, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+    assert client.get(f"/documents/{doc_id}/pages/2/thumbnail").status_code == 404
+
+    previews = [p for p in (tmp_path / "previews").rglob("*") if p.is_file()]
+    assert len(previews) == 1
+    client.delete(f"/documents/{doc_id}")
+    assert previews[0].exists()  # content-addressed: left to the garbage collector
+    with TestingSessionLocal() as db:
+        collect_garbage(db, store, dry_run=False, grace_seconds=0)
+    assert not previews[0].exists()
+    assert client.get(url).status_code == 404
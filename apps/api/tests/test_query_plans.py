@@ -0,0 +1,59 @@
+"""Query-plan regression tests: hot queries must use an index, not a table scan.
+
+Plans come from SQLite's ``EXPLAIN QUERY PLAN`` on the ORM statements the endpoints
+run. A step fails the test if it scans a table without an index or sorts in a temp
+B-tree (an ORDER BY the index should have delivered).
+"""
+import datetime as dt
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models import Base, Case, Chunk, Document
+from app.services.pagination import encode_cursor, keyset_window
+
+from .conftest import engine
+
+
+def query_plan(conn, stmt) -> list:
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def assert_indexed(conn, stmt, index: str) -> None:
+    plan = query_plan(conn, stmt)
+    bad = [step for step in plan if "TEMP B-TREE" in step or (step.startswith("SCAN") and "USING" not in step)]
+    assert not bad, f"unindexed plan: {plan}"
+    assert any(index in step for step in plan), f"{index} not used: {plan}"
+
+
+@pytest.fixture
+def conn():
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        yield conn
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_case_chunks_in_reading_order(conn):
+    stmt = select(Chunk).where(Chunk.case_id == "c1").order_by(Chunk.idx.asc())
+    assert_indexed(conn, stmt, "ix_api_chunks_case_id_idx")
+
+
+def test_case_documents_newest_first(conn):
+    stmt = select(Document).where(Document.case_id == "c1").order_by(Document.created_at.desc())
+    assert_indexed(conn, stmt, "ix_api_documents_case_id_created_at")
+
+
+def test_documents_sharing_a_storage_key(conn):
+    stmt = select(Document.storage_key).where(Document.storage_key.in_(["k1", "k2"])).distinct()
+    assert_indexed(conn, stmt, "ix_api_documents_storage_key")
+
+
+def test_case_listing_pages(conn):
+    first = keyset_window(select(Case), Case.created_at, Case.id, None, 50)
+    assert_indexed(conn, first, "ix_api_cases_created_at_id")
+    cursor = encode_cursor(dt.datetime(2025, 1, 1), "c1")
+    later = keyset_window(select(Case), Case.created_at, Case.id, cursor, 50)
+    assert_indexed(conn, later, "ix_api_cases_created_at_id")
+
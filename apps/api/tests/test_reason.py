@@ -0,0 +1,37 @@
+"""Test rule-based reasoning."""
+import sys
+import types
+
+import pytest
+
+from app.services.reason import _find_chunks, _norm, build_reasoning
+
+
+@pytest.fixture
+def no_llm(monkeypatch):
+    """Force the rule-based fallback."""
+    stub = types.SimpleNamespace(generate_case_plan_llm=lambda *args, **kwargs: None)
+    monkeypatch.setitem(sys.modules, "app.services.llm", stub)
+
+
+def test_norm_collapses_whitespace():
+    assert _norm("  Form\tI-797\n\nApproval  ") == "form i-797 approval"
+
+
+def test_find_chunks_on_normalized_views():
+    views = [_norm(c) for c in ["Passport P123", "Marriage  Certificate", "passport copy"]]
+    assert _find_chunks(views, ["PASSPORT"]) == [0, 2]
+    assert _find_chunks(views, ["marriage certificate"], max_hits=1) == [1]
+
+
+def test_build_reasoning_uses_chunks_and_story(no_llm):
+    chunks = ["Passport number P123, valid until 2030.", "Birth certificate of the child."]
+    rr = build_reasoning("family_reunion", chunks, user_story="My spouse and I are moving.")
+    labels = [c.label for c in rr.checklist]
+    assert "Prepare a short family context statement" in labels
+    # Story mentions a spouse, documents lack a marriage certificate
+    assert any(r.statement == "Marriage Certificate missing" for r in rr.risks)
+    # Birth certificate found in chunks, so no relationship-proof risk
+    assert not any(r.statement.startswith("Relationship proof") for r in rr.risks)
+    identity = next(c for c in rr.checklist if c.label.startswith("Collect identity"))
+    assert identity.evidence_idx == [0]
@@ -0,0 +1,112 @@
+"""Test read-replica routing and read-your-writes pinning."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db import routing
+from app.db.models import Base, Case, Document, ExportJob
+
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replicas = [create_engine(f"sqlite:///{tmp_path / f'replica{i}.db'}") for i in (1, 2)]
+    Base.metadata.create_all(bind=primary)
+    pins = routing.CasePins()
+    monkeypatch.setattr(routing, "PINS", pins)
+    yield routing.ReadRouter(primary, replicas, pins=pins, sticky_seconds=routing.STICKY_SECONDS)
+    for engine in [primary, *replicas]:
+        engine.dispose()
+
+
+def test_reads_round_robin_across_replicas(router):
+    picked = [router.engine_for() for _ in range(4)]
+    assert picked == [router.replicas[0], router.replicas[1], router.replicas[0], router.replicas[1]]
+    assert router.engine_for("some-case") in router.replicas
+
+
+def test_no_replicas_reads_primary(router):
+    assert routing.ReadRouter(router.primary, []).engine_for() is router.primary
+
+
+def test_committed_writes_pin_case_to_primary(router, monkeypatch):
+    with Session(router.primary) as db:
+        db.add(Case(id="c1", title="Pinned", scenario="study"))
+        db.add(Document(id="d1", case_id="c1", filename="a.pdf", content_type="application/pdf", storage_key="k"))
+        db.commit()
+    assert router.engine_for("c1") is router.primary
+    assert router.engine_for("c2") in router.replicas
+
+    with Session(router.primary) as db:
+        routing.mark_case_written(db, "c2")
+        db.rollback()
+    assert router.engine_for("c2") in router.replicas
+
+    with Session(router.primary) as db:
+        routing.mark_case_written(db, "c2")
+        db.commit()
+    assert router.engine_for("c2") is router.primary
+
+    monkeypatch.setattr(routing.time, "monotonic", lambda: float("inf"))
+    assert router.engine_for("c1") in router.replicas
+
+
+def test_documents_and_export_jobs_pin_their_own_id(router):
+    with Session(router.primary) as db:
+        db.add(Case(id="c3", title="Pinned", scenario="study"))
+        db.add(Document(id="d3", case_id="c3", filename="a.pdf", content_type="application/pdf", storage_key="k3"))
+        db.add(ExportJob(id="j3", format="zip"))
+        db.commit()
+    assert router.engine_for("d3") is router.primary
+    assert router.engine_for("j3") is router.primary
+
+
+def test_routing_key():
+    assert routing.routing_key({"case_id": "c1"}, {}) == "c1"
+    assert routing.routing_key({"document_id": "d1", "page": "1"}, {}) == "d1"
+    assert routing.routing_key({"job_id": "j1"}, {}) == "j1"
+    assert routing.routing_key({}, {"case_id": "c2"}) == "c2"
+    assert routing.routing_key({}, {}) is None
+
+
+def test_writes_read_their_inputs_from_primary(client, tmp_path, monkeypatch):
+    """Test write endpoints ignore a replica that has not caught up with the case yet."""
+    import sys
+    import types
+
+    from app import main
+    from app.services.extract import ExtractResult, TextChunk
+    from app.services.storage import LocalObjectStore
+
+    lagging = create_engine(f"sqlite:///{tmp_path / 'lagging.db'}")
+    Base.metadata.create_all(bind=lagging)
+
+    def stale_read_db():
+        with Session(bind=lagging) as db:
+            yield db
+
+    store = LocalObjectStore(str(tmp_path / "store"))
+    seen = {}
+
+    def recording_reasoning(scenario, chunk_texts, **kwargs):
+        seen["chunks"] = chunk_texts
+        return build_reasoning(scenario, chunk_texts, **kwargs)
+
+    build_reasoning = main.build_reasoning
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_read_db, stale_read_db)
+    monkeypatch.setitem(sys.modules, "app.services.llm", types.SimpleNamespace(generate_case_plan_llm=lambda *a, **k: None))
+    monkeypatch.setattr(main, "build_reasoning", recording_reasoning)
+    monkeypatch.setattr(main, "get_store", lambda: store)
+    monkeypatch.setattr(
+        main,
+        "extract_text",
+        lambda ct, data, **_: ExtractResult(chunks=[TextChunk(text="Passport", page=1, start=0, end=8)], page_count=1),
+    )
+    case_id = client.post("/cases", json={"title": "Lag", "scenario": "study"}).json()["id"]
+    assert client.get(f"/cases/{case_id}").status_code == 404  # the replica lags
+
+    uploaded = client.post(f"/cases/{case_id}/documents", files={"file": ("id.pdf", b"%PDF", "application/pdf")})
+    assert uploaded.status_code == 201
+    assert client.post(f"/cases/{case_id}/analyze").status_code == 200
+    assert seen["chunks"] == ["Passport"]
+    lagging.dispose()
@@ -0,0 +1,87 @@
+"""Test full-text search over document contents."""
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.db.models import Chunk, Document
+
+from .conftest import TestingSessionLocal
+
+
+def _add_document(case_id: str, texts: list[str]) -> str:
+    db = TestingSessionLocal()
+    doc_id = str(uuid.uuid4())
+    db.add(Document(id=doc_id, case_id=case_id, filename="notice.pdf", content_type="application/pdf", storage_key="k"))
+    for idx, t in enumerate(texts):
+        db.add(Chunk(id=str(uuid.uuid4()), case_id=case_id, document_id=doc_id, idx=idx, text=t, page=idx + 1))
+    db.commit()
+    db.close()
+    return doc_id
+
+
+def test_search_documents_finds_chunk_text(client: TestClient):
+    """Searching inside documents returns case, document and highlighted snippet."""
+    case_id = client.post("/cases", json={"title": "H-1B Renewal", "scenario": "job_onboarding"}).json()["id"]
+    doc_id = _add_document(case_id, ["Employment letter from Acme.", "Form I-797 Approval Notice, receipt WAC123."])
+
+    response = client.get("/search/documents", params={"q": "I-797"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["has_more"] is False
+    assert len(data["results"]) == 1
+    hit = data["results"][0]
+    assert hit["case_id"] == case_id
+    assert hit["case_title"] == "H-1B Renewal"
+    assert hit["document_id"] == doc_id
+    assert hit["page"] == 2
+    assert "<mark>" in hit["snippet"]
+
+
+def test_search_documents_pagination_and_case_filter(client: TestClient):
+    """Results are paginated and can be restricted to one case."""
+    first = client.post("/cases", json={"title": "A", "scenario": "study"}).json()["id"]
+    second = client.post("/cases", json={"title": "B", "scenario": "study"}).json()["id"]
+    _add_document(first, [f"Passport copy {i}." for i in range(3)])
+    _add_document(second, ["Passport of the second applicant."])
+
+    page1 = client.get("/search/documents", params={"q": "passport", "page_size": 2}).json()
+    page2 = client.get("/search/documents", params={"q": "passport", "page_size": 2, "page": 2}).json()
+    assert page1["has_more"] is True
+    assert page2["has_more"] is False
+    ids = {h["chunk_id"] for h in page1["results"] + page2["results"]}
+    assert len(ids) == 4
+
+    only_second = client.get("/search/documents", params={"q": "passport", "case_id": second}).json()
+    assert [h["case_id"] for h in only_second["results"]] == [second]
+
+
+def test_search_documents_index_follows_deletes(client: TestClient):
+    """Deleting a case removes its chunks from the index."""
+    case_id = client.post("/cases", json={"title": "Temp", "scenario": "study"}).json()["id"]
+    _add_document(case_id, ["Transcript from the university."])
+    assert len(client.get("/search/documents", params={"q": "transcript"}).json()["results"]) == 1
+
+    client.delete(f"/cases/{case_id}")
+    assert client.get("/search/documents", params={"q": "transcript"}).json()["results"] == []
+
+
+def test_search_cases_tolerates_typos(client: TestClient):
+    """Case search matches partial and misspelled names, best match first."""
+    rivera = client.post("/cases", json={"title": "Rivera family visit", "scenario": "family_reunion"}).json()["id"]
+    client.post("/cases", json={"title": "Job Application", "scenario": "job_onboarding"})
+
+    for q in ["Rivera", "Rivra", "river"]:
+        data = client.get("/search", params={"q": q}).json()
+        assert [c["id"] for c in data][:1] == [rivera], q
+
+
+def test_search_cases_matches_document_filenames(client: TestClient):
+    """Filenames of uploaded documents lead back to their case."""
+    case_id = client.post("/cases", json={"title": "Untitled", "scenario": "study"}).json()["id"]
+    _add_document(case_id, ["Anything."])  # filename: notice.pdf
+    # Index stays current after writes made once it has been built
+    client.get("/search", params={"q": "warmup"})
+    other = client.post("/cases", json={"title": "Noticeboard move", "scenario": "relocation"}).json()["id"]
+
+    ids = [c["id"] for c in client.get("/search", params={"q": "notice"}).json()]
+    assert set(ids) == {case_id, other}
@@ -0,0 +1,66 @@
+"""Test SQLite production mode: pragmas, the serialized writer and read-only readers."""
+import threading
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.orm import Session
+
+from app.db.models import Base, Case
+from app.db.pool import primary_engine
+from app.db.sqlite import create_sqlite_engines, is_file_sqlite
+
+
+@pytest.fixture
+def engines(tmp_path):
+    writer, reader = create_sqlite_engines(f"sqlite:///{tmp_path / 'prod.db'}")
+    Base.metadata.create_all(bind=writer)
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+def test_is_file_sqlite():
+    assert is_file_sqlite("sqlite:////data/lifebridge.db")
+    assert not is_file_sqlite("sqlite://")
+    assert not is_file_sqlite("sqlite:///:memory:")
+    assert not is_file_sqlite("postgresql+psycopg://db/app")
+
+
+def test_pragmas_and_roles(engines):
+    writer, reader = engines
+    with writer.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+    assert writer.pool.size() == 1
+    assert primary_engine(reader) is writer
+
+    with reader.connect() as conn:
+        with pytest.raises(exc.OperationalError):
+            conn.execute(text("INSERT INTO api_cases (id, title, scenario) VALUES ('x', 'x', 'x')"))
+
+
+def test_concurrent_writes_are_serialized(engines):
+    writer, reader = engines
+    errors = []
+
+    def create(n: int) -> None:
+        try:
+            for i in range(10):
+                with Session(writer) as db:
+                    db.add(Case(id=f"{n}-{i}", title=f"Case {n}-{i}", scenario="study"))
+                    db.commit()
+                with Session(reader) as db:
+                    db.get(Case, f"{n}-{i}")
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=create, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with Session(reader) as db:
+        assert db.query(Case).count() == 80
@@ -0,0 +1,235 @@
+"""Test the object store: process-wide instance, layout, streamed and presigned uploads."""
+import datetime as dt
+import hashlib
+import io
+
+from app.db.models import Case, Document
+from app.services import deletion
+from app.services.extract import ExtractResult, TextChunk
+from app.services.storage import CONTENT_KEY, LocalObjectStore, PresignedUpload, get_store, reset_store
+from app.services.storage_gc import collect_garbage
+from app.services.storage_migrate import migrate_local_keys
+
+from .conftest import TestingSessionLocal
+
+
+def test_get_store_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("STORAGE_BASE_PATH", str(tmp_path))
+    reset_store()
+    try:
+        first = get_store()
+        assert get_store() is first
+        reset_store()
+        assert get_store() is not first
+    finally:
+        reset_store()
+
+
+def test_local_put_streams_from_current_position(tmp_path):
+    store = LocalObjectStore(str(tmp_path))
+    body = io.BytesIO(b"skip" + b"x" * (3 * 1024 * 1024))
+    body.seek(4)
+    stored = store.put(fileobj=body, filename="big.pdf", content_type="application/pdf")
+    with store.open(stored.key) as f:
+        assert f.read() == b"x" * (3 * 1024 * 1024)
+
+
+def test_upload_stores_spooled_file(client, tmp_path, monkeypatch):
+    store = LocalObjectStore(str(tmp_path))
+    monkeypatch.setattr("app.main.get_store", lambda: store)
+    seen = {}
+
+    def fake_extract(content_type, data, **_):
+        seen["data"] = data
+        return ExtractResult(chunks=[TextChunk(text="Passport", page=1, start=0, end=8)], page_count=1)
+
+    monkeypatch.setattr("app.main.extract_text", fake_extract)
+    case_id = client.post("/cases", json={"title": "Upload", "scenario": "study"}).json()["id"]
+    body = b"%PDF-1.4 " + bytes(range(256)) * 4096
+
+    response = client.post(
+        f"/cases/{case_id}/documents", files={"file": ("scan.pdf", body, "application/pdf")}
+    )
+    assert response.status_code == 201
+    assert seen["data"] == body
+    (path,) = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert path.read_bytes() == body
+
+
+class PresigningStore(LocalObjectStore):
+    """A local store that issues fake presigned URLs, standing in for S3."""
+
+    def presign_upload(self, key, content_type, expires_in=900):
+        return PresignedUpload(
+            url=f"https://storage.test/{key}?sig=put", headers={"Content-Type": content_type}, expires_in=expires_in
+        )
+
+    def get_download_url(self, key, filename=None, expires_in=900):
+        return f"https://storage.test/{key}?sig=get"
+
+
+def test_direct_upload_roundtrip(client, tmp_path, monkeypatch):
+    store = PresigningStore(str(tmp_path))
+    monkeypatch.setattr("app.main.get_store", lambda: store)
+    monkeypatch.setattr(
+        "app.main.extract_text",
+        lambda ct, data, **_: ExtractResult(chunks=[TextChunk(text=data.decode(), page=1, start=0, end=4)], page_count=1),
+    )
+    case_id = client.post("/cases", json={"title": "Direct", "scenario": "study"}).json()["id"]
+
+    issued = client.post(
+        f"/cases/{case_id}/documents/direct",
+        json={"filename": "id.pdf", "content_type": "application/pdf", "size": 4},
+    )
+    assert issued.status_code == 201
+    body = issued.json()
+    assert body["method"] == "PUT"
+    assert body["headers"] == {"Content-Type": "application/pdf"}
+    doc_id = body["document_id"]
+    key = body["upload_url"].split("storage.test/")[1].split("?")[0]
+
+    assert client.get(f"/cases/{case_id}/documents").json()[0]["status"] == "pending"
+    assert client.get(f"/cases/{case_id}/statistics").json()["documents"] == 0
+    assert client.get(f"/documents/{doc_id}/download", follow_redirects=False).status_code == 409
+    assert client.post(f"/documents/{doc_id}/complete").status_code == 409  # nothing uploaded yet
+
+    # The browser PUTs straight to storage.
+    path = store.base / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"Visa")
+
+    done = client.post(f"/documents/{doc_id}/complete")
+    assert done.status_code == 200
+    assert done.json()["chunks"] == 1
+    assert client.post(f"/documents/{doc_id}/complete").status_code == 409
+    assert client.get(f"/cases/{case_id}/documents").json()[0]["status"] == "ready"
+    assert client.get(f"/cases/{case_id}/statistics").json()["documents"] == 1
+    assert client.get(f"/cases/{case_id}/statistics").json()["chunks"] == 1
+
+    download = client.get(f"/documents/{doc_id}/download", follow_redirects=False)
+    assert download.status_code == 307
+    assert download.headers["location"] == f"https://storage.test/{key}?sig=get"
+
+
+def test_failed_direct_upload_stays_pending_and_expires(client, tmp_path, monkeypatch):
+    store = PresigningStore(str(tmp_path))
+    monkeypatch.setattr("app.main.get_store", lambda: store)
+
+    def broken_extract(content_type, data, **_):
+        raise ValueError("corrupt PDF")
+
+    monkeypatch.setattr("app.main.extract_text", broken_extract)
+    case_id = client.post("/cases", json={"title": "Direct", "scenario": "study"}).json()["id"]
+    issued = client.post(
+        f"/cases/{case_id}/documents/direct",
+        json={"filename": "id.pdf", "content_type": "application/pdf", "size": 4},
+    ).json()
+    key = issued["upload_url"].split("storage.test/")[1].split("?")[0]
+    path = store.base / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"Visa")
+
+    failed = client.post(f"/documents/{issued['document_id']}/complete")
+    assert failed.status_code == 500
+    assert failed.json()["detail"] == "Failed to process document. Please try again."
+    assert client.get(f"/cases/{case_id}/documents").json()[0]["status"] == "pending"
+
+    with TestingSessionLocal() as db:
+        assert deletion.expire_pending_documents(db, older_than=3600) == []
+        gc = {"dry_run": False, "grace_seconds": 3600, "pending_ttl_seconds": 3600}
+        assert collect_garbage(db, store, **gc).expired == 0
+        db.get(Document, issued["document_id"]).created_at -= dt.timedelta(hours=2)
+        db.commit()
+        assert collect_garbage(db, store, **gc).expired == 1
+    assert client.get(f"/cases/{case_id}/documents").json() == []
+    assert not path.exists()
+    assert client.get(f"/cases/{case_id}/statistics").json()["documents"] == 0
+
+
+def test_direct_upload_needs_presigning_store(client, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.main.get_store", lambda: LocalObjectStore(str(tmp_path)))
+    case_id = client.post("/cases", json={"title": "Direct", "scenario": "study"}).json()["id"]
+    payload = {"filename": "id.pdf", "content_type": "application/pdf", "size": 4}
+    assert client.post(f"/cases/{case_id}/documents/direct", json=payload).status_code == 501
+    too_big = dict(payload, size=50 * 1024 * 1024)
+    assert client.post(f"/cases/{case_id}/documents/direct", json=too_big).status_code == 413
+
+
+def test_local_store_is_content_addressed(tmp_path):
+    store = LocalObjectStore(str(tmp_path), fsync="always")
+    body = b"%PDF-1.4 passport"
+    digest = hashlib.sha256(body).hexdigest()
+
+    first = store.put(fileobj=io.BytesIO(body), filename="a.pdf", content_type="application/pdf")
+    second = store.put(fileobj=io.BytesIO(body), filename="b.pdf", content_type="application/pdf")
+    assert first.key == second.key == f"uploads/{digest[:2]}/{digest[2:4]}/{digest}"
+    assert first.sha256 == digest
+    assert (tmp_path / first.key).read_bytes() == body
+    assert list((tmp_path / LocalObjectStore.TMP_DIR).iterdir()) == []
+
+
+def test_shared_object_survives_until_last_document(client, tmp_path, monkeypatch):
+    store = LocalObjectStore(str(tmp_path))
+    monkeypatch.setattr("app.main.get_store", lambda: store)
+    monkeypatch.setattr(deletion, "schedule_purge", lambda keys, _store=None: deletion.purge_objects(keys, store))
+    monkeypatch.setattr(
+        "app.main.extract_text",
+        lambda ct, data, **_: ExtractResult(chunks=[TextChunk(text="Passport", page=1, start=0, end=8)], page_count=1),
+    )
+    case_id = client.post("/cases", json={"title": "Dedupe", "scenario": "study"}).json()["id"]
+    upload = {"file": ("id.pdf", b"%PDF-1.4 same", "application/pdf")}
+    first = client.post(f"/cases/{case_id}/documents", files=upload).json()["document_id"]
+    second = client.post(f"/cases/{case_id}/documents", files=upload).json()["document_id"]
+    (path,) = [p for p in (tmp_path / "uploads").rglob("*") if p.is_file()]
+
+    client.delete(f"/documents/{first}")
+    assert path.exists()
+    client.delete(f"/documents/{second}")
+    assert path.exists()  # left to the garbage collector
+    with TestingSessionLocal() as db:
+        collect_garbage(db, store, dry_run=False, grace_seconds=0)
+    assert not path.exists()
+
+
+def test_reupload_between_delete_and_purge_keeps_file(client, tmp_path, monkeypatch):
+    store = LocalObjectStore(str(tmp_path))
+    scheduled = []
+    monkeypatch.setattr("app.main.get_store", lambda: store)
+    monkeypatch.setattr(deletion, "schedule_purge", lambda keys, _store=None: scheduled.extend(keys))
+    monkeypatch.setattr(
+        "app.main.extract_text",
+        lambda ct, data, **_: ExtractResult(chunks=[TextChunk(text="Visa", page=1, start=0, end=4)], page_count=1),
+    )
+    case_id = client.post("/cases", json={"title": "Race", "scenario": "study"}).json()["id"]
+    upload = {"file": ("visa.pdf", b"%PDF-1.4 race", "application/pdf")}
+    first = client.post(f"/cases/{case_id}/documents", files=upload).json()["document_id"]
+    client.delete(f"/documents/{first}")
+    second = client.post(f"/cases/{case_id}/documents", files=upload).json()["document_id"]
+
+    deletion.purge_objects(scheduled, store)  # the purge thread runs late
+    assert client.get(f"/documents/{second}/download").status_code == 200
+
+
+def test_migrate_legacy_keys(client, tmp_path):
+    store = LocalObjectStore(str(tmp_path))
+    legacy = tmp_path / "uploads" / "1b4e28ba-2fa1-41d2-883f-0016d3cca427.pdf"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_bytes(b"%PDF-1.4 old")
+    with TestingSessionLocal() as db:
+        db.add(Case(id="c-migrate", title="Old", scenario="study"))
+        db.add(Document(id="d-old", case_id="c-migrate", filename="old.pdf", storage_key="uploads/" + legacy.name))
+        db.add(Document(id="d-gone", case_id="c-migrate", filename="gone.pdf", storage_key="uploads/missing.pdf"))
+        db.commit()
+
+        assert migrate_local_keys(db, store, dry_run=True).migrated == 1
+        assert legacy.exists()
+
+        report = migrate_local_keys(db, store)
+        assert (report.migrated, report.missing, report.removed) == (1, 1, 1)
+        doc = db.get(Document, "d-old")
+        assert CONTENT_KEY.match(doc.storage_key)
+        assert doc.sha256 == hashlib.sha256(b"%PDF-1.4 old").hexdigest()
+        with store.open(doc.storage_key) as f:
+            assert f.read() == b"%PDF-1.4 old"
+        assert not legacy.exists()
+        assert migrate_local_keys(db, store).migrated == 0
@@ -0,0 +1,93 @@
+"""Test the storage garbage collector against a temporary local store."""
+import io
+import os
+import time
+import uuid
+
+import pytest
+
+from app.db.models import Case, Document
+from app.services.storage import LocalObjectStore
+from app.services.storage_gc import BloomFilter, collect_garbage
+
+from .conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalObjectStore(str(tmp_path))
+
+
+def _put(store, age_seconds: float = 0) -> str:
+    body = f"%PDF-1.4 {uuid.uuid4()}".encode()
+    key = store.put(fileobj=io.BytesIO(body), filename="f.pdf", content_type="application/pdf").key
+    if age_seconds:
+        then = time.time() - age_seconds
+        os.utime(store.get_file_path(key), (then, then))
+    return key
+
+
+def _seed(store):
+    """Two referenced objects, two old orphans and one fresh orphan."""
+    referenced = [_put(store, age_seconds=7200) for _ in range(2)]
+    orphans = [_put(store, age_seconds=7200) for _ in range(2)]
+    fresh = _put(store)
+    with TestingSessionLocal() as db:
+        case_id = str(uuid.uuid4())
+        db.add(Case(id=case_id, title="GC", scenario="study"))
+        db.add_all(Document(id=str(uuid.uuid4()), case_id=case_id, filename="f.pdf", storage_key=k) for k in referenced)
+        db.commit()
+    return referenced, orphans, fresh
+
+
+@pytest.mark.parametrize("exact_max", [1_000_000, 0])
+def test_collect_garbage_deletes_old_orphans(client, store, exact_max):
+    referenced, orphans, fresh = _seed(store)
+    exists = lambda k: os.path.exists(store.get_file_path(k))  # noqa: E731
+
+    with TestingSessionLocal() as db:
+        dry = collect_garbage(db, store, dry_run=True, grace_seconds=3600, page_size=2, exact_max=exact_max)
+    assert (dry.scanned, dry.too_recent, dry.orphans, dry.deleted) == (5, 1, 2, 0)
+    assert dry.exact is (exact_max > 0)
+    assert all(exists(k) for k in orphans)
+
+    with TestingSessionLocal() as db:
+        report = collect_garbage(db, store, dry_run=False, grace_seconds=3600, page_size=2, exact_max=exact_max)
+    assert sorted(report.sample) == sorted(orphans)
+    assert report.deleted == 2 and report.failed == 0
+    assert not any(exists(k) for k in orphans)
+    assert all(exists(k) for k in referenced + [fresh])
+
+
+def test_keys_reused_after_listing_are_kept(client, store):
+    """Test an orphan re-uploaded or referenced between the listing and its batch's delete survives."""
+    rewritten, referenced, orphan = (_put(store, age_seconds=7200) for _ in range(3))
+
+    class ReusingStore(type(store)):
+        def list_objects(self, prefix="uploads", page_size=1000):
+            yield from super().list_objects(prefix, page_size)
+            # After the listing, before the final batch is deleted:
+            os.utime(self.get_file_path(rewritten))  # an identical upload replaced the file
+            with TestingSessionLocal() as db:
+                case_id = str(uuid.uuid4())
+                db.add(Case(id=case_id, title="GC", scenario="study"))
+                db.add(Document(id=str(uuid.uuid4()), case_id=case_id, filename="f.pdf", storage_key=referenced))
+                db.commit()
+
+    reusing = ReusingStore(str(store.base))
+    with TestingSessionLocal() as db:
+        report = collect_garbage(db, reusing, dry_run=False, grace_seconds=3600, prefixes=["uploads"])
+    assert (report.orphans, report.reused, report.deleted) == (3, 2, 1)
+    assert os.path.exists(store.get_file_path(rewritten))
+    assert os.path.exists(store.get_file_path(referenced))
+    assert not os.path.exists(store.get_file_path(orphan))
+
+
+def test_bloom_filter_has_no_false_negatives():
+    keys = [f"uploads/{uuid.uuid4()}.pdf" for _ in range(5000)]
+    bloom = BloomFilter(len(keys), error_rate=0.01)
+    for k in keys:
+        bloom.add(k)
+    assert all(k in bloom for k in keys)
+    false_positives = sum(f"uploads/{uuid.uuid4()}.pdf" in bloom for _ in range(5000))
+    assert false_positives < 150
@@ -0,0 +1,109 @@
+"""Test the stale-while-revalidate cache and the knowledge base's use of it."""
+import asyncio
+
+import httpx
+
+from app.services.http_clients import HttpClients
+from app.services.knowledge import KnowledgeService
+from app.services.swr_cache import SWRCache
+
+
+class Upstream:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.calls = []
+        self.delay = delay
+        self.fail = fail
+
+    async def fetch(self, previous):
+        self.calls.append(previous)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"version": len(self.calls)}
+
+
+def test_concurrent_misses_share_one_fetch():
+    async def scenario():
+        cache = SWRCache("test", ttl=60)
+        upstream = Upstream(delay=0.01)
+        values = await asyncio.gather(*(cache.get("h1b", upstream.fetch) for _ in range(20)))
+        assert values == [{"version": 1}] * 20
+        assert len(upstream.calls) == 1
+        assert await cache.get("h1b", upstream.fetch) == {"version": 1}
+        assert len(upstream.calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_stale_value_served_while_refreshing():
+    async def scenario():
+        cache = SWRCache("test", ttl=60, stale_ttl=600)
+        upstream = Upstream()
+        await cache.get("h1b", upstream.fetch)
+        cache.peek("h1b").fetched_at -= 120
+
+        assert await cache.get("h1b", upstream.fetch) == {"version": 1}
+        await asyncio.sleep(0.01)
+        assert upstream.calls[-1] == {"version": 1}  # revalidates against the stale value
+        assert await cache.get("h1b", upstream.fetch) == {"version": 2}
+
+        cache.peek("h1b").fetched_at -= 120
+        upstream.fail = True
+        assert await cache.get("h1b", upstream.fetch) == {"version": 2}
+        await asyncio.sleep(0.01)
+        assert await cache.get("h1b", upstream.fetch) == {"version": 2}
+
+        cache.peek("h1b").fetched_at -= 10_000
+        upstream.fail = False
+        assert await cache.get("h1b", upstream.fetch) == {"version": 4}
+
+    asyncio.run(scenario())
+
+
+def test_lru_bound_and_persistence(tmp_path):
+    path = str(tmp_path / "cache" / "knowledge.json")
+
+    async def scenario():
+        cache = SWRCache("test", max_entries=2, path=path)
+        upstream = Upstream()
+        for key in ("a", "b", "a", "c"):
+            await cache.get(key, upstream.fetch)
+        assert len(cache) == 2 and cache.peek("b") is None
+
+        restarted = SWRCache("test", max_entries=2, path=path)
+        cold = Upstream()
+        assert await restarted.get("a", cold.fetch) == {"version": 1}
+        assert await restarted.get("c", cold.fetch) == {"version": 3}
+        assert cold.calls == []
+
+    asyncio.run(scenario())
+
+
+def test_knowledge_revalidates_with_etags():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.host == "api.github.com":
+            if request.headers.get("if-none-match") == '"c1"':
+                return httpx.Response(304)
+            commit = {"sha": "abc123", "commit": {"author": {"date": "2024-01-01T00:00:00Z"}}}
+            return httpx.Response(200, json=[commit], headers={"ETag": '"c1"'})
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="# H-1B", headers={"ETag": '"v1"'})
+
+    async def scenario():
+        http = HttpClients(transport=httpx.MockTransport(handler))
+        service = KnowledgeService(http=http, cache=SWRCache("test", ttl=60))
+        first = await service.get_content("h1b")
+        assert (first.content, first.commit_sha) == ("# H-1B", "abc123")
+        assert len(requests) == 2
+
+        service.cache.peek("h1b").fetched_at -= 120_000  # past the stale window: revalidate inline
+        second = await service.get_content("h1b")
+        assert (second.content, second.commit_sha) == ("# H-1B", "abc123")
+        assert [r.headers.get("if-none-match") for r in requests[2:]] in (['"v1"', '"c1"'], ['"c1"', '"v1"'])
+        await http.aclose()
+
+    asyncio.run(scenario())
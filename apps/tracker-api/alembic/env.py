@@ -0,0 +1,53 @@
+"""Alembic environment for the tracker API.
+
+Tables are created by ``init_db()`` on startup; migrations carry the changes that
+``create_all`` cannot apply to an existing database (new indexes, altered columns).
+"""
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.models import Base, engine
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Programmatic use (tests): run on the caller's connection.
+        _run_with(connection)
+        return
+
+    with engine.connect() as connection:
+        _run_with(connection)
+
+
+def _run_with(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,40 @@
+"""Composite indexes on case_events
+
+* ``(case_id, event_date)`` - ``GET /v1/cases/{id}/events``, newest first.
+* ``(case_id, title, event_date)`` - the duplicate check before recording a status
+  change from a USCIS refresh.
+
+On PostgreSQL the indexes are built ``CONCURRENTLY`` so writes continue meanwhile.
+
+Revision ID: 0001_case_event_indexes
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_case_event_indexes"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_case_events_case_id_event_date", ["case_id", "event_date"]),
+    ("ix_case_events_case_id_title_event_date", ["case_id", "title", "event_date"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, "case_events", columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _columns in INDEXES:
+            op.drop_index(name, table_name="case_events", if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,166 @@
+"""Database pool settings and pool metrics.
+
+Settings (defaults in parentheses): ``DB_POOL_SIZE`` (10), ``DB_MAX_OVERFLOW`` (20),
+``DB_POOL_TIMEOUT`` (30), ``DB_POOL_RECYCLE`` (300), ``DB_PRE_PING`` (``always`` |
+``idle`` | ``never``; default ``always``), ``DB_PRE_PING_IDLE_SECONDS`` (30) and
+``DB_STATEMENT_TIMEOUT_MS`` (PostgreSQL only; 0 disables).
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+
+def _env_int(name, default):
+    raw = os.getenv(name, "").strip()
+    return int(raw) if raw else default
+
+
+def pool_settings():
+    strategy = os.getenv("DB_PRE_PING", "always").strip().lower() or "always"
+    if strategy not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DB_PRE_PING must be one of {PRE_PING_STRATEGIES}, got {strategy!r}")
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 10),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 20),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 300),
+        "pre_ping": strategy,
+        "pre_ping_idle_seconds": float(os.getenv("DB_PRE_PING_IDLE_SECONDS", "30")),
+        "statement_timeout_ms": _env_int("DB_STATEMENT_TIMEOUT_MS", 0),
+    }
+
+
+class PoolStats:
+    """Cumulative checkout counters and wait time for one engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def incr(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+STATS = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            STATS.record_wait(time.perf_counter() - start, timed_out)
+
+
+def engine_kwargs(url):
+    """``create_engine`` keyword arguments for ``url``."""
+    settings = pool_settings()
+    kwargs = {"pool_pre_ping": settings["pre_ping"] == "always"}
+    if url and url.startswith("sqlite") and ":memory:" in url:
+        return kwargs
+    kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings["pool_size"],
+        max_overflow=settings["max_overflow"],
+        pool_timeout=settings["pool_timeout"],
+        pool_recycle=settings["pool_recycle"],
+    )
+    return kwargs
+
+
+def statement_timeout_options():
+    """libpq ``options`` for the statement timeout, or None."""
+    ms = pool_settings()["statement_timeout_ms"]
+    return f"-c statement_timeout={ms}" if ms > 0 else None
+
+
+def instrument_engine(engine):
+    settings = pool_settings()
+    idle_limit = settings["pre_ping_idle_seconds"]
+    ping_idle = settings["pre_ping"] == "idle"
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        STATS.incr("connects")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        if record is not None:
+            record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exception):
+        STATS.incr("invalidations")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        STATS.incr("checkouts")
+        if not ping_idle:
+            return
+        since = record.info.get("checked_in_at")
+        if since is None or time.monotonic() - since < idle_limit:
+            return
+        try:
+            cursor = dbapi_conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as e:
+            # The pool discards this connection and retries with a fresh one.
+            raise exc.DisconnectionError() from e
+
+
+def pool_metrics(engine):
+    pool = engine.pool
+    occupancy = {}
+    for name in ("size", "checkedout", "checkedin", "overflow"):
+        fn = getattr(pool, name, None)
+        occupancy[name] = fn() if callable(fn) else None
+    return {
+        "size": occupancy["size"],
+        "checked_out": occupancy["checkedout"],
+        "checked_in": occupancy["checkedin"],
+        "overflow": occupancy["overflow"],
+        "checkouts": STATS.checkouts,
+        "connects": STATS.connects,
+        "invalidations": STATS.invalidations,
+        "timeouts": STATS.timeouts,
+        "wait_seconds_total": round(STATS.wait_seconds_total, 6),
+        "wait_seconds_max": round(STATS.wait_seconds_max, 6),
+    }
+
+
+def render_prometheus(metrics):
+    lines = []
+    for key, value in metrics.items():
+        if value is None:
+            continue
+        name = f"tracker_db_pool_{key}"
+        kind = "counter" if key in ("checkouts", "connects", "invalidations", "timeouts", "wait_seconds_total") else "gauge"
+        if kind == "counter" and not name.endswith("_total"):
+            name += "_total"
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
@@ -1,14 +1,16 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import date
 from .models import (
-    init_db, SessionLocal, TravelHistory, EmploymentHistory, ResidenceHistory,
+    init_db, engine, SessionLocal, TravelHistory, EmploymentHistory, ResidenceHistory,
     ImmigrationCase, CaseEvent, Task, Note, Contact, Document
 )
 from .services.uscis import get_uscis_service
+from .pagination import NEXT_CURSOR_HEADER, PageParams, paginate
+from .db_pool import pool_metrics, render_prometheus
 
 app = FastAPI(title="LifeBridge Tracker API", version="1.0.0")
 
@@ -19,6 +21,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Dependency
@@ -52,6 +55,14 @@ def read_root():
 def health_check():
     return {"status": "ok"}
 
+@app.get("/health/pool")
+def pool_health():
+    return pool_metrics(engine)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(render_prometheus(pool_metrics(engine)), media_type="text/plain; version=0.0.4")
+
 # History: Travel
 @app.post("/v1/history/travel")
 def add_travel(entry: TravelEntry, db: Session = Depends(get_db)):
@@ -63,8 +74,8 @@ def add_travel(entry: TravelEntry, db: Session = Depends(get_db)):
     return db_entry
 
 @app.get("/v1/history/travel")
-def get_travel(db: Session = Depends(get_db)):
-    return db.query(TravelHistory).all()
+def get_travel(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db.query(TravelHistory), TravelHistory.id, page, response)
 
 @app.delete("/v1/history/travel/{entry_id}")
 def delete_travel(entry_id: int, db: Session = Depends(get_db)):
@@ -100,8 +111,8 @@ def add_employment(entry: EmploymentEntry, db: Session = Depends(get_db)):
     return db_entry
 
 @app.get("/v1/history/employment")
-def get_employment(db: Session = Depends(get_db)):
-    return db.query(EmploymentHistory).all()
+def get_employment(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db.query(EmploymentHistory), EmploymentHistory.id, page, response)
 
 @app.delete("/v1/history/employment/{entry_id}")
 def delete_employment(entry_id: int, db: Session = Depends(get_db)):
@@ -122,8 +133,8 @@ def add_residence(entry: ResidenceEntry, db: Session = Depends(get_db)):
     return db_entry
 
 @app.get("/v1/history/residence")
-def get_residence(db: Session = Depends(get_db)):
-    return db.query(ResidenceHistory).all()
+def get_residence(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db.query(ResidenceHistory), ResidenceHistory.id, page, response)
 
 @app.delete("/v1/history/residence/{entry_id}")
 def delete_residence(entry_id: int, db: Session = Depends(get_db)):
@@ -145,8 +156,8 @@ class DocumentEntry(BaseModel):
 # --- Documents ---
 
 @app.get("/v1/documents")
-def get_documents(db: Session = Depends(get_db)):
-    return db.query(Document).all()
+def get_documents(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db.query(Document), Document.id, page, response)
 
 @app.post("/v1/documents")
 def add_document(entry: DocumentEntry, db: Session = Depends(get_db)):
@@ -192,8 +203,8 @@ class ContactEntry(BaseModel):
 from .models import Contact
 
 @app.get("/v1/contacts")
-def get_contacts(db: Session = Depends(get_db)):
-    return db.query(Contact).all()
+def get_contacts(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db.query(Contact), Contact.id, page, response)
 
 @app.post("/v1/contacts")
 def add_contact(entry: ContactEntry, db: Session = Depends(get_db)):
@@ -213,8 +224,8 @@ class NoteEntry(BaseModel):
 from .models import Note
 
 @app.get("/v1/notes")
-def get_notes(db: Session = Depends(get_db)):
-    return db.query(Note).all()
+def get_notes(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db.query(Note), Note.id, page, response)
 
 @app.post("/v1/notes")
 def add_note(entry: NoteEntry, db: Session = Depends(get_db)):
@@ -237,8 +248,8 @@ class TaskEntry(BaseModel):
 from .models import Task
 
 @app.get("/v1/tasks")
-def get_tasks(db: Session = Depends(get_db)):
-    return db.query(Task).all()
+def get_tasks(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db.query(Task), Task.id, page, response)
 
 @app.post("/v1/tasks")
 def add_task(entry: TaskEntry, db: Session = Depends(get_db)):
@@ -295,8 +306,8 @@ class CaseEventEntry(BaseModel):
 # --- Endpoints ---
 
 @app.get("/v1/cases")
-def get_cases(db: Session = Depends(get_db)):
-    return db.query(ImmigrationCase).all()
+def get_cases(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    return paginate(db.query(ImmigrationCase), ImmigrationCase.id, page, response)
 
 @app.get("/v1/cases/{case_id}")
 def get_case(case_id: int, db: Session = Depends(get_db)):
@@ -1,10 +1,12 @@
-from sqlalchemy import create_engine, Column, Integer, String, Date, Text, ForeignKey, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Date, Text, ForeignKey, Index, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 
 import sys
 
+from .db_pool import engine_kwargs, instrument_engine, statement_timeout_options
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 if not DATABASE_URL:
@@ -28,15 +30,16 @@ connect_args = {}
 if DATABASE_URL and DATABASE_URL.startswith("postgresql"):
     connect_args["prepare_threshold"] = None
     connect_args["connect_timeout"] = 10
+    if statement_timeout_options():
+        connect_args["options"] = statement_timeout_options()
 # Basic connect_args for other engines (none needed for sqlite)
+# Pool size/overflow/recycle/pre-ping come from DB_* settings (see db_pool.py)
 engine = create_engine(
     DATABASE_URL, 
     connect_args=connect_args,
-    pool_pre_ping=True,      # Check connection before using
-    pool_recycle=300,        # Recycle connections every 5 mins
-    pool_size=10,            # Sufficient pool size
-    max_overflow=20
+    **engine_kwargs(DATABASE_URL)
 )
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -127,6 +130,10 @@ class ImmigrationCase(Base):
 
 class CaseEvent(Base):
     __tablename__ = "case_events"
+    __table_args__ = (
+        Index("ix_case_events_case_id_event_date", "case_id", "event_date"),  # a case's history by date
+        Index("ix_case_events_case_id_title_event_date", "case_id", "title", "event_date"),  # duplicate checks
+    )
     id = Column(Integer, primary_key=True, index=True)
     case_id = Column(Integer, ForeignKey("cases.id"))
     event_date = Column(Date)
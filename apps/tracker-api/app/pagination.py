@@ -0,0 +1,52 @@
+"""Keyset pagination for tracker list endpoints.
+
+Rows are served in primary-key order and the next page starts after the last id
+served, so each page is a primary-key range scan regardless of depth. The cursor
+is opaque to clients and returned in the ``X-Next-Cursor`` header.
+"""
+import base64
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, _, value = raw.partition(":")
+        if prefix != "id":
+            raise ValueError(raw)
+        return int(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Malformed pagination cursor") from e
+
+
+class PageParams:
+    """Query parameters shared by paginated list endpoints."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def paginate(query, id_col, page: PageParams, response: Response):
+    """Apply keyset pagination on ``id_col`` and set the next-page header."""
+    if page.cursor:
+        query = query.filter(id_col > decode_cursor(page.cursor))
+    rows = query.order_by(id_col.asc()).limit(page.limit + 1).all()
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
+    return rows
@@ -48,3 +48,30 @@ def test_seed_demo_data(client):
     response = client.post("/v1/demo/seed")
     assert response.status_code == 200
     assert "case_id" in response.json()
+
+def test_list_pagination(client):
+    for i in range(5):
+        client.post("/v1/tasks", json={"title": f"Task {i}"})
+
+    first = client.get("/v1/tasks", params={"limit": 3})
+    assert first.status_code == 200
+    assert len(first.json()) == 3
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/v1/tasks", params={"limit": 3, "cursor": cursor})
+    assert len(second.json()) == 2
+    assert "X-Next-Cursor" not in second.headers
+    ids = [t["id"] for t in first.json() + second.json()]
+    assert ids == sorted(set(ids))
+
+    assert client.get("/v1/tasks", params={"cursor": "bogus"}).status_code == 400
+
+def test_pool_metrics(client):
+    client.get("/health")
+    response = client.get("/health/pool")
+    assert response.status_code == 200
+    assert {"size", "checked_out", "checkouts", "timeouts"} <= set(response.json())
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "tracker_db_pool_checkouts_total" in response.text
@@ -0,0 +1,62 @@
+"""Query-plan regression tests: hot case_events queries must use an index.
+
+A plan step fails the test if it scans a table without an index or sorts in a temp
+B-tree (an ORDER BY the index should have delivered).
+"""
+import os
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+
+from app.models import Base, CaseEvent
+
+TRACKER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def query_plan(conn, stmt):
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def assert_indexed(conn, stmt, index):
+    plan = query_plan(conn, stmt)
+    bad = [step for step in plan if "TEMP B-TREE" in step or (step.startswith("SCAN") and "USING" not in step)]
+    assert not bad, f"unindexed plan: {plan}"
+    assert any(index in step for step in plan), f"{index} not used: {plan}"
+
+
+def test_case_events_by_date(db_session):
+    stmt = select(CaseEvent).where(CaseEvent.case_id == 1).order_by(CaseEvent.event_date.desc())
+    assert_indexed(db_session.connection(), stmt, "ix_case_events_case_id_event_date")
+
+
+def test_case_event_duplicate_check(db_session):
+    stmt = select(CaseEvent).where(
+        CaseEvent.case_id == 1,
+        CaseEvent.title == "Case Was Approved",
+        CaseEvent.event_date == date(2025, 1, 1),
+    ).limit(1)
+    assert_indexed(db_session.connection(), stmt, "ix_case_events_case_id_title_event_date")
+
+
+def test_migration_adds_indexes(tmp_path):
+    pytest.importorskip("alembic")
+    from alembic import command
+    from alembic.config import Config
+
+    db = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    Base.metadata.create_all(bind=db)
+    with db.begin() as c:
+        c.exec_driver_sql("DROP INDEX ix_case_events_case_id_event_date")
+        c.exec_driver_sql("DROP INDEX ix_case_events_case_id_title_event_date")
+
+    config = Config(os.path.join(TRACKER_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(TRACKER_ROOT, "alembic"))
+    with db.connect() as c:
+        config.attributes["connection"] = c
+        command.upgrade(config, "head")
+
+    indexes = {i["name"] for i in inspect(db).get_indexes("case_events")}
+    assert {"ix_case_events_case_id_event_date", "ix_case_events_case_id_title_event_date"} <= indexes
+    db.dispose()
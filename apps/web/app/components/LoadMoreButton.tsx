@@ -0,0 +1,23 @@
+"use client";
+
+interface LoadMoreButtonProps {
+    hasMore: boolean;
+    loading: boolean;
+    onClick: () => void;
+}
+
+export default function LoadMoreButton({ hasMore, loading, onClick }: LoadMoreButtonProps) {
+    if (!hasMore) return null;
+    return (
+        <div className="flex justify-center pt-2">
+            <button
+                type="button"
+                onClick={onClick}
+                disabled={loading}
+                className="px-4 py-2 text-sm font-medium text-blue-600 bg-white border border-gray-200 rounded-lg hover:bg-blue-50 transition disabled:opacity-50"
+            >
+                {loading ? "Loading..." : "Load more"}
+            </button>
+        </div>
+    );
+}
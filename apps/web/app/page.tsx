@@ -22,7 +22,7 @@ function MyCasesList() {
 
   async function loadCases() {
     try {
-      const data = await trackerApi.getCases();
+      const data = (await trackerApi.getCases()).items;
       // Sort: User cases first, then newest
       const sorted = data.sort((a, b) => {
         const isDemoA = a.title.startsWith("Demo:");
@@ -4,6 +4,8 @@ import { useState, useEffect } from "react";
 import { Plus, Folder, Calendar, Clock, ChevronRight, Trash2 } from "lucide-react";
 import toast from "react-hot-toast";
 import { trackerApi, CaseEntry } from "@/features/tracker/api/client";
+import { useCursorPages } from "@/features/tracker/api/useCursorPages";
+import LoadMoreButton from "../../components/LoadMoreButton";
 import { useRouter } from "next/navigation";
 import Link from "next/link";
 
@@ -11,6 +13,7 @@ export default function CasesPage() {
     const router = useRouter();
     const [cases, setCases] = useState<CaseEntry[]>([]);
     const [loading, setLoading] = useState(true);
+    const pages = useCursorPages(trackerApi.getCases);
     const [isModalOpen, setIsModalOpen] = useState(false);
 
     const [newItem, setNewItem] = useState<CaseEntry>({
@@ -29,7 +32,7 @@ export default function CasesPage() {
     async function loadData() {
         try {
             setLoading(true);
-            const data = await trackerApi.getCases();
+            const data = await pages.first();
             setCases(data);
         } catch (error) {
             console.error(error);
@@ -38,6 +41,16 @@ export default function CasesPage() {
         }
     }
 
+    async function loadMore() {
+        try {
+            const more = await pages.more();
+            setCases(prev => [...prev, ...more]);
+        } catch (error) {
+            console.error(error);
+            toast.error("Failed to load cases");
+        }
+    }
+
     async function handleSave() {
         if (!newItem.title) return;
         try {
@@ -148,6 +161,7 @@ export default function CasesPage() {
                         ))}
                     </div>
                 )}
+                <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={loadMore} />
 
                 {/* Modal */}
                 {isModalOpen && (
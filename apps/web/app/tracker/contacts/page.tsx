@@ -4,6 +4,8 @@ import { useEffect, useState } from "react";
 import { motion } from "framer-motion";
 import { Save, User, Phone, Mail, MapPin } from "lucide-react";
 import { trackerApi, ContactEntry } from "@/features/tracker/api/client";
+import { useCursorPages } from "@/features/tracker/api/useCursorPages";
+import LoadMoreButton from "../../components/LoadMoreButton";
 import { useLanguage } from "../../contexts/LanguageContext";
 
 import toast from "react-hot-toast";
@@ -11,6 +13,7 @@ import toast from "react-hot-toast";
 export default function ContactsPage() {
     const [contacts, setContacts] = useState<ContactEntry[]>([]);
     const [loading, setLoading] = useState(true);
+    const pages = useCursorPages(trackerApi.getContacts);
     const { t } = useLanguage();
 
     const [name, setName] = useState("");
@@ -27,7 +30,7 @@ export default function ContactsPage() {
     const loadData = async () => {
         try {
             setLoading(true);
-            const data = await trackerApi.getContacts();
+            const data = await pages.first();
             setContacts(data);
         } catch (e) {
             console.error(e);
@@ -37,6 +40,16 @@ export default function ContactsPage() {
         }
     };
 
+    const loadMore = async () => {
+        try {
+            const more = await pages.more();
+            setContacts(prev => [...prev, ...more]);
+        } catch (e) {
+            console.error(e);
+            toast.error("Failed to load contacts");
+        }
+    };
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         try {
@@ -157,6 +170,7 @@ export default function ContactsPage() {
                             </motion.div>
                         ))
                     )}
+                    <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={loadMore} />
                 </div>
 
             </div>
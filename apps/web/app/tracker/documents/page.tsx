@@ -4,11 +4,14 @@ import { useEffect, useState } from "react";
 import { motion } from "framer-motion";
 import { Upload, FileText, Download } from "lucide-react";
 import { trackerApi, DocumentEntry } from "@/features/tracker/api/client";
+import { useCursorPages } from "@/features/tracker/api/useCursorPages";
+import LoadMoreButton from "../../components/LoadMoreButton";
 import toast from "react-hot-toast";
 
 export default function DocumentsPage() {
     const [docs, setDocs] = useState<DocumentEntry[]>([]);
     const [loading, setLoading] = useState(true);
+    const pages = useCursorPages(trackerApi.getDocuments);
 
     // Upload Form State
     const [file, setFile] = useState<File | null>(null);
@@ -22,7 +25,7 @@ export default function DocumentsPage() {
     const loadData = async () => {
         try {
             setLoading(true);
-            const data = await trackerApi.getDocuments();
+            const data = await pages.first();
             setDocs(data);
         } catch (e) {
             console.error(e);
@@ -32,6 +35,16 @@ export default function DocumentsPage() {
         }
     };
 
+    const loadMore = async () => {
+        try {
+            const more = await pages.more();
+            setDocs(prev => [...prev, ...more]);
+        } catch (e) {
+            console.error(e);
+            toast.error("Failed to load documents");
+        }
+    };
+
     const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
         if (e.target.files && e.target.files[0]) {
             setFile(e.target.files[0]);
@@ -146,6 +159,7 @@ export default function DocumentsPage() {
                             </motion.div>
                         ))
                     )}
+                    <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={loadMore} />
                 </div>
 
             </div>
@@ -4,12 +4,15 @@ import { useEffect, useState } from "react";
 import { motion } from "framer-motion";
 import { Save, Briefcase, Trash2 } from "lucide-react";
 import { trackerApi, EmploymentEntry } from "@/features/tracker/api/client";
+import { useCursorPages } from "@/features/tracker/api/useCursorPages";
+import LoadMoreButton from "../../../components/LoadMoreButton";
 
 import toast from "react-hot-toast";
 
 export default function EmploymentPage() {
     const [entries, setEntries] = useState<EmploymentEntry[]>([]);
     const [loading, setLoading] = useState(true);
+    const pages = useCursorPages(trackerApi.getEmploymentHistory);
 
     const [employer, setEmployer] = useState("");
     const [title, setTitle] = useState("");
@@ -26,7 +29,7 @@ export default function EmploymentPage() {
     const loadData = async () => {
         try {
             setLoading(true);
-            const data = await trackerApi.getEmploymentHistory();
+            const data = await pages.first();
             setEntries(data);
         } catch (e) {
             console.error(e);
@@ -36,6 +39,16 @@ export default function EmploymentPage() {
         }
     };
 
+    const loadMore = async () => {
+        try {
+            const more = await pages.more();
+            setEntries(prev => [...prev, ...more]);
+        } catch (e) {
+            console.error(e);
+            toast.error("Failed to load employment history");
+        }
+    };
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         try {
@@ -135,6 +148,7 @@ export default function EmploymentPage() {
                     </motion.div>
                 ))}
             </div>
+            <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={loadMore} />
         </div>
     );
 }
@@ -4,12 +4,15 @@ import { useEffect, useState } from "react";
 import { motion } from "framer-motion";
 import { Save, Home, Trash2 } from "lucide-react";
 import { trackerApi, ResidenceEntry } from "@/features/tracker/api/client";
+import { useCursorPages } from "@/features/tracker/api/useCursorPages";
+import LoadMoreButton from "../../../components/LoadMoreButton";
 
 import toast from "react-hot-toast";
 
 export default function ResidencePage() {
     const [entries, setEntries] = useState<ResidenceEntry[]>([]);
     const [loading, setLoading] = useState(true);
+    const pages = useCursorPages(trackerApi.getResidenceHistory);
 
     const [address, setAddress] = useState("");
     const [city, setCity] = useState("");
@@ -25,7 +28,7 @@ export default function ResidencePage() {
     const loadData = async () => {
         try {
             setLoading(true);
-            const data = await trackerApi.getResidenceHistory();
+            const data = await pages.first();
             setEntries(data);
         } catch (e) {
             console.error(e);
@@ -35,6 +38,16 @@ export default function ResidencePage() {
         }
     };
 
+    const loadMore = async () => {
+        try {
+            const more = await pages.more();
+            setEntries(prev => [...prev, ...more]);
+        } catch (e) {
+            console.error(e);
+            toast.error("Failed to load residence history");
+        }
+    };
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         try {
@@ -129,6 +142,7 @@ export default function ResidencePage() {
                     </motion.div>
                 ))}
             </div>
+            <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={loadMore} />
         </div>
     );
 }
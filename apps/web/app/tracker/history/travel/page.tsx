@@ -4,12 +4,15 @@ import { useEffect, useState } from "react";
 import { motion } from "framer-motion";
 import { Save, Globe, ExternalLink, Plane, Tag, Trash2 } from "lucide-react";
 import { trackerApi, TravelEntry } from "@/features/tracker/api/client";
+import { useCursorPages } from "@/features/tracker/api/useCursorPages";
+import LoadMoreButton from "../../../components/LoadMoreButton";
 
 import toast from "react-hot-toast";
 
 export default function HistoryPage() {
     const [entries, setEntries] = useState<TravelEntry[]>([]);
     const [loading, setLoading] = useState(true);
+    const pages = useCursorPages(trackerApi.getTravelHistory);
 
     // Form State
     const [country, setCountry] = useState("");
@@ -27,7 +30,7 @@ export default function HistoryPage() {
     const loadData = async () => {
         try {
             setLoading(true);
-            const data = await trackerApi.getTravelHistory();
+            const data = await pages.first();
             setEntries(data);
         } catch (e) {
             console.error(e);
@@ -37,6 +40,16 @@ export default function HistoryPage() {
         }
     };
 
+    const loadMore = async () => {
+        try {
+            const more = await pages.more();
+            setEntries(prev => [...prev, ...more]);
+        } catch (e) {
+            console.error(e);
+            toast.error("Failed to load travel history");
+        }
+    };
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         if (!country || !entryDate || !purpose) return;
@@ -229,6 +242,7 @@ export default function HistoryPage() {
                         </motion.div>
                     ))
                 )}
+                <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={loadMore} />
             </div>
         </div>
     );
@@ -4,6 +4,8 @@ import { useEffect, useState } from "react";
 import { motion } from "framer-motion";
 import { Save, StickyNote, Calendar } from "lucide-react";
 import { trackerApi, NoteEntry } from "@/features/tracker/api/client";
+import { useCursorPages } from "@/features/tracker/api/useCursorPages";
+import LoadMoreButton from "../../components/LoadMoreButton";
 import { useLanguage } from "../../contexts/LanguageContext";
 
 import toast from "react-hot-toast";
@@ -11,6 +13,7 @@ import toast from "react-hot-toast";
 export default function NotesPage() {
     const [notes, setNotes] = useState<NoteEntry[]>([]);
     const [loading, setLoading] = useState(true);
+    const pages = useCursorPages(trackerApi.getNotes);
     const { t } = useLanguage();
 
     const [title, setTitle] = useState("");
@@ -28,7 +31,7 @@ export default function NotesPage() {
             // Default date to today
             setNoteDate(new Date().toISOString().split('T')[0]);
 
-            const data = await trackerApi.getNotes();
+            const data = await pages.first();
             // Sort by date desc
             setNotes(data.sort((a, b) => new Date(b.note_date).getTime() - new Date(a.note_date).getTime()));
         } catch (e) {
@@ -39,6 +42,16 @@ export default function NotesPage() {
         }
     };
 
+    const loadMore = async () => {
+        try {
+            const more = await pages.more();
+            setNotes(prev => [...prev, ...more].sort((a, b) => new Date(b.note_date).getTime() - new Date(a.note_date).getTime()));
+        } catch (e) {
+            console.error(e);
+            toast.error("Failed to load notes");
+        }
+    };
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         try {
@@ -135,6 +148,7 @@ export default function NotesPage() {
                             </motion.div>
                         ))
                     )}
+                    <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={loadMore} />
                 </div>
 
             </div>
@@ -10,7 +10,7 @@ export default function TrackerDashboard() {
     const [tasks, setTasks] = useState<TaskEntry[]>([]);
 
     useEffect(() => {
-        trackerApi.getTasks().then(setTasks).catch(console.error);
+        trackerApi.getTasks().then(page => setTasks(page.items)).catch(console.error);
     }, []);
 
     const dueSoon = tasks
@@ -3,14 +3,17 @@
 import { useState, useEffect } from "react";
 import { Plus, CheckCircle, Clock, AlertTriangle, Calendar, Trash2 } from "lucide-react";
 import { trackerApi, TaskEntry } from "../../../features/tracker/api/client";
+import { useCursorPages } from "../../../features/tracker/api/useCursorPages";
 import { motion } from "framer-motion";
 
 import toast from "react-hot-toast";
 import ConfirmationModal from "../../components/ConfirmationModal";
+import LoadMoreButton from "../../components/LoadMoreButton";
 
 export default function TasksPage() {
     const [tasks, setTasks] = useState<TaskEntry[]>([]);
     const [loading, setLoading] = useState(true);
+    const pages = useCursorPages(trackerApi.getTasks);
     const [isModalOpen, setIsModalOpen] = useState(false);
 
     // Delete Confirmation State
@@ -33,7 +36,7 @@ export default function TasksPage() {
     async function loadData() {
         try {
             setLoading(true);
-            const data = await trackerApi.getTasks();
+            const data = await pages.first();
             setTasks(data);
         } catch (error) {
             console.error(error);
@@ -43,6 +46,16 @@ export default function TasksPage() {
         }
     }
 
+    async function loadMore() {
+        try {
+            const more = await pages.more();
+            setTasks(prev => [...prev, ...more]);
+        } catch (error) {
+            console.error(error);
+            toast.error("Failed to load tasks");
+        }
+    }
+
     async function handleSave() {
         if (!newItem.title) return;
         try {
@@ -196,6 +209,7 @@ export default function TasksPage() {
                         </div>
                     ))}
                 </div>
+                <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={loadMore} />
 
                 {/* Modal */}
                 {isModalOpen && (
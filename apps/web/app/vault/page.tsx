@@ -2,11 +2,13 @@
 
 import { useEffect, useState } from "react";
 import { trackerApi, DocumentEntry } from "@/features/tracker/api/client";
+import { useCursorPages } from "@/features/tracker/api/useCursorPages";
 import { useAuth } from "../contexts/auth-context";
 import { useRouter } from "next/navigation";
 import Image from "next/image";
 import toast from "react-hot-toast";
 import ConfirmationModal from "../components/ConfirmationModal";
+import LoadMoreButton from "../components/LoadMoreButton";
 import { Upload, X } from "lucide-react";
 
 export default function VaultPage() {
@@ -14,6 +16,7 @@ export default function VaultPage() {
     const router = useRouter();
     const [documents, setDocuments] = useState<DocumentEntry[]>([]);
     const [loading, setLoading] = useState(true);
+    const pages = useCursorPages(trackerApi.getDocuments);
     const [error, setError] = useState<string | null>(null);
 
     // Upload State
@@ -39,7 +42,7 @@ export default function VaultPage() {
     async function loadDocuments() {
         try {
             setLoading(true);
-            const docs = await trackerApi.getDocuments();
+            const docs = await pages.first();
             setDocuments(docs);
         } catch (e: any) {
             setError(e.message);
@@ -49,6 +52,15 @@ export default function VaultPage() {
         }
     }
 
+    async function loadMore() {
+        try {
+            const more = await pages.more();
+            setDocuments(prev => [...prev, ...more]);
+        } catch (e: any) {
+            toast.error(e.message || "Failed to load documents");
+        }
+    }
+
     async function handleUpload() {
         if (!selectedFile) return;
 
@@ -216,6 +228,7 @@ export default function VaultPage() {
                         </table>
                     </div>
                 )}
+                <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={loadMore} />
             </div>
 
             {/* Upload Modal */}
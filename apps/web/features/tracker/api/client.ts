@@ -1,5 +1,21 @@
 export const TRACKER_API_BASE = '/api/tracker';
 
+const PAGE_SIZE = 100;
+
+export type Page<T> = {
+    items: T[];
+    nextCursor: string | null; // null on the last page
+};
+
+// List endpoints return one page at a time; pass the previous page's nextCursor to get the next.
+const fetchPage = async <T>(url: string, errorMessage: string, cursor?: string | null): Promise<Page<T>> => {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (cursor) params.set('cursor', cursor);
+    const res = await fetch(`${url}?${params}`);
+    if (!res.ok) throw new Error(errorMessage);
+    return { items: (await res.json()) as T[], nextCursor: res.headers.get('X-Next-Cursor') };
+};
+
 export type TravelEntry = {
     id?: number;
     country: string;
@@ -48,11 +64,8 @@ export type NoteEntry = {
 
 export const trackerApi = {
     // ... existing history methods ...
-    getTravelHistory: async (): Promise<TravelEntry[]> => {
-        const res = await fetch(`${TRACKER_API_BASE}/history/travel`);
-        if (!res.ok) throw new Error('Failed to fetch travel history');
-        return res.json();
-    },
+    getTravelHistory: (cursor?: string | null): Promise<Page<TravelEntry>> =>
+        fetchPage<TravelEntry>(`${TRACKER_API_BASE}/history/travel`, 'Failed to fetch travel history', cursor),
 
     addTravelEntry: async (entry: TravelEntry): Promise<TravelEntry> => {
         const res = await fetch(`${TRACKER_API_BASE}/history/travel`, {
@@ -72,11 +85,8 @@ export const trackerApi = {
     },
 
     // ... we assume employment and residence are here ...
-    getEmploymentHistory: async (): Promise<EmploymentEntry[]> => {
-        const res = await fetch(`${TRACKER_API_BASE}/history/employment`);
-        if (!res.ok) throw new Error('Failed to fetch employment history');
-        return res.json();
-    },
+    getEmploymentHistory: (cursor?: string | null): Promise<Page<EmploymentEntry>> =>
+        fetchPage<EmploymentEntry>(`${TRACKER_API_BASE}/history/employment`, 'Failed to fetch employment history', cursor),
 
     addEmploymentEntry: async (entry: EmploymentEntry): Promise<EmploymentEntry> => {
         const res = await fetch(`${TRACKER_API_BASE}/history/employment`, {
@@ -95,11 +105,8 @@ export const trackerApi = {
         if (!res.ok) throw new Error('Failed to delete employment entry');
     },
 
-    getResidenceHistory: async (): Promise<ResidenceEntry[]> => {
-        const res = await fetch(`${TRACKER_API_BASE}/history/residence`);
-        if (!res.ok) throw new Error('Failed to fetch residence history');
-        return res.json();
-    },
+    getResidenceHistory: (cursor?: string | null): Promise<Page<ResidenceEntry>> =>
+        fetchPage<ResidenceEntry>(`${TRACKER_API_BASE}/history/residence`, 'Failed to fetch residence history', cursor),
 
     addResidenceEntry: async (entry: ResidenceEntry): Promise<ResidenceEntry> => {
         const res = await fetch(`${TRACKER_API_BASE}/history/residence`, {
@@ -119,11 +126,8 @@ export const trackerApi = {
     },
 
     // Documents
-    getDocuments: async (): Promise<DocumentEntry[]> => {
-        const res = await fetch(`${TRACKER_API_BASE}/documents`);
-        if (!res.ok) throw new Error('Failed to fetch documents');
-        return res.json();
-    },
+    getDocuments: (cursor?: string | null): Promise<Page<DocumentEntry>> =>
+        fetchPage<DocumentEntry>(`${TRACKER_API_BASE}/documents`, 'Failed to fetch documents', cursor),
 
     addDocument: async (entry: DocumentEntry): Promise<DocumentEntry> => {
         const res = await fetch(`${TRACKER_API_BASE}/documents`, {
@@ -136,11 +140,8 @@ export const trackerApi = {
     },
 
     // Contacts
-    getContacts: async (): Promise<ContactEntry[]> => {
-        const res = await fetch(`${TRACKER_API_BASE}/contacts`);
-        if (!res.ok) throw new Error('Failed to fetch contacts');
-        return res.json();
-    },
+    getContacts: (cursor?: string | null): Promise<Page<ContactEntry>> =>
+        fetchPage<ContactEntry>(`${TRACKER_API_BASE}/contacts`, 'Failed to fetch contacts', cursor),
 
     addContact: async (entry: ContactEntry): Promise<ContactEntry> => {
         const res = await fetch(`${TRACKER_API_BASE}/contacts`, {
@@ -153,11 +154,8 @@ export const trackerApi = {
     },
 
     // Notes
-    getNotes: async (): Promise<NoteEntry[]> => {
-        const res = await fetch(`${TRACKER_API_BASE}/notes`);
-        if (!res.ok) throw new Error('Failed to fetch notes');
-        return res.json();
-    },
+    getNotes: (cursor?: string | null): Promise<Page<NoteEntry>> =>
+        fetchPage<NoteEntry>(`${TRACKER_API_BASE}/notes`, 'Failed to fetch notes', cursor),
 
     addNote: async (entry: NoteEntry): Promise<NoteEntry> => {
         const res = await fetch(`${TRACKER_API_BASE}/notes`, {
@@ -170,11 +168,8 @@ export const trackerApi = {
     },
 
     // Cases
-    getCases: async (): Promise<CaseEntry[]> => {
-        const res = await fetch(`${TRACKER_API_BASE}/cases`);
-        if (!res.ok) throw new Error('Failed to fetch cases');
-        return res.json();
-    },
+    getCases: (cursor?: string | null): Promise<Page<CaseEntry>> =>
+        fetchPage<CaseEntry>(`${TRACKER_API_BASE}/cases`, 'Failed to fetch cases', cursor),
 
     getCase: async (id: number): Promise<CaseEntry> => {
         const res = await fetch(`${TRACKER_API_BASE}/cases/${id}`);
@@ -245,11 +240,8 @@ export const trackerApi = {
     },
 
     // Tasks
-    getTasks: async (): Promise<TaskEntry[]> => {
-        const res = await fetch(`${TRACKER_API_BASE}/tasks`);
-        if (!res.ok) throw new Error('Failed to fetch tasks');
-        return res.json();
-    },
+    getTasks: (cursor?: string | null): Promise<Page<TaskEntry>> =>
+        fetchPage<TaskEntry>(`${TRACKER_API_BASE}/tasks`, 'Failed to fetch tasks', cursor),
 
     addTask: async (entry: TaskEntry): Promise<TaskEntry> => {
         const res = await fetch(`${TRACKER_API_BASE}/tasks`, {
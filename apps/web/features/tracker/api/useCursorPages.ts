@@ -0,0 +1,31 @@
+"use client";
+
+import { useState } from "react";
+import type { Page } from "./client";
+
+// Tracks the next-page cursor of a paginated tracker list: first() loads page one,
+// more() the page after the last one loaded. Views append what more() returns.
+export function useCursorPages<T>(fetchPage: (cursor?: string | null) => Promise<Page<T>>) {
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+
+    const first = async (): Promise<T[]> => {
+        const page = await fetchPage();
+        setNextCursor(page.nextCursor);
+        return page.items;
+    };
+
+    const more = async (): Promise<T[]> => {
+        if (!nextCursor) return [];
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage(nextCursor);
+            setNextCursor(page.nextCursor);
+            return page.items;
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    return { first, more, hasMore: nextCursor !== null, loadingMore };
+}